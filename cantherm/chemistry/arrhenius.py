@@ -0,0 +1,163 @@
+"""
+Batched modified Arrhenius fits, k = A T^n exp(-Ea / RT)
+"""
+from typing import NamedTuple
+
+import numpy as np
+from scipy.constants import calorie, physical_constants
+
+R_kcal = physical_constants["molar gas constant"][0] / (calorie * 1e3)
+
+
+class ArrheniusFit(NamedTuple):
+    """Modified Arrhenius parameters and fit statistics for a batch of rate constants.
+
+    Every field has the batch shape of the fitted rates (the rates without their
+    temperature axis), `std_errors` has an extra trailing axis of length 3.
+
+    Attributes
+    ----------
+    A : `np.ndarray`
+        The pre-exponential factors in the units of k.
+    n : `np.ndarray`
+        The temperature exponents.
+    Ea : `np.ndarray`
+        The activation energies in kcal/mol.
+    rms_log_error : `np.ndarray`
+        The root mean square of the residuals in ln k.
+    max_rel_error : `np.ndarray`
+        The largest relative error |k_fit / k - 1| over the fitted temperatures.
+    std_errors : `np.ndarray`
+        The standard errors of (ln A, n, Ea) from the linearized fit, NaN when there
+        are no more temperatures than parameters.
+    """
+
+    A: np.ndarray
+    n: np.ndarray
+    Ea: np.ndarray
+    rms_log_error: np.ndarray
+    max_rel_error: np.ndarray
+    std_errors: np.ndarray
+
+    def rate(self, temp):
+        """Evaluates the fitted rate constants.
+
+        Parameters
+        ----------
+        temp : float or `np.ndarray`
+            The temperature(s) in K.
+
+        Returns
+        -------
+        `np.ndarray`
+            k with shape batch shape + temp shape.
+        """
+        temp = np.asarray(temp, dtype=float)
+        expand = (Ellipsis,) + (np.newaxis,) * temp.ndim
+        return np.exp(
+            np.log(self.A)[expand]
+            + self.n[expand] * np.log(temp)
+            - self.Ea[expand] / (R_kcal * temp)
+        )
+
+
+def _design(temps):
+    # ln k = ln A + n ln T - Ea / RT is linear in (ln A, n, Ea)
+    return np.stack([np.ones_like(temps), np.log(temps), -1.0 / (R_kcal * temps)], axis=1)
+
+
+def fit_arrhenius(temps, rates, refine=False, max_iter=50, tol=1e-10):
+    """Fits k = A T^n exp(-Ea / RT) to many sets of rate constants at once.
+
+    All of the linearized problems share one design matrix, so the whole batch is a
+    single least squares solve with one right hand side per set of rates. The optional
+    refinement then minimizes the relative (rather than logarithmic) error with
+    Gauss-Newton steps that are solved for every fit at once.
+
+    Parameters
+    ----------
+    temps : iterable (list or `np.ndarray`)
+        The temperatures in K, shape (n_T,).
+    rates : `np.ndarray`
+        The (positive) rate constants, shape (..., n_T).
+    refine : bool, optional
+        Whether to refine the parameters by minimizing the relative error, by default False
+    max_iter : int, optional
+        The largest number of refinement steps, by default 50
+    tol : float, optional
+        The refinement stops when no parameter changes by more than this, by default 1e-10
+
+    Returns
+    -------
+    ArrheniusFit
+        The parameters and fit statistics with the batch shape of `rates`.
+    """
+    temps = np.asarray(temps, dtype=float)
+    rates = np.asarray(rates, dtype=float)
+    batch_shape = rates.shape[:-1]
+    log_k = np.log(rates.reshape(-1, temps.size)).T  # (n_T, n_fits)
+
+    X = _design(temps)
+    params = np.linalg.lstsq(X, log_k, rcond=None)[0]  # (3, n_fits)
+
+    if refine:
+        for _ in range(max_iter):
+            # residuals r = k_fit / k - 1 and their Jacobian (k_fit / k) X, for every fit
+            ratio = np.exp(X @ params - log_k)
+            J = ratio.T[:, :, np.newaxis] * X  # (n_fits, n_T, 3)
+            JTJ = np.einsum("fti,ftj->fij", J, J)
+            JTr = np.einsum("fti,tf->fi", J, ratio - 1.0)
+            step = np.linalg.solve(JTJ + 1e-12 * np.eye(3), -JTr[..., np.newaxis])[..., 0]
+            params += step.T
+            if np.abs(step).max() < tol:
+                break
+
+    residual = log_k - X @ params
+    dof = temps.size - 3
+    if dof > 0:
+        sigma2 = np.sum(residual ** 2, axis=0) / dof
+    else:
+        sigma2 = np.full(params.shape[1], np.nan)
+    std_errors = np.sqrt(sigma2[:, np.newaxis] * np.diag(np.linalg.pinv(X.T @ X)))
+
+    return ArrheniusFit(
+        A=np.exp(params[0]).reshape(batch_shape),
+        n=params[1].reshape(batch_shape),
+        Ea=params[2].reshape(batch_shape),
+        rms_log_error=np.sqrt(np.mean(residual ** 2, axis=0)).reshape(batch_shape),
+        max_rel_error=np.abs(np.expm1(-residual)).max(axis=0).reshape(batch_shape),
+        std_errors=std_errors.reshape(batch_shape + (3,)),
+    )
+
+
+def fit_reactions(reactions, refine=False):
+    """Fits the TST rates of many reactions (after `calc_TST_rates`).
+
+    Reactions evaluated on the same temperatures are fitted together in one batch.
+
+    Parameters
+    ----------
+    reactions : list of Reaction
+        The reactions, each with `temp` and `rates` filled in.
+    refine : bool, optional
+        Whether to refine the parameters by minimizing the relative error, by default False
+
+    Returns
+    -------
+    ArrheniusFit
+        The parameters and fit statistics with shape (n_reactions,), in the order of
+        `reactions`.
+    """
+    groups = {}
+    for i, reaction in enumerate(reactions):
+        if reaction.rates is None:
+            raise ValueError(f"Reaction {i} has no rates, run calc_TST_rates first")
+        groups.setdefault(tuple(np.asarray(reaction.temp, dtype=float)), []).append(i)
+
+    fields = [np.empty(len(reactions)) for _ in range(5)] + [np.empty((len(reactions), 3))]
+    for temps, members in groups.items():
+        rates = np.array([reactions[i].rates for i in members], dtype=float)
+        fit = fit_arrhenius(temps, rates, refine=refine)
+        for field, values in zip(fields, fit):
+            field[members] = values
+    return ArrheniusFit(*fields)
@@ -0,0 +1,422 @@
+"""
+Struct-of-arrays storage for large libraries of molecules
+"""
+import json
+import os
+from typing import NamedTuple
+
+import numpy as np
+from cclib.parser.utils import convertor
+from scipy.constants import N_A, calorie, physical_constants
+
+from cantherm import statmech
+from cantherm.statmech import backend
+
+R_cal = physical_constants["molar gas constant"][0] / (calorie)
+R_kcal = R_cal / 1e3
+
+# Largest size of the per-mode temporaries of one `calc_thermo` chunk, in bytes
+DEFAULT_MAX_MEMORY = 2 ** 27
+
+# Bump when the stored arrays change
+COLLECTION_FORMAT = 1
+
+_ARRAYS = (
+    "names", "file_paths", "energy", "mom_inertia", "method", "basis_set",
+    "atom_offsets", "atomnos", "masses", "freq_offsets", "vibfreqs",
+)
+
+
+class CollectionEntry(NamedTuple):
+    """One molecule of a `CMolCollection`, the arrays are views into the collection.
+
+    Attributes
+    ----------
+    name : str
+        The name of the molecule.
+    file_path : str
+        The output file it was read from.
+    energy : float
+        The final electronic energy in hartree.
+    atomnos : `np.ndarray`
+        The atomic numbers.
+    masses : `np.ndarray`
+        The isotopic masses in amu.
+    mom_inertia : `np.ndarray`
+        The principal moments of inertia in kg * m^2.
+    vibfreqs : `np.ndarray`
+        The vibrational frequencies in cm^-1 (empty for an energy-only file).
+    method : str
+        The final method.
+    basis_set : str
+        The basis set.
+    """
+
+    name: str
+    file_path: str
+    energy: float
+    atomnos: np.ndarray
+    masses: np.ndarray
+    mom_inertia: np.ndarray
+    vibfreqs: np.ndarray
+    method: str
+    basis_set: str
+
+
+class CollectionThermo(NamedTuple):
+    """Thermochemistry of every molecule of a collection on a temperature grid.
+
+    Every temperature dependent field has shape (n_molecules, n_temps) and follows the
+    conventions of the matching CMol method.
+
+    Attributes
+    ----------
+    log_q : `np.ndarray`
+        ln Q, translational, rotational and vibrational (`CMol.calc_log_Q`).
+    h : `np.ndarray`
+        The enthalpy in kcal/mol, electronic energy and ZPVE included (`CMol.calc_enthalpy`).
+    s : `np.ndarray`
+        The entropy in cal/(mol K) (`CMol.calc_entropy` is in kcal/(mol K)).
+    cp : `np.ndarray`
+        The heat capacity in cal/(mol K) (`CMol.calc_heat_capacity`).
+    g : `np.ndarray`
+        The Gibbs free energy in kcal/mol, electronic energy and ZPVE included
+        (`CMol.calc_free_energy`).
+    zpve : `np.ndarray`
+        The zero point vibrational energy in kcal/mol, shape (n_molecules,).
+    """
+
+    log_q: np.ndarray
+    h: np.ndarray
+    s: np.ndarray
+    cp: np.ndarray
+    g: np.ndarray
+    zpve: np.ndarray
+
+
+class CMolCollection:
+    """Many molecules stored as a handful of contiguous arrays.
+
+    Per-molecule values are arrays over the molecules. The ragged per-atom and
+    per-mode values are flat arrays, and molecule i owns
+    `vibfreqs[freq_offsets[i]:freq_offsets[i + 1]]` (and likewise for the atoms with
+    `atom_offsets`). Nothing of the parsed files is kept. `save` writes one .npy file per
+    array, which `load` memory maps, so opening a library is instant whatever its size
+    and processes reading the same library share the pages.
+
+    Attributes
+    ----------
+    names : `np.ndarray`
+        The names of the molecules, shape (n,).
+    file_paths : `np.ndarray`
+        The output files they were read from, shape (n,).
+    energy : `np.ndarray`
+        The final electronic energies in hartree, shape (n,).
+    mom_inertia : `np.ndarray`
+        The principal moments of inertia in kg * m^2, shape (n, 3).
+    method : `np.ndarray`
+        The final methods, shape (n,).
+    basis_set : `np.ndarray`
+        The basis sets, shape (n,).
+    atom_offsets : `np.ndarray`
+        The atom offsets, shape (n + 1,).
+    atomnos : `np.ndarray`
+        The atomic numbers of all atoms, shape (n_atoms,).
+    masses : `np.ndarray`
+        The isotopic masses of all atoms in amu, shape (n_atoms,).
+    freq_offsets : `np.ndarray`
+        The frequency offsets, shape (n + 1,).
+    vibfreqs : `np.ndarray`
+        The vibrational frequencies of all molecules in cm^-1, shape (n_modes,).
+    """
+
+    def __init__(self, **arrays):
+        """
+        Parameters
+        ----------
+        **arrays : `np.ndarray`
+            Every array listed in the attributes.
+
+        Raises
+        ------
+        ValueError
+            If an array is missing or the offsets don't match the flat arrays.
+        """
+        missing = set(_ARRAYS) - set(arrays)
+        if missing:
+            raise ValueError(f"Missing collection arrays {sorted(missing)}")
+        for name in _ARRAYS:
+            setattr(self, name, arrays[name])
+
+        n = len(self.names)
+        for offsets, flat in ((self.atom_offsets, self.atomnos), (self.freq_offsets, self.vibfreqs)):
+            if len(offsets) != n + 1 or offsets[0] != 0 or offsets[-1] != len(flat):
+                raise ValueError("The offsets don't match the flattened arrays")
+        self._index = None
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, key):
+        i = self.index(key) if isinstance(key, str) else int(key)
+        if i < 0:
+            i += len(self)
+        atoms = slice(self.atom_offsets[i], self.atom_offsets[i + 1])
+        return CollectionEntry(
+            name=str(self.names[i]),
+            file_path=str(self.file_paths[i]),
+            energy=float(self.energy[i]),
+            atomnos=self.atomnos[atoms],
+            masses=self.masses[atoms],
+            mom_inertia=self.mom_inertia[i],
+            vibfreqs=self.vibfreqs[self.freq_offsets[i]:self.freq_offsets[i + 1]],
+            method=str(self.method[i]),
+            basis_set=str(self.basis_set[i]),
+        )
+
+    def index(self, name):
+        """Returns the position of a molecule.
+
+        Parameters
+        ----------
+        name : str
+            The name of the molecule.
+
+        Returns
+        -------
+        int
+            Its index.
+
+        Raises
+        ------
+        KeyError
+            If no molecule has that name.
+        """
+        if self._index is None:
+            self._index = {str(n): i for i, n in enumerate(self.names)}
+        return self._index[name]
+
+    @property
+    def n_atoms(self):
+        """The number of atoms of every molecule, shape (n,)."""
+        return np.diff(self.atom_offsets)
+
+    @property
+    def n_modes(self):
+        """The number of vibrational frequencies of every molecule, shape (n,)."""
+        return np.diff(self.freq_offsets)
+
+    @property
+    def total_mass(self):
+        """The mass of every molecule in amu, shape (n,)."""
+        sums = np.concatenate([[0.0], np.cumsum(self.masses, dtype=float)])
+        return sums[self.atom_offsets[1:]] - sums[self.atom_offsets[:-1]]
+
+    @property
+    def nbytes(self):
+        """The total size of the arrays in bytes."""
+        return sum(getattr(self, name).nbytes for name in _ARRAYS)
+
+    def calc_thermo(self, temps, sigma=1, scale=1.0, max_memory=DEFAULT_MAX_MEMORY):
+        """Evaluates G, H, S and Cp of every molecule on every temperature at once.
+
+        The translational and rotational terms come from `statmech.log_q_tr` and
+        `statmech.log_q_rot`, each called once per molecule over all temperatures, and
+        every term is assembled as a (molecules x temperatures) array. The vibrational sums run over the flat frequency
+        array with `backend.ho_sums_segmented`, one chunk of molecules at a time so the
+        (modes x temperatures) temporaries stay under `max_memory`. Like CMol, imaginary
+        frequencies are dropped, and a molecule without frequencies (energy-only file)
+        has no vibrational contribution.
+
+        Parameters
+        ----------
+        temps : float or `np.ndarray`
+            The temperature(s) in K.
+        sigma : int or `np.ndarray`, optional
+            The rotational symmetry factor, one for all molecules or one per molecule,
+            by default 1
+        scale : float, optional
+            Scale of the frequencies, by default 1.0
+        max_memory : int, optional
+            The largest size of the per-mode temporaries of one chunk in bytes, by default
+            128 MiB. A single molecule is never split, whatever its size.
+
+        Returns
+        -------
+        CollectionThermo
+            The thermochemistry, shape (n_molecules, n_temps).
+        """
+        temps = np.atleast_1d(np.asarray(temps, dtype=float))
+        n = len(self)
+        sigma = np.broadcast_to(np.asarray(sigma, dtype=float), (n,))
+
+        # Vibrations, positive frequencies only (counted back into per-molecule offsets)
+        freqs = np.asarray(self.vibfreqs, dtype=float)
+        keep = freqs > 0
+        kept = np.concatenate([[0], np.cumsum(keep)]).astype(np.int64)
+        offsets = kept[np.asarray(self.freq_offsets)]
+        energies = statmech.mode_energies(freqs[keep], scale=scale)
+
+        log_q_vib = np.empty((n, temps.size))
+        h_red = np.empty((n, temps.size))
+        cp_red = np.empty((n, temps.size))
+        # ~6 float temporaries per mode and temperature in the numpy kernel
+        max_modes = max(1, int(max_memory) // (6 * 8 * temps.size))
+        start = 0
+        while start < n:
+            stop = np.searchsorted(offsets, offsets[start] + max_modes, side="right") - 1
+            stop = min(max(stop, start + 1), n)
+            first, last = offsets[start], offsets[stop]
+            chunk = backend.ho_sums_segmented(
+                energies[first:last], offsets[start:stop + 1] - first, temps
+            )
+            log_q_vib[start:stop], h_red[start:stop], cp_red[start:stop] = chunk
+            start = stop
+
+        sums = np.concatenate([[0.0], np.cumsum(energies)])
+        zpve = 0.5 * (sums[offsets[1:]] - sums[offsets[:-1]]) * N_A / (calorie * 1e3)
+
+        # Translations and rotations, one call per molecule over all temperatures
+        log_q_tr = np.reshape(
+            [statmech.log_q_tr(np.array([mass]), temps) for mass in self.total_mass],
+            (n, temps.size),
+        )
+        log_q_rot = np.reshape(
+            [
+                statmech.log_q_rot(sig, moi, temps)
+                for sig, moi in zip(sigma, np.asarray(self.mom_inertia, dtype=float))
+            ],
+            (n, temps.size),
+        )
+
+        e_kcal = convertor(np.asarray(self.energy, dtype=float), "hartree", "kcal/mol")
+        e_kcal = (e_kcal + zpve)[:, np.newaxis]
+        rt = R_kcal * temps
+        log_q = log_q_tr + log_q_rot + log_q_vib
+
+        return CollectionThermo(
+            log_q=log_q,
+            h=statmech.h_tr(temps) + statmech.h_rot(temps) + rt * h_red + e_kcal,
+            s=(
+                R_cal * (log_q_tr + 2.5)
+                + statmech.h_rot(temps) * 1e3 / temps + R_cal * log_q_rot
+                + R_cal * (h_red + log_q_vib)
+            ),
+            cp=statmech.cp_tr(temps) + statmech.cp_rot(temps) + R_cal * cp_red,
+            g=e_kcal - rt * log_q,
+            zpve=zpve,
+        )
+
+    @classmethod
+    def from_cmols(cls, cmols, names=None):
+        """Copies what the thermochemistry needs out of CMol objects.
+
+        Hindered rotors and other per-object state aren't part of the collection.
+
+        Parameters
+        ----------
+        cmols : iterable of CMol
+            The molecules.
+        names : iterable of str, optional
+            The names of the molecules, by default their file paths
+
+        Returns
+        -------
+        CMolCollection
+            The collection.
+        """
+        cmols = list(cmols)
+        file_paths = [cmol.file_path for cmol in cmols]
+        names = file_paths if names is None else list(names)
+        if len(names) != len(cmols):
+            raise ValueError("There must be one name per molecule")
+
+        # Energy-only outputs have no frequencies
+        freqs = [np.asarray(getattr(cmol, "vibfreqs", []), dtype=float) for cmol in cmols]
+        atomnos = [np.asarray(cmol.data.atomnos, dtype=np.int64) for cmol in cmols]
+
+        return cls(
+            names=np.array(names, dtype=str),
+            file_paths=np.array(file_paths, dtype=str),
+            energy=np.array([cmol.energy for cmol in cmols], dtype=float),
+            mom_inertia=np.array([cmol.mom_inertia for cmol in cmols], dtype=float).reshape(-1, 3),
+            method=np.array([cmol.method for cmol in cmols], dtype=str),
+            basis_set=np.array([cmol.basis_set for cmol in cmols], dtype=str),
+            atom_offsets=_offsets(atomnos),
+            atomnos=_flatten(atomnos, np.int64),
+            masses=_flatten([cmol.masses for cmol in cmols], float),
+            freq_offsets=_offsets(freqs),
+            vibfreqs=_flatten(freqs, float),
+        )
+
+    @classmethod
+    def from_batch(cls, result):
+        """Builds a collection from the molecules of `cantherm.io.batch.load_batch`.
+
+        Parameters
+        ----------
+        result : BatchResult
+            The loaded molecules (the failures are ignored).
+
+        Returns
+        -------
+        CMolCollection
+            The collection, named by file path.
+        """
+        return cls.from_cmols(result.molecules.values(), names=list(result.molecules))
+
+    def save(self, directory):
+        """Writes the collection as one .npy file per array plus a small manifest.
+
+        Parameters
+        ----------
+        directory : str
+            The directory, created if needed.
+        """
+        os.makedirs(directory, exist_ok=True)
+        for name in _ARRAYS:
+            np.save(os.path.join(directory, name + ".npy"), np.ascontiguousarray(getattr(self, name)))
+        with open(os.path.join(directory, "collection.json"), "w") as f:
+            json.dump({"format": COLLECTION_FORMAT, "size": len(self)}, f)
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """Opens a saved collection.
+
+        Parameters
+        ----------
+        directory : str
+            The directory written by `save`.
+        mmap : bool, optional
+            Whether to memory map the arrays (read-only, nothing is read until it's
+            used) instead of reading them into memory, by default True
+
+        Returns
+        -------
+        CMolCollection
+            The collection.
+
+        Raises
+        ------
+        ValueError
+            If the directory was written by an incompatible version.
+        """
+        with open(os.path.join(directory, "collection.json")) as f:
+            manifest = json.load(f)
+        if manifest.get("format") != COLLECTION_FORMAT:
+            raise ValueError(f"Unsupported collection format {manifest.get('format')}")
+        mode = "r" if mmap else None
+        return cls(**{
+            name: np.load(os.path.join(directory, name + ".npy"), mmap_mode=mode)
+            for name in _ARRAYS
+        })
+
+
+def _offsets(parts):
+    return np.concatenate([[0], np.cumsum([len(p) for p in parts])]).astype(np.int64)
+
+
+def _flatten(parts, dtype):
+    if not parts:
+        return np.empty(0, dtype=dtype)
+    return np.concatenate([np.asarray(p, dtype=dtype).ravel() for p in parts])
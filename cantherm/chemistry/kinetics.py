@@ -1,16 +1,46 @@
-import math, re
-from scipy.constants import h, c, Boltzmann, calorie, physical_constants, N_A
+import numpy as np
+from scipy.constants import h, Boltzmann, calorie, physical_constants, N_A
+
+from cantherm.statmech.kinetics import log_tst_rate
+from cantherm.statmech.tunneling import wigner_correction, eckart_correction
 
-c_in_cm = c*100
 R_kcal = physical_constants['molar gas constant'][0]/(calorie*1e3)
 ha_to_kcal = physical_constants['Hartree energy'][0]*N_A/(calorie*1e3)
 
+REACTION_TYPES = {'Unimol': 1, 'Bimol': 2}
+TUNNELING = (None, 'Wigner', 'Eckart')
+
+
 class Reaction:
-    """  
+    """
     Reaction class for CANTHERM
 
     Author: Virginia Johnson <virginia.johnson@colorado.edu>
     Date: 1/26/2020
+
+    Attributes
+    ----------
+    reactants : CMol or list of CMol
+        The reactant (unimolecular) or the two reactants (bimolecular).
+    ts : CMol
+        The transition state.
+    temp : iterable (list or `np.ndarray`)
+        The temperatures in K.
+    reac_type : str
+        'Unimol' or 'Bimol'.
+    products : CMol or list of CMol
+        The products, only used for the reverse barrier of Eckart tunneling.
+    tunneling : str
+        None, 'Wigner' or 'Eckart'.
+    scale : float
+        Scale of the frequencies.
+    rates : `np.ndarray`
+        The rate constants in 1/s (unimolecular) or cm^3 / (mol s) (bimolecular),
+        set by `calc_TST_rates`.
+    tunneling_coeff : `np.ndarray`
+        The tunneling coefficients (1 without tunneling), set by `calc_TST_rates`.
+    q_ratio : `np.ndarray`
+        kT/h Q_TS / prod Q_R, set by `calc_TST_rates`.
     """
 
     def __init__(self,
@@ -20,57 +50,128 @@ class Reaction:
                  reac_type='Unimol',
                  products=[],
                  tunneling=None,
-                 scale=0.99):
+                 scale=0.99,
+                 reactants_sigma=1,
+                 ts_sigma=1):
+        if reac_type not in REACTION_TYPES:
+            raise ValueError(f"Unknown reaction type {reac_type}, choose from {list(REACTION_TYPES)}")
+        if tunneling not in TUNNELING:
+            raise ValueError(f"Unknown tunneling correction {tunneling}, choose from {TUNNELING}")
+
         self.reactants = reactants
         self.ts = ts
-        self.temp = temp     #YES
-        self.reac_type = reac_type     #YES
+        self.temp = temp
+        self.reac_type = reac_type
         self.products = products
         self.tunneling = tunneling
         self.scale = scale
-        self.rates = None     #YES
-        self.tunneling_coeff = None     #YES
-        self.q_ratio = None     #YES
+        self.reactants_sigma = reactants_sigma
+        self.ts_sigma = ts_sigma
+        self.rates = None
+        self.tunneling_coeff = None
+        self.q_ratio = None
         return
 
     ############################################################################
 
-    def calc_TST_rates(self):
-        """Calculates the transition state theory rate constants for the
-            reaction at the given temperatures.
+    def _reactant_list(self):
+        # The reactants and their symmetry numbers as two lists
+        reactants = self.reactants
+        sigmas = self.reactants_sigma
+        if not isinstance(reactants, (list, tuple)):
+            reactants = [reactants]
+        if not isinstance(sigmas, (list, tuple)):
+            sigmas = [sigmas] * len(reactants)
+        if len(reactants) != REACTION_TYPES[self.reac_type]:
+            raise ValueError(
+                f"A {self.reac_type} reaction needs {REACTION_TYPES[self.reac_type]} reactant(s)"
+            )
+        return reactants, sigmas
+
+    def calc_barriers(self):
+        """Returns the zero-point corrected forward and reverse barriers in kcal/mol.
+
+        Without products the barrier is taken to be symmetric.
         """
-        print('hello0')
-        self.rates = [0] * len(self.temp)
-        self.tunneling_coeff = [0] * len(self.temp)
-        self.q_ratio = [0] * len(self.temp)
-
-        print('hello1')
+        e_ts = _zpe_corrected_energy(self.ts, self.scale)
+        v_forward = e_ts - _zpe_corrected_energy(self.reactants, self.scale)
+        if not self.products:
+            return v_forward, v_forward
+        return v_forward, e_ts - _zpe_corrected_energy(self.products, self.scale)
 
-        for i in range(len(self.temp)):
-            t = self.temp[i]
-            if self.reac_type == 'Unimol':
-                Q_react = self.reactants.calculate_Q(t)
-                Q_TS = self.ts.calculate_Q(t)
-
-            self.q_ratio[i] = (Boltzmann * t / h) * (Q_TS / Q_react)
-            self.rates[i] = (Boltzmann * t / h) * (Q_TS / Q_react)
-            self.rates[i] *= math.exp(-(self.ts.Energy - \
-                                        self.reactants.Energy) * ha_to_kcal \
-                                        / R_kcal / t)
-
-            if self.tunneling == "Wigner":
-                kappa = wigner_correction(t, self.ts.imagFreq, self.scale)
-                self.rates[i] *= kappa
-                self.tunneling_coeff[i] = kappa
+    def calc_TST_rates(self):
+        """Calculates the transition state theory rate constants for the
+            reaction at all of the given temperatures at once.
 
-            #print(self.q_ratio[i])
-            print('hello2')
+        Returns
+        -------
+        `np.ndarray`
+            The rate constants (also stored in `rates`).
+        """
+        temp = np.asarray(self.temp, dtype=float)
+
+        # Everything is formed in log space, Q_TS / Q_react overflows for large molecules
+        log_q_react = self.calc_log_Q_reactants(temp)
+        log_q_ts = self.ts.calc_log_Q(temp, self.ts_sigma, scale=self.scale)
+        v_forward, _ = self.calc_barriers()
+
+        log_k = log_tst_rate(
+            temp, log_q_ts, log_q_react, v_forward,
+            molecularity=REACTION_TYPES[self.reac_type]
+        )
+        self.q_ratio = np.exp(np.log(Boltzmann * temp / h) + log_q_ts - log_q_react)
+        self.tunneling_coeff = self.calc_tunneling(temp)
+        self.rates = np.exp(log_k) * self.tunneling_coeff
+        return self.rates
+
+    def calc_log_Q_reactants(self, temp):
+        """Returns the sum of ln Q over the reactants.
+
+        Parameters
+        ----------
+        temp : float or `np.ndarray`
+            The temperature(s) in K.
+
+        Returns
+        -------
+        float or `np.ndarray`
+            sum ln Q_R, with the same shape as `temp`.
+        """
+        reactants, sigmas = self._reactant_list()
+        return sum(
+            mol.calc_log_Q(temp, sigma, scale=self.scale)
+            for mol, sigma in zip(reactants, sigmas)
+        )
+
+    def calc_tunneling(self, temp):
+        """Returns the tunneling coefficients through `ts` (1 without tunneling).
+
+        Parameters
+        ----------
+        temp : float or `np.ndarray`
+            The temperature(s) in K.
+
+        Returns
+        -------
+        `np.ndarray`
+            kappa(T), with the same shape as `temp`.
+        """
+        temp = np.asarray(temp, dtype=float)
+        if self.tunneling == 'Wigner':
+            return wigner_correction(temp, self.ts.imag_freq, self.scale)
+        if self.tunneling == 'Eckart':
+            v_forward, v_reverse = self.calc_barriers()
+            return eckart_correction(
+                temp, self.ts.imag_freq, self.scale, v_forward, v_reverse
+            )
+        return np.ones_like(temp)
 
 
 ################################################################################
 
 
-def wigner_correction(t, freq, scale):
-    # see doi:10.1103/PhysRev.40.749 and doi:10.1039/TF9595500001
-    return (1.0 + 1.0 / 24.0 * (h * abs(freq) * scale * c_in_cm / (t * Boltzmann))**2)
-
+def _zpe_corrected_energy(species, scale):
+    # Electronic energy + ZPVE in kcal/mol of a CMol or a list of them
+    if not isinstance(species, (list, tuple)):
+        species = [species]
+    return sum(mol.energy * ha_to_kcal + mol.calc_ZPVE(scale=scale) for mol in species)
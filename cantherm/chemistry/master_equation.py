@@ -0,0 +1,751 @@
+"""
+One-dimensional (energy grained) master equation for pressure-dependent rate coefficients
+
+The wells share one energy grid measured from the zero-point level of the lowest well, and
+k(E) for every channel comes from `RRKM`. The master equation matrix is assembled in its
+symmetric (detailed balance) form with the states ordered by energy grain first and well
+second, which keeps the whole matrix banded even when wells are coupled by isomerization.
+Phenomenological rate coefficients are extracted from the chemically significant
+eigenpairs with the Bartis-Widom method, see J. A. Miller and S. J. Klippenstein,
+J. Phys. Chem. A 110, 10528 (2006).
+
+Pressures are in atm and energies in cm^-1 unless stated otherwise.
+"""
+from itertools import product
+from typing import NamedTuple
+
+import numpy as np
+import scipy.sparse as sp
+from numpy.polynomial import chebyshev
+from scipy.constants import Boltzmann, h, c, N_A, calorie, physical_constants
+from scipy.linalg import eig_banded
+from scipy.sparse.linalg import eigsh
+from cclib.parser.utils import convertor
+
+from cantherm.chemistry.arrhenius import fit_arrhenius
+from cantherm.utils import spawn_pool
+
+c_in_cm = c * 100
+R_kcal = physical_constants["molar gas constant"][0] / (calorie * 1e3)
+
+SOLVERS = ("sparse", "banded")
+
+
+class LennardJones(NamedTuple):
+    """Lennard-Jones collision parameters.
+
+    Attributes
+    ----------
+    sigma : float
+        The collision diameter in Angstrom.
+    epsilon : float
+        The well depth over the Boltzmann constant in K.
+    """
+
+    sigma: float
+    epsilon: float
+
+
+def collision_frequency(lj, bath_lj, mass, bath_mass, temp, pressure):
+    """Lennard-Jones collision frequency with the bath gas.
+
+    Uses Troe's approximation for the collision integral,
+    Omega(2,2)* = 1 / (0.697 + 0.5185 log10(T / epsilon)).
+
+    Parameters
+    ----------
+    lj : LennardJones
+        The parameters of the molecule.
+    bath_lj : LennardJones
+        The parameters of the bath gas.
+    mass : float
+        The mass of the molecule in amu.
+    bath_mass : float
+        The mass of the bath gas in amu.
+    temp : float
+        The temperature in K.
+    pressure : float
+        The pressure in atm.
+
+    Returns
+    -------
+    float
+        The collision frequency in 1/s.
+    """
+    sigma = 0.5 * (lj.sigma + bath_lj.sigma) * 1e-10
+    epsilon = np.sqrt(lj.epsilon * bath_lj.epsilon)
+    mu = mass * bath_mass / (mass + bath_mass) * 1e-3 / N_A
+    omega = 1.0 / (0.697 + 0.5185 * np.log10(temp / epsilon))
+    conc = pressure * 101325 / (Boltzmann * temp)
+    return conc * np.pi * sigma ** 2 * np.sqrt(8 * Boltzmann * temp / (np.pi * mu)) * omega
+
+
+class _Well(NamedTuple):
+    # Everything the solver needs about a well, all on the shared grid
+    offset: int  # first grain of the well
+    density: np.ndarray  # states / cm^-1 for grains offset, offset + 1, ...
+    mass: float
+    lj: LennardJones
+
+
+class _MEData(NamedTuple):
+    # A picklable snapshot of the network shipped to the worker processes
+    grain: float
+    n_grains: int
+    wells: list
+    isomerizations: list  # (source well, target well, k(E) on the source's grains)
+    dissociations: list  # (source well, sink index, k(E) on the source's grains)
+    bath_lj: LennardJones
+    bath_mass: float
+    alpha300: float
+    alpha_n: float
+    band_tol: float
+
+
+class MESweep(NamedTuple):
+    """Phenomenological rate coefficients on a (T, P) grid.
+
+    Attributes
+    ----------
+    temps : `np.ndarray`
+        The temperatures in K.
+    pressures : `np.ndarray`
+        The pressures in atm.
+    wells : list of str
+        The names of the wells (the sources).
+    labels : list of str
+        The names of the wells followed by the product channels (the targets).
+    k : `np.ndarray`
+        k[i, j, target, source] in 1/s at temps[i] and pressures[j]. Entries with
+        target == source are zero.
+    """
+
+    temps: np.ndarray
+    pressures: np.ndarray
+    wells: list
+    labels: list
+    k: np.ndarray
+
+    def channels(self):
+        """Returns the (source, target) pairs with a non-zero rate coefficient."""
+        return [
+            (source, target)
+            for (t, target), (s, source) in product(
+                enumerate(self.labels), enumerate(self.wells)
+            )
+            if target != source and np.all(self.k[:, :, t, s] > 0)
+        ]
+
+    def _channel_k(self):
+        channels = self.channels()
+        k = np.stack(
+            [
+                self.k[:, :, self.labels.index(t), self.wells.index(s)]
+                for s, t in channels
+            ],
+            axis=-1,
+        )
+        return channels, k
+
+    def chebyshev(self, n_t=6, n_p=4):
+        """Chebyshev fits of every channel, see `fit_chebyshev`.
+
+        Returns
+        -------
+        dict
+            The ChebyshevFit of each (source, target) channel.
+        """
+        channels, k = self._channel_k()
+        fit = fit_chebyshev(self.temps, self.pressures, k, n_t=n_t, n_p=n_p)
+        return {
+            channel: fit._replace(coeffs=fit.coeffs[..., i])
+            for i, channel in enumerate(channels)
+        }
+
+    def plog(self):
+        """PLOG (modified Arrhenius per pressure) fits of every channel, see `fit_plog`.
+
+        Returns
+        -------
+        dict
+            The PlogFit of each (source, target) channel.
+        """
+        channels, k = self._channel_k()
+        fit = fit_plog(self.temps, self.pressures, k)
+        return {
+            channel: PlogFit(fit.pressures, fit.A[:, i], fit.n[:, i], fit.Ea[:, i])
+            for i, channel in enumerate(channels)
+        }
+
+
+class MasterEquation:
+    """Multi-well, one-dimensional master equation.
+
+    Attributes
+    ----------
+    rrkm : RRKM
+        Supplies the energy grid, the states and k(E) of every channel.
+    wells : list of str
+        The well names, in the order they were added.
+    products : list of str
+        The names of the (irreversible) product channels.
+    """
+
+    def __init__(
+        self,
+        rrkm,
+        bath_lj=LennardJones(3.47, 114.0),
+        bath_mass=39.948,
+        alpha300=300.0,
+        alpha_n=0.85,
+        band_tol=1e-8,
+    ):
+        """
+        Parameters
+        ----------
+        rrkm : RRKM
+            Supplies the energy grid, the states and k(E) of every channel.
+        bath_lj : LennardJones, optional
+            Bath gas collision parameters, by default argon
+        bath_mass : float, optional
+            Bath gas mass in amu, by default 39.948 (argon)
+        alpha300 : float, optional
+            The average energy transferred in deactivating collisions at 300 K in cm^-1
+            (exponential down model), by default 300.0
+        alpha_n : float, optional
+            Temperature exponent, alpha = alpha300 (T / 300)^alpha_n, by default 0.85
+        band_tol : float, optional
+            Transitions less likely than this (relative to the elastic one) are
+            dropped, which sets the band width of the collision operator, by default 1e-8
+        """
+        self.rrkm = rrkm
+        self.bath_lj = bath_lj
+        self.bath_mass = bath_mass
+        self.alpha300 = alpha300
+        self.alpha_n = alpha_n
+        self.band_tol = band_tol
+
+        self.wells = []
+        self.products = []
+        self._wells = {}
+        self._isomerizations = []
+        self._dissociations = []
+        self._data = None
+
+    @property
+    def labels(self):
+        """The wells followed by the product channels."""
+        return self.wells + self.products
+
+    def add_well(self, name, cmol, sigma=1, lj=LennardJones(5.0, 400.0)):
+        """Adds a well to the network.
+
+        Parameters
+        ----------
+        name : str
+            The name of the well.
+        cmol : CMol
+            The molecule.
+        sigma : int, optional
+            The rotational symmetry factor, by default 1
+        lj : LennardJones, optional
+            The collision parameters, by default LennardJones(5.0, 400.0)
+        """
+        self.wells.append(name)
+        self._wells[name] = (cmol, sigma, lj)
+        self._data = None
+
+    def add_isomerization(self, source, target, ts, ts_sigma=1):
+        """Adds a reversible channel between two wells.
+
+        Parameters
+        ----------
+        source : str
+            The name of one well.
+        target : str
+            The name of the other well.
+        ts : CMol
+            The transition state.
+        ts_sigma : int, optional
+            The rotational symmetry factor of the transition state, by default 1
+        """
+        self._isomerizations.append((source, target, ts, ts_sigma))
+        self._data = None
+
+    def add_dissociation(self, source, product, ts, ts_sigma=1):
+        """Adds an irreversible channel out of a well.
+
+        Parameters
+        ----------
+        source : str
+            The name of the well.
+        product : str
+            The name of the product channel.
+        ts : CMol
+            The transition state.
+        ts_sigma : int, optional
+            The rotational symmetry factor of the transition state, by default 1
+        """
+        if product not in self.products:
+            self.products.append(product)
+        self._dissociations.append((source, product, ts, ts_sigma))
+        self._data = None
+
+    def _zero_point(self, cmol):
+        # Ground level energy in cm^-1
+        return convertor(cmol.energy, "hartree", "wavenumber") + convertor(
+            cmol.calc_ZPVE(scale=self.rrkm.scale), "kcal/mol", "wavenumber"
+        )
+
+    def _build(self):
+        """Collects the temperature and pressure independent data on the shared grid."""
+        if self._data is not None:
+            return self._data
+        if not self.wells:
+            raise ValueError("The master equation needs at least one well")
+
+        rrkm = self.rrkm
+        n_grains = rrkm.energies.size
+        zero_points = {name: self._zero_point(self._wells[name][0]) for name in self.wells}
+        e_ref = min(zero_points.values())
+
+        wells = []
+        for name in self.wells:
+            cmol, sigma, lj = self._wells[name]
+            offset = int(np.rint((zero_points[name] - e_ref) / rrkm.grain))
+            if offset >= n_grains:
+                raise ValueError(f"Well {name} lies above the top of the energy grid")
+            density = rrkm.states(cmol, sigma).density[: n_grains - offset]
+            wells.append(_Well(offset, density, float(np.sum(cmol.masses)), lj))
+
+        isomerizations = []
+        for source, target, ts, ts_sigma in self._isomerizations:
+            cmol, sigma, _ = self._wells[source]
+            k = rrkm.rate(cmol, ts, sigma, ts_sigma).k
+            s, t = self.wells.index(source), self.wells.index(target)
+            isomerizations.append((s, t, k[: n_grains - wells[s].offset]))
+
+        dissociations = []
+        for source, product, ts, ts_sigma in self._dissociations:
+            cmol, sigma, _ = self._wells[source]
+            k = rrkm.rate(cmol, ts, sigma, ts_sigma).k
+            s = self.wells.index(source)
+            dissociations.append(
+                (s, self.products.index(product), k[: n_grains - wells[s].offset])
+            )
+
+        self._data = _MEData(
+            rrkm.grain,
+            n_grains,
+            wells,
+            isomerizations,
+            dissociations,
+            self.bath_lj,
+            self.bath_mass,
+            self.alpha300,
+            self.alpha_n,
+            self.band_tol,
+        )
+        return self._data
+
+    def solve(self, temp, pressure, solver="sparse"):
+        """Phenomenological rate coefficients at one temperature and pressure.
+
+        Parameters
+        ----------
+        temp : float
+            The temperature in K.
+        pressure : float
+            The pressure in atm.
+        solver : str, optional
+            "sparse" (ARPACK shift-invert) or "banded" (LAPACK banded eigensolver),
+            by default "sparse"
+
+        Returns
+        -------
+        `np.ndarray`
+            k[target, source] in 1/s, with the targets ordered as `labels` and the
+            sources as `wells`.
+        """
+        return _solve_point(self._build(), temp, pressure, solver)
+
+    def sweep(self, temps, pressures, solver="sparse", processes=1):
+        """Phenomenological rate coefficients on a whole (T, P) grid.
+
+        Parameters
+        ----------
+        temps : iterable (list or `np.ndarray`)
+            The temperatures in K.
+        pressures : iterable (list or `np.ndarray`)
+            The pressures in atm.
+        solver : str, optional
+            "sparse" or "banded", see `solve`, by default "sparse"
+        processes : int, optional
+            Number of worker processes the grid points are spread over, None uses every
+            core, by default 1 (serial)
+
+        Returns
+        -------
+        MESweep
+            The rate coefficients on the grid.
+        """
+        temps = np.atleast_1d(np.asarray(temps, dtype=float))
+        pressures = np.atleast_1d(np.asarray(pressures, dtype=float))
+        data = self._build()
+        points = list(product(temps, pressures))
+
+        if processes == 1:
+            k = [_solve_point(data, t, p, solver) for t, p in points]
+        else:
+            with spawn_pool(processes, initializer=_init_worker, initargs=(data,)) as pool:
+                k = pool.starmap(_solve_worker, [(t, p, solver) for t, p in points])
+
+        k = np.reshape(k, (temps.size, pressures.size, len(self.labels), len(self.wells)))
+        return MESweep(temps, pressures, list(self.wells), self.labels, k)
+
+
+def _collision_block(density, energies, temp, alpha, band):
+    """Symmetrized collision operator (P - I) of one well in its local grain order.
+
+    The exponential down kernel (with up transitions from detailed balance) is made
+    column stochastic by a symmetric diagonal scaling, so normalization and detailed
+    balance hold exactly. The scaling is found with a Sinkhorn-type iteration on the
+    banded matrix.
+    """
+    active = np.nonzero(density > 0)[0]
+    n = active.size
+    beta = h * c_in_cm / (Boltzmann * temp)
+    log_f = np.log(density[active]) - beta * energies[active]
+
+    # Upper triangle (down transitions j -> i, i <= j) of A_ij = T_ij sqrt(f_j / f_i)
+    rows, cols = [], []
+    for d in range(min(band, n - 1) + 1):
+        rows.append(np.arange(n - d))
+        cols.append(np.arange(d, n))
+    rows, cols = np.concatenate(rows), np.concatenate(cols)
+    de = energies[active][cols] - energies[active][rows]
+    a = np.exp(-de / alpha + 0.5 * (log_f[cols] - log_f[rows]))
+    upper = sp.csr_matrix((a, (rows, cols)), shape=(n, n))
+    A = upper + sp.triu(upper, 1).T
+
+    # Column sums of P_ij = x_i x_j A_ij sqrt(f_i / f_j) must all be one
+    sqrt_f = np.exp(0.5 * (log_f - log_f.max()))
+    x = np.ones(n) / np.sqrt(A.sum(axis=0).A1.max())
+    for _ in range(1000):
+        col = x * (A @ (x * sqrt_f)) / sqrt_f
+        if np.abs(col - 1.0).max() < 1e-12:
+            break
+        x /= np.sqrt(col)
+    else:
+        raise RuntimeError("Normalization of the collision operator didn't converge")
+
+    S = sp.diags(x) @ A @ sp.diags(x) - sp.identity(n)
+    return active, S.tocoo()
+
+
+def _solve_point(data, temp, pressure, solver):
+    if solver not in SOLVERS:
+        raise ValueError(f"Unknown solver {solver}, choose from {SOLVERS}")
+
+    n_wells = len(data.wells)
+    energies = np.arange(data.n_grains) * data.grain
+    beta = h * c_in_cm / (Boltzmann * temp)
+    alpha = data.alpha300 * (temp / 300.0) ** data.alpha_n
+    band = int(np.ceil(-alpha * np.log(data.band_tol) / data.grain))
+
+    # Global index of every active (grain, well) state, ordered by grain then well
+    grains, owners, local = [], [], []
+    blocks = []
+    for w, well in enumerate(data.wells):
+        local_energies = energies[: well.density.size]
+        active, block = _collision_block(well.density, local_energies, temp, alpha, band)
+        omega = collision_frequency(
+            well.lj, data.bath_lj, well.mass, data.bath_mass, temp, pressure
+        )
+        blocks.append((active, omega * block))
+        grains.append(active + well.offset)
+        owners.append(np.full(active.size, w))
+        local.append(active)
+    grains, owners, local = map(np.concatenate, (grains, owners, local))
+    order = np.lexsort((owners, grains))
+    n_states = order.size
+    index = [np.full(well.density.size, -1) for well in data.wells]
+    position = np.empty(n_states, dtype=int)
+    position[order] = np.arange(n_states)
+    for w in range(n_wells):
+        mask = owners == w
+        index[w][local[mask]] = position[mask]
+
+    # Boltzmann weights on the absolute grid, log f = ln rho - beta E
+    log_f = np.full(n_states, -np.inf)
+    for w, well in enumerate(data.wells):
+        active = index[w] >= 0
+        e_abs = energies[: well.density.size][active] + well.offset * data.grain
+        log_f[index[w][active]] = np.log(well.density[active]) - beta * e_abs
+
+    rows, cols, vals = [], [], []
+    for w, (active, block) in enumerate(blocks):
+        rows.append(index[w][active[block.row]])
+        cols.append(index[w][active[block.col]])
+        vals.append(block.data)
+
+    diag = np.zeros(n_states)
+    for s, t, k in data.isomerizations:
+        src, tgt = data.wells[s], data.wells[t]
+        e_grains = np.arange(k.size) + src.offset
+        in_target = (e_grains >= tgt.offset) & (e_grains - tgt.offset < tgt.density.size)
+        i_src = index[s][np.arange(k.size)]
+        i_tgt = np.full(k.size, -1)
+        i_tgt[in_target] = index[t][e_grains[in_target] - tgt.offset]
+        ok = (k > 0) & (i_src >= 0) & (i_tgt >= 0)
+        i_src, i_tgt, k = i_src[ok], i_tgt[ok], k[ok]
+
+        # Reverse rate by detailed balance, k_ts f_s = k_st f_t
+        k_rev = k * np.exp(log_f[i_src] - log_f[i_tgt])
+        np.add.at(diag, i_src, -k)
+        np.add.at(diag, i_tgt, -k_rev)
+        coupling = np.sqrt(k * k_rev)
+        rows += [i_tgt, i_src]
+        cols += [i_src, i_tgt]
+        vals += [coupling, coupling]
+
+    n_products = max([p for _, p, _ in data.dissociations], default=-1) + 1
+    sink_rows = [[] for _ in range(n_products)]
+    for s, p, k in data.dissociations:
+        i_src = index[s][np.arange(k.size)]
+        ok = (k > 0) & (i_src >= 0)
+        np.add.at(diag, i_src[ok], -k[ok])
+        sink_rows[p].append((i_src[ok], k[ok]))
+
+    rows.append(np.arange(n_states))
+    cols.append(np.arange(n_states))
+    vals.append(diag)
+    S = sp.coo_matrix(
+        (np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))),
+        shape=(n_states, n_states),
+    ).tocsr()
+
+    eigvals, eigvecs = _chemically_significant(S, n_wells, solver)
+
+    # Bartis-Widom: with g_k = f^1/2 phi_k, the well populations of the slow modes are
+    # Y[w, k] = sum_E g_k and the flux into each sink is R[p, k] = sum_E k_p(E) g_k
+    sqrt_f = np.exp(0.5 * (log_f - log_f.max()))
+    g = sqrt_f[:, np.newaxis] * eigvecs
+    Y = np.stack([g[owners[order] == w].sum(axis=0) for w in range(n_wells)])
+    Y_inv = np.linalg.inv(Y)
+    K = Y @ np.diag(eigvals) @ Y_inv
+
+    k_out = np.zeros((n_wells + n_products, n_wells))
+    k_out[:n_wells] = K - np.diag(np.diag(K))
+    for p, parts in enumerate(sink_rows):
+        R = sum((k[:, np.newaxis] * g[i]).sum(axis=0) for i, k in parts)
+        k_out[n_wells + p] = R @ Y_inv
+    return k_out
+
+
+def _chemically_significant(S, n, solver):
+    # The n eigenvalues closest to zero (all of them are <= 0)
+    n_states = S.shape[0]
+    if solver == "sparse" and n < n_states - 1:
+        # Any positive shift picks the least negative eigenvalues
+        shift = 1e-6 * np.abs(S.diagonal()).max()
+        eigvals, eigvecs = eigsh(S.tocsc(), k=n, sigma=shift, which="LM")
+    else:
+        lower = sp.tril(S).tocoo()
+        offsets = lower.row - lower.col
+        ab = np.zeros((offsets.max() + 1, n_states))
+        ab[offsets, lower.col] = lower.data
+        eigvals, eigvecs = eig_banded(
+            ab, lower=True, select="i", select_range=(n_states - n, n_states - 1)
+        )
+    order = np.argsort(eigvals)[::-1]
+    return eigvals[order], eigvecs[:, order]
+
+
+_worker_data = None
+
+
+def _init_worker(data):
+    global _worker_data
+    _worker_data = data
+
+
+def _solve_worker(temp, pressure, solver):
+    return _solve_point(_worker_data, temp, pressure, solver)
+
+
+################################################################################
+# Fits
+################################################################################
+
+
+class ChebyshevFit(NamedTuple):
+    """Chebyshev fit of log10 k(T, P) in (1/T, log10 P).
+
+    Attributes
+    ----------
+    coeffs : `np.ndarray`
+        The coefficients with shape (n_t, n_p, ...).
+    t_min : float
+        The lowest temperature in K.
+    t_max : float
+        The highest temperature in K.
+    p_min : float
+        The lowest pressure in atm.
+    p_max : float
+        The highest pressure in atm.
+    """
+
+    coeffs: np.ndarray
+    t_min: float
+    t_max: float
+    p_min: float
+    p_max: float
+
+    def rate(self, temp, pressure):
+        """Evaluates the fit.
+
+        Parameters
+        ----------
+        temp : float or `np.ndarray`
+            The temperature(s) in K.
+        pressure : float or `np.ndarray`
+            The pressure(s) in atm, broadcast against `temp`.
+
+        Returns
+        -------
+        float or `np.ndarray`
+            k in the units of the fitted data.
+        """
+        x_t, x_p = _reduced_tp(temp, pressure, self.t_min, self.t_max, self.p_min, self.p_max)
+        x_t, x_p = np.broadcast_arrays(x_t, x_p)
+        basis = _chebyshev_basis(x_t, x_p, *self.coeffs.shape[:2])
+        coeffs = self.coeffs.reshape(basis.shape[-1], -1)
+        log_k = basis @ coeffs
+        return 10 ** log_k.reshape(x_t.shape + self.coeffs.shape[2:])
+
+
+def _reduced_tp(temp, pressure, t_min, t_max, p_min, p_max):
+    x_t = (2.0 / np.asarray(temp) - 1.0 / t_min - 1.0 / t_max) / (1.0 / t_max - 1.0 / t_min)
+    log_p = np.log10(pressure)
+    x_p = (2.0 * log_p - np.log10(p_min) - np.log10(p_max)) / (
+        np.log10(p_max) - np.log10(p_min)
+    )
+    return x_t, x_p
+
+
+def _chebyshev_basis(x_t, x_p, n_t, n_p):
+    # phi_i(x_t) phi_j(x_p) for every point, flattened to (points..., n_t * n_p)
+    v_t = chebyshev.chebvander(x_t, n_t - 1)
+    v_p = chebyshev.chebvander(x_p, n_p - 1)
+    basis = v_t[..., :, np.newaxis] * v_p[..., np.newaxis, :]
+    return basis.reshape(basis.shape[:-2] + (n_t * n_p,))
+
+
+def fit_chebyshev(temps, pressures, k, n_t=6, n_p=4):
+    """Fits log10 k(T, P) on a (T, P) grid with Chebyshev polynomials.
+
+    Every channel is fitted in one least squares solve with a shared design matrix.
+
+    Parameters
+    ----------
+    temps : `np.ndarray`
+        The temperatures in K, shape (n_T,).
+    pressures : `np.ndarray`
+        The pressures in atm, shape (n_P,).
+    k : `np.ndarray`
+        The (positive) rate coefficients, shape (n_T, n_P, ...).
+    n_t : int, optional
+        The number of basis functions in temperature, by default 6
+    n_p : int, optional
+        The number of basis functions in pressure, by default 4
+
+    Returns
+    -------
+    ChebyshevFit
+        The fit, with coefficients of shape (n_t, n_p, ...).
+    """
+    temps, pressures = np.asarray(temps, dtype=float), np.asarray(pressures, dtype=float)
+    if n_t > temps.size or n_p > pressures.size:
+        raise ValueError("The fit needs at least n_t temperatures and n_p pressures")
+    t_min, t_max = temps.min(), temps.max()
+    p_min, p_max = pressures.min(), pressures.max()
+
+    x_t, x_p = _reduced_tp(
+        temps[:, np.newaxis], pressures[np.newaxis, :], t_min, t_max, p_min, p_max
+    )
+    x_t, x_p = np.broadcast_arrays(x_t, x_p)
+    basis = _chebyshev_basis(x_t, x_p, n_t, n_p).reshape(-1, n_t * n_p)
+    rhs = np.log10(k).reshape(basis.shape[0], -1)
+    coeffs = np.linalg.lstsq(basis, rhs, rcond=None)[0]
+    return ChebyshevFit(coeffs.reshape((n_t, n_p) + k.shape[2:]), t_min, t_max, p_min, p_max)
+
+
+class PlogFit(NamedTuple):
+    """Modified Arrhenius fits, k = A T^n exp(-Ea / RT), at a list of pressures.
+
+    Attributes
+    ----------
+    pressures : `np.ndarray`
+        The pressures in atm, shape (n_P,).
+    A : `np.ndarray`
+        The pre-exponential factors in the units of k, shape (n_P, ...).
+    n : `np.ndarray`
+        The temperature exponents, shape (n_P, ...).
+    Ea : `np.ndarray`
+        The activation energies in kcal/mol, shape (n_P, ...).
+    """
+
+    pressures: np.ndarray
+    A: np.ndarray
+    n: np.ndarray
+    Ea: np.ndarray
+
+    def rate(self, temp, pressure):
+        """Evaluates the fit, interpolating ln k linearly in ln P between pressures.
+
+        Parameters
+        ----------
+        temp : float
+            The temperature in K.
+        pressure : float
+            The pressure in atm, clipped to the fitted range.
+
+        Returns
+        -------
+        float or `np.ndarray`
+            k in the units of the fitted data.
+        """
+        log_k = np.log(self.A) + self.n * np.log(temp) - self.Ea / (R_kcal * temp)
+        log_p = np.log(self.pressures)
+        x = np.clip(np.log(pressure), log_p[0], log_p[-1])
+        i = min(np.searchsorted(log_p, x, side="right") - 1, log_p.size - 2)
+        if log_p.size == 1:
+            return np.exp(log_k[0])
+        w = (x - log_p[i]) / (log_p[i + 1] - log_p[i])
+        return np.exp((1 - w) * log_k[i] + w * log_k[i + 1])
+
+
+def fit_plog(temps, pressures, k):
+    """Fits a modified Arrhenius expression at each pressure (PLOG format).
+
+    Every pressure and channel is fitted in one batch, see `arrhenius.fit_arrhenius`.
+
+    Parameters
+    ----------
+    temps : `np.ndarray`
+        The temperatures in K, shape (n_T,).
+    pressures : `np.ndarray`
+        The pressures in atm, shape (n_P,).
+    k : `np.ndarray`
+        The (positive) rate coefficients, shape (n_T, n_P, ...).
+
+    Returns
+    -------
+    PlogFit
+        The fits, sorted by pressure.
+    """
+    pressures = np.asarray(pressures, dtype=float)
+    fit = fit_arrhenius(temps, np.moveaxis(k, 0, -1))
+    order = np.argsort(pressures)
+    return PlogFit(pressures[order], fit.A[order], fit.n[order], fit.Ea[order])
@@ -5,6 +5,8 @@ Author: James E T Smith <james.smith9113@gmail.com>
 Date: 1/8/20
 """
 
+from collections import OrderedDict
+
 import numpy as np
 from scipy.constants import N_A, Boltzmann, h, c
 
@@ -14,71 +16,261 @@ from cclib.method import Nuclear
 from cclib.method.nuclear import get_isotopic_masses
 
 from cantherm import statmech
+from cantherm.io.cache import ParseCache, parse_file
 from cantherm.math.orientation3d import calc_principal_moi
 from cantherm.statmech.partition_function import q_tr, q_rot, q_vib
+from cantherm.statmech.partition_function import log_q_tr, log_q_rot
 
 la = np.linalg
 
+# Number of scale factors whose mode energies each CMol keeps around
+MODE_ENERGY_CACHE_SIZE = 8
+
+
+class lazy_property:
+    """Computed on first access and then stored on the instance, like
+    `functools.cached_property` (which needs Python 3.8). Assigning the attribute
+    replaces the cached value."""
+
+    def __init__(self, func):
+        self.func = func
+        self.name = func.__name__
+        self.__doc__ = func.__doc__
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        value = self.func(instance)
+        instance.__dict__[self.name] = value
+        return value
+
 
 class CMol:
-    def __init__(self, file_path: str):
-        self.data = cclib.io.ccread(file_path)
+    def __init__(self, file_path: str, cache: ParseCache = None, reader: str = "cclib"):
+        # Nothing is read here, the file is parsed the first time any of its data is used
+        # and everything derived from it (geometry, masses, moments of inertia,
+        # frequencies) is only computed when asked for
         self.file_path = file_path
+        self._cache = cache
+        # "cclib" (full parse) or "fast" (targeted Gaussian/ORCA reader, cclib otherwise)
+        self._reader = reader
+
+        # Hindered rotors as (HinderedRotor, index of the vibrational mode it replaces)
+        self.hindered_rotors = []
+
+        # Scaled harmonic mode energies (hv in J) keyed on (scale, replaced modes)
+        self._mode_energy_cache = OrderedDict()
 
-        # Calculation properties
-        # Check for success of calculation
-        metadata = self.data.metadata
+    @lazy_property
+    def _parsed(self):
+        # With a cache, warm loads read the stored arrays instead of parsing with cclib
+        return parse_file(self.file_path, cache=self._cache, reader=self._reader)
 
+    @lazy_property
+    def data(self):
+        """The parsed file (cclib data, or the cached arrays when loaded through a cache)."""
         # Make sure the calculation finished successfully
-        self.success = metadata["success"]
-        if self.success == False:
+        if not self.success:
             raise ValueError(
                 "Calculation wasn't successful, we shouldn't process the data"
             )
+        # Handed over rather than shared, so replacing `data` frees the parse
+        return self.__dict__.pop("_parsed")
 
-        # Get basis set
-        # print(metadata)
-        self.basis_set = metadata.get("basis_set", "")
+    # Calculation properties
 
+    @lazy_property
+    def success(self) -> bool:
+        """Whether the calculation finished successfully, False rather than an error for a
+        failed job."""
+        parsed = self.__dict__["data"] if "data" in self.__dict__ else self._parsed
+        return bool(parsed.metadata["success"])
+
+    @lazy_property
+    def basis_set(self) -> str:
         # if self._basis_set == "CBSB3":
         #     raise ValueError("CBSQB3 parsing hasn't been implemented yet.")
+        return self.data.metadata.get("basis_set", "")
 
-        # Get methods used (i.e. HF, DFT, CCSD, CCSD-T, etc)
+    @lazy_property
+    def methods(self) -> list:
+        """Methods used (i.e. HF, DFT, CCSD, CCSD-T, etc)."""
+        return self.data.metadata["methods"]
 
-        self.methods = metadata["methods"]
-        self.method = ""
+    @lazy_property
+    def method(self) -> str:
+        """The final method used."""
         try:
-            self.method = self.methods[-1]  # final method used
+            return self.methods[-1]
         except IndexError:
-            print(f"Can't find methods info in metadata for {file_path}")
+            print(f"Can't find methods info in metadata for {self.file_path}")
+            return ""
+
+    # Molecular properties
 
-        # Molecular properties
+    @lazy_property
+    def energy(self) -> float:
+        """The final electronic energy in hartree."""
         if "CC" in self.method:
-            self.energy = convertor(self.data.ccenergies[-1], "eV", "hartree")
-        else:
-            self.energy = convertor(self.data.scfenergies[-1], "eV", "hartree")
+            return convertor(self.data.ccenergies[-1], "eV", "hartree")
+        return convertor(self.data.scfenergies[-1], "eV", "hartree")
 
-        self.geom = self.data.atomcoords[-1]  # Get final geom in Angstroms
-        self.masses = get_isotopic_masses(self.data.atomnos)
+    @lazy_property
+    def geom(self) -> np.ndarray:
+        """The final geometry in Angstroms."""
+        return self.data.atomcoords[-1]
 
+    @lazy_property
+    def masses(self) -> np.ndarray:
+        """The isotopic masses in amu."""
+        return get_isotopic_masses(self.data.atomnos)
+
+    @lazy_property
+    def mom_inertia(self) -> np.ndarray:
+        """The principal moments of inertia in kg * m^2."""
         # nuc = Nuclear(self.data)
         # self.mom_inertia = (
         #     nuc.principal_moments_of_inertia("g_cm_2")[0] * 1e-7
         # ) in kg * m^2
 
-        # Calculate principal moments of inertia
         # masses amu -> kg && coords angstroms -> m
         moi = calc_principal_moi(self.masses, self.geom)
-        self.mom_inertia = moi / N_A / 1e3 * 1e-20  # in kg * m^2
+        return moi / N_A / 1e3 * 1e-20
 
-        # Optional properties
-        try:
-            self.vibfreqs = self.data.vibfreqs
-        except:
-            print(f"No vib data found for {file_path}")
+    # Optional properties
+
+    @property
+    def vibfreqs(self) -> np.ndarray:
+        """The vibrational frequencies in cm^-1 (read-only, assign a new array to change them)."""
+        if "_vibfreqs" not in self.__dict__:
+            try:
+                freqs = self.data.vibfreqs
+            except AttributeError:
+                raise AttributeError(f"No vib data found for {self.file_path}") from None
+            self._vibfreqs = self._read_only(freqs)
+        return self._vibfreqs
+
+    @vibfreqs.setter
+    def vibfreqs(self, freqs):
+        # The cached mode energies belong to the old frequencies
+        self._vibfreqs = self._read_only(np.array(freqs, dtype=float))
+        self._mode_energy_cache.clear()
+
+    @staticmethod
+    def _read_only(freqs):
+        # An in-place edit would leave the cached mode energies stale
+        freqs = np.asarray(freqs, dtype=float).view()
+        freqs.flags.writeable = False
+        return freqs
+
+    @property
+    def imag_freq(self) -> float:
+        """The imaginary frequency in cm^-1 (negative) of a transition state, None for a minimum."""
+        imag = self.vibfreqs[self.vibfreqs < 0]
+        return imag[0] if imag.size else None
+
+    def add_hindered_rotor(self, rotor: statmech.HinderedRotor, mode: int = None) -> int:
+        """Treats one of the vibrational modes as a hindered rotor instead of a harmonic oscillator.
+
+        Parameters
+        ----------
+        rotor : statmech.HinderedRotor
+            The rotor that replaces the harmonic mode.
+        mode : int, optional
+            The index (in `vibfreqs`) of the mode to replace. By default the remaining
+            harmonic mode closest to the rotor's harmonic frequency is used.
+
+        Returns
+        -------
+        int
+            The index of the replaced mode.
+
+        Raises
+        ------
+        ValueError
+            If the mode has already been replaced by another rotor.
+        """
+        replaced = [m for _, m in self.hindered_rotors]
+        if mode is None:
+            candidates = [i for i in range(len(self.vibfreqs)) if i not in replaced]
+            mode = min(
+                candidates, key=lambda i: abs(self.vibfreqs[i] - rotor.harmonic_freq)
+            )
+        elif mode in replaced:
+            raise ValueError(f"Mode {mode} has already been replaced by a hindered rotor")
+
+        self.hindered_rotors.append((rotor, mode))
+        return mode
+
+    def harmonic_freqs(self) -> np.ndarray:
+        """Returns the frequencies treated as harmonic oscillators.
+
+        Modes replaced by hindered rotors and imaginary (TS) modes are left out.
+
+        Returns
+        -------
+        `np.ndarray`
+            The harmonic frequencies in cm^-1.
+        """
+        replaced = [m for _, m in self.hindered_rotors]
+        freqs = np.delete(self.vibfreqs, replaced)
+        return freqs[freqs > 0]
+
+    def _mode_energies(self, scale: float) -> np.ndarray:
+        """Returns the (cached) harmonic mode energies in J for a given scale factor.
+
+        The cache is a small LRU keyed on the scale factor and the modes replaced by
+        hindered rotors, so it never holds more than `MODE_ENERGY_CACHE_SIZE` arrays.
+        """
+        key = (scale, tuple(m for _, m in self.hindered_rotors))
+        energies = self._mode_energy_cache.pop(key, None)
+        if energies is None:
+            energies = statmech.mode_energies(self.harmonic_freqs(), scale=scale)
+            energies.setflags(write=False)
+            while len(self._mode_energy_cache) >= MODE_ENERGY_CACHE_SIZE:
+                self._mode_energy_cache.popitem(last=False)
+        self._mode_energy_cache[key] = energies
+        return energies
+
+    def calc_vib_thermo(
+        self,
+        temp: float,
+        scale: float = 1.0,
+        qrrho: str = None,
+        qrrho_cutoff: float = 100.0,
+    ) -> statmech.HOThermo:
+        """Returns all of the harmonic vibrational contributions from a single kernel call.
+
+        Parameters
+        ----------
+        temp : float or `np.ndarray`
+            The temperature(s) in K.
+        scale : float, optional
+            Scale of the frequencies, by default 1.0
+        qrrho : str, optional
+            Quasi-RRHO treatment of the soft harmonic modes, None, "truhlar", or "grimme",
+            see `statmech.ho_thermo_from_energies`, by default None
+        qrrho_cutoff : float, optional
+            The quasi-RRHO cutoff frequency in cm^-1, by default 100.0
+
+        Returns
+        -------
+        statmech.HOThermo
+            The vibrational Q, H (kcal/mol), S (cal/(mol K)), Cp (cal/(mol K)),
+            G (kcal/mol), and ZPVE (kcal/mol). Includes any hindered rotors.
+        """
+        vib = statmech.ho_thermo_from_energies(
+            self._mode_energies(scale), temp, qrrho=qrrho, qrrho_cutoff=qrrho_cutoff
+        )
+        if self.hindered_rotors:
+            vib = statmech.combine_thermo(
+                vib, *[rotor.thermo(temp) for rotor, _ in self.hindered_rotors]
+            )
+        return vib
 
     def calc_ZPVE(self, scale: float = 1.0, units: str = "kcal/mol") -> float:
-        zpve = statmech.zpve(self.vibfreqs, scale=scale)
+        zpve = statmech.zpve_from_energies(self._mode_energies(scale))
+        zpve += sum(rotor.zpve for rotor, _ in self.hindered_rotors)
         if units != "kcal/mol":
             zpve = convertor(zpve, "kcal/mol", units)
         return zpve
@@ -87,17 +279,25 @@ class CMol:
         self, temp: float, scale: float = 1.0, units: str = "kcal/mol"
     ) -> float:
         cp = statmech.cp_tr() + statmech.cp_rot()
-        cp += statmech.cp_vib(self.vibfreqs, temp, scale=scale)
+        cp += self.calc_vib_thermo(temp, scale=scale).cp
         if units != "kcal/mol":
             cp = convertor(cp, "kcal/mol", units)
         return cp
 
     def calc_entropy(
-        self, temp: float, sigma: int, scale: float = 1.0, units: str = "kcal/mol"
+        self,
+        temp: float,
+        sigma: int,
+        scale: float = 1.0,
+        units: str = "kcal/mol",
+        qrrho: str = None,
+        qrrho_cutoff: float = 100.0,
     ) -> float:
         ent = statmech.s_tr(self.masses, temp)
         ent += statmech.s_rot(sigma, self.mom_inertia, temp)
-        ent += statmech.s_vib(self.vibfreqs, temp, scale=scale)
+        ent += self.calc_vib_thermo(
+            temp, scale=scale, qrrho=qrrho, qrrho_cutoff=qrrho_cutoff
+        ).s
         ent /= 1000  # cal/mol K to kcal/mol K
         if units != "kcal/mol":
             # This isn't really even the units we should change this
@@ -108,14 +308,35 @@ class CMol:
         # print("VIB", statmech.s_vib(self.vibfreqs, temp, scale=scale))
         return ent
 
+    def calc_enthalpy(
+        self, temp: float, scale: float = 1.0, units: str = "kcal/mol"
+    ) -> float:
+        vib = self.calc_vib_thermo(temp, scale=scale)
+        enthalpy = statmech.h_tr(temp) + statmech.h_rot(temp)
+        enthalpy += vib.h
+        enthalpy += convertor(self.energy, "hartree", "kcal/mol")
+        enthalpy += vib.zpve
+        if units != "kcal/mol":
+            enthalpy = convertor(enthalpy, "kcal/mol", units)
+        return enthalpy
+
     def calc_free_energy(
-        self, temp: float, sigma: int, scale: float = 1.0, units: str = "kcal/mol"
+        self,
+        temp: float,
+        sigma: int,
+        scale: float = 1.0,
+        units: str = "kcal/mol",
+        qrrho: str = None,
+        qrrho_cutoff: float = 100.0,
     ) -> float:
+        vib = self.calc_vib_thermo(
+            temp, scale=scale, qrrho=qrrho, qrrho_cutoff=qrrho_cutoff
+        )
         free_energy = statmech.g_tr(self.masses, temp)
         free_energy += statmech.g_rot(sigma, self.mom_inertia, temp)
-        free_energy += statmech.g_vib(self.vibfreqs, temp, scale=scale)
+        free_energy += vib.g
         free_energy += convertor(self.energy, "hartree", "kcal/mol")
-        free_energy += self.calc_ZPVE(scale=scale)
+        free_energy += vib.zpve
         if units != "kcal/mol":
             free_energy = convertor(free_energy, "kcal/mol", units)
         return free_energy
@@ -135,9 +356,88 @@ class CMol:
         """
         Q = q_tr(self.masses, temp)
         Q *= q_rot(sigma, self.mom_inertia, temp)
-        Q *= q_vib(self.vibfreqs, temp, scale=scale)
+        Q *= self.calc_vib_thermo(temp, scale=scale).q
 
         # print("Q_tr", q_tr(self.masses, temp))
         # print("Q_rot", q_rot(sigma, self.mom_inertia, temp))
         # print("Q_vib", q_vib(self.vibfreqs, temp, scale=1))
         return Q
+
+    def calc_log_Q(
+        self, temp: float, sigma: int, scale: float = 1.0,
+    ):
+        """Returns the natural log of the total (translational, rotational, and vibrational) partition function.
+
+        Each contribution is evaluated in log space, so this stays finite for very large
+        molecules and should be preferred to `calc_Q` when forming ratios of partition functions.
+
+        Parameters
+        ----------
+        temp : float or `np.ndarray`
+            The temperature(s) in K.
+        sigma : int
+            The rotational symmetry factor of the molecule.
+        scale : float, optional
+            Scale of the frequencies, by default 1.0
+
+        Returns
+        -------
+        float or `np.ndarray`
+            ln(Q), with the same shape as `temp`.
+        """
+        log_Q = log_q_tr(self.masses, temp)
+        log_Q += log_q_rot(sigma, self.mom_inertia, temp)
+        log_Q += self.calc_vib_thermo(temp, scale=scale).log_q
+        return log_Q
+
+    def calc_states(
+        self,
+        sigma: int,
+        grain: float = 10.0,
+        e_max: float = 35000.0,
+        scale: float = 1.0,
+        rotations: bool = True,
+        method: str = "bs",
+    ) -> statmech.StatesResult:
+        """Returns the sum and density of rovibrational states on an energy grid.
+
+        Harmonic modes are counted with Beyer-Swinehart, hindered rotors with
+        Stein-Rabinovitch using their exact levels, and the external rotations as a
+        classical rigid rotor.
+
+        Parameters
+        ----------
+        sigma : int
+            The rotational symmetry factor of the molecule.
+        grain : float, optional
+            The grain width in cm^-1, by default 10.0
+        e_max : float, optional
+            The top of the energy grid in cm^-1, by default 35000.0 (~100 kcal/mol)
+        scale : float, optional
+            Scale of the frequencies, by default 1.0
+        rotations : bool, optional
+            Whether to include the external rotations, by default True
+        method : str, optional
+            "bs" or "fft" (see `statmech.count_states`), by default "bs"
+
+        Returns
+        -------
+        statmech.StatesResult
+            The energy grid (cm^-1), counts, density (1/cm^-1) and sum of states.
+        """
+        rot_consts = None
+        if rotations:
+            rot_consts = statmech.rotational_constants(self.mom_inertia)
+        return statmech.count_states(
+            self.harmonic_freqs() * scale,
+            grain=grain,
+            e_max=e_max,
+            rot_consts=rot_consts,
+            sigma=sigma,
+            levels=[
+                statmech.hindered_rotor_levels(rotor, e_max=e_max)
+                for rotor, _ in self.hindered_rotors
+            ],
+            level_sigmas=[rotor.sigma for rotor, _ in self.hindered_rotors],
+            method=method,
+        )
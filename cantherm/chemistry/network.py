@@ -0,0 +1,192 @@
+"""
+Batch evaluation of TST rates and equilibrium constants for whole reaction networks
+"""
+import numpy as np
+from scipy.constants import calorie, physical_constants, N_A
+
+from cantherm.statmech.kinetics import log_tst_rate, standard_concentration
+from cantherm.statmech.tunneling import wigner_correction, eckart_correction
+
+R_kcal = physical_constants["molar gas constant"][0] / (calorie * 1e3)
+ha_to_kcal = physical_constants["Hartree energy"][0] * N_A / (calorie * 1e3)
+
+
+class ReactionNetwork:
+    """A set of species shared by many reactions.
+
+    Every species' ln Q(T) and G(T) are computed once on the network temperatures and
+    kept as (n_species, n_T) tables. Reactions only store indices into these tables, so
+    the rates and equilibrium constants of all reactions are a few matrix products with
+    the stoichiometry matrices, and the cost of the statmech scales with the number of
+    species rather than the number of reactions.
+
+    Attributes
+    ----------
+    temps : `np.ndarray`
+        The temperatures in K.
+    scale : float
+        Scale of the frequencies.
+    species : list of str
+        The species names (transition states included), in the order they were added.
+    reactions : list of tuple
+        (reactants, products, ts, tunneling) for each reaction.
+    """
+
+    def __init__(self, temps, scale=0.99):
+        """
+        Parameters
+        ----------
+        temps : iterable (list or `np.ndarray`)
+            The temperatures in K.
+        scale : float, optional
+            Scale of the frequencies, by default 0.99
+        """
+        self.temps = np.atleast_1d(np.asarray(temps, dtype=float))
+        self.scale = scale
+        self.species = []
+        self.reactions = []
+        self._species = {}
+        self._tables = None
+
+    def add_species(self, name, cmol, sigma=1):
+        """Adds a species (or transition state) to the network.
+
+        Parameters
+        ----------
+        name : str
+            The name of the species, must be unique.
+        cmol : CMol
+            The molecule.
+        sigma : int, optional
+            The rotational symmetry factor, by default 1
+        """
+        if name in self._species:
+            raise ValueError(f"Species {name} is already in the network")
+        self.species.append(name)
+        self._species[name] = (cmol, sigma)
+        self._tables = None
+
+    def add_reaction(self, reactants, products, ts, tunneling=None):
+        """Adds a reaction between species already in the network.
+
+        Parameters
+        ----------
+        reactants : list of str
+            The reactant names (repeat a name for A + A).
+        products : list of str
+            The product names.
+        ts : str
+            The name of the transition state.
+        tunneling : str, optional
+            None, 'Wigner' or 'Eckart', by default None
+
+        Returns
+        -------
+        int
+            The index of the reaction.
+        """
+        for name in list(reactants) + list(products) + [ts]:
+            if name not in self._species:
+                raise ValueError(f"Species {name} isn't in the network")
+        if tunneling not in (None, "Wigner", "Eckart"):
+            raise ValueError(f"Unknown tunneling correction {tunneling}")
+        self.reactions.append((list(reactants), list(products), ts, tunneling))
+        return len(self.reactions) - 1
+
+    def _build_tables(self):
+        if self._tables is not None:
+            return self._tables
+        log_q = np.empty((len(self.species), self.temps.size))
+        e0 = np.empty(len(self.species))
+        for i, name in enumerate(self.species):
+            cmol, sigma = self._species[name]
+            log_q[i] = cmol.calc_log_Q(self.temps, sigma, scale=self.scale)
+            e0[i] = cmol.energy * ha_to_kcal + cmol.calc_ZPVE(scale=self.scale)
+        self._tables = (log_q, e0)
+        return self._tables
+
+    @property
+    def log_q_table(self):
+        """ln Q of every species, shape (n_species, n_T)."""
+        return self._build_tables()[0]
+
+    @property
+    def free_energy_table(self):
+        """Standard state (1 atm) G = E0 - RT ln Q of every species in kcal/mol, shape (n_species, n_T)."""
+        log_q, e0 = self._build_tables()
+        return e0[:, np.newaxis] - R_kcal * self.temps * log_q
+
+    def stoichiometry(self):
+        """Reactant and product count matrices.
+
+        Returns
+        -------
+        tuple(`np.ndarray`, `np.ndarray`)
+            The reactant and product counts, each with shape (n_reactions, n_species).
+            Their difference (products - reactants) is the stoichiometry matrix.
+        """
+        index = {name: i for i, name in enumerate(self.species)}
+        reac = np.zeros((len(self.reactions), len(self.species)))
+        prod = np.zeros((len(self.reactions), len(self.species)))
+        for r, (reactants, products, _, _) in enumerate(self.reactions):
+            np.add.at(reac[r], [index[name] for name in reactants], 1)
+            np.add.at(prod[r], [index[name] for name in products], 1)
+        return reac, prod
+
+    def calc_rates(self):
+        """TST rate constants of every reaction.
+
+        Returns
+        -------
+        `np.ndarray`
+            k with shape (n_reactions, n_T), in 1/s for unimolecular and
+            cm^3 / (mol s) for bimolecular reactions.
+        """
+        log_q, e0 = self._build_tables()
+        reac, prod = self.stoichiometry()
+        ts = np.array([self.species.index(ts) for _, _, ts, _ in self.reactions], dtype=int)
+        molecularity = reac.sum(axis=1)
+
+        barrier = e0[ts] - reac @ e0
+        log_k = log_tst_rate(
+            self.temps, log_q[ts], reac @ log_q, barrier[:, np.newaxis],
+            molecularity=molecularity[:, np.newaxis],
+        )
+
+        kappa = np.ones_like(log_k)
+        for r, (_, products, ts_name, tunneling) in enumerate(self.reactions):
+            if tunneling is None:
+                continue
+            cmol = self._species[ts_name][0]
+            if tunneling == "Wigner":
+                kappa[r] = wigner_correction(self.temps, cmol.imag_freq, self.scale)
+            else:
+                v_reverse = e0[ts[r]] - prod[r] @ e0 if products else barrier[r]
+                kappa[r] = eckart_correction(
+                    self.temps, cmol.imag_freq, self.scale, barrier[r], v_reverse
+                )
+        return np.exp(log_k) * kappa
+
+    def calc_equilibrium_constants(self, concentration=True):
+        """Equilibrium constants of every reaction from the G(T) table.
+
+        Parameters
+        ----------
+        concentration : bool, optional
+            Whether to return Kc in (mol / cm^3)^dn, the units that relate forward and
+            reverse rates from `calc_rates`, rather than the dimensionless Kp (1 atm
+            standard state), by default True
+
+        Returns
+        -------
+        `np.ndarray`
+            K with shape (n_reactions, n_T).
+        """
+        reac, prod = self.stoichiometry()
+        nu = prod - reac
+        log_k = -(nu @ self.free_energy_table) / (R_kcal * self.temps)
+        if concentration:
+            log_k += nu.sum(axis=1)[:, np.newaxis] * np.log(
+                standard_concentration(self.temps)
+            )
+        return np.exp(log_k)
@@ -0,0 +1,233 @@
+"""
+RRKM microcanonical rate constants for unimolecular reactions
+
+All energies are in cm^-1 and measured from the zero-point level of the reactant.
+"""
+import weakref
+from typing import NamedTuple
+
+import numpy as np
+from scipy.constants import c
+from cclib.parser.utils import convertor
+
+from cantherm import statmech
+
+c_in_cm = c * 100
+
+
+class RRKMResult(NamedTuple):
+    """Microcanonical rate constants on an energy grid.
+
+    Attributes
+    ----------
+    energies : `np.ndarray`
+        The lower edge of each energy grain in cm^-1, from the reactant zero-point level.
+    J : `np.ndarray` or None
+        The total angular momentum quantum numbers, None if the rotations are active.
+    k : `np.ndarray`
+        k(E) in 1/s with shape (n_grains,), or k(E, J) with shape (n_J, n_grains).
+        Grains below the threshold have k = 0.
+    e0 : float
+        The zero-point corrected barrier in cm^-1.
+    """
+
+    energies: np.ndarray
+    J: np.ndarray
+    k: np.ndarray
+    e0: float
+
+
+class RRKM:
+    """RRKM rate calculator working on one shared energy grid.
+
+    The sums and densities of states of every species are counted once and cached per
+    `CMol` (and symmetry number), so screening many channels out of the same reactant only
+    counts the reactant once. The cache holds weak references to the molecules and is
+    dropped with them. Clear it with `clear_cache` if a molecule is changed (e.g. a hindered
+    rotor is added) after its states have been counted.
+
+    Attributes
+    ----------
+    grain : float
+        The grain width in cm^-1.
+    e_max : float
+        The top of the energy grid in cm^-1.
+    scale : float
+        Scale of the frequencies.
+    method : str
+        The state counting method, see `statmech.count_states`.
+    """
+
+    def __init__(self, grain=10.0, e_max=35000.0, scale=1.0, method="bs"):
+        """
+        Parameters
+        ----------
+        grain : float, optional
+            The grain width in cm^-1, by default 10.0
+        e_max : float, optional
+            The top of the energy grid in cm^-1, by default 35000.0 (~100 kcal/mol)
+        scale : float, optional
+            Scale of the frequencies, by default 1.0
+        method : str, optional
+            "bs" or "fft", see `statmech.count_states`, by default "bs"
+        """
+        self.grain = grain
+        self.e_max = e_max
+        self.scale = scale
+        self.method = method
+        self.energies = np.arange(int(np.ceil(e_max / grain)) + 1) * grain
+        self._cache = weakref.WeakKeyDictionary()
+
+    def clear_cache(self):
+        """Forgets every cached sum and density of states."""
+        self._cache.clear()
+
+    def states(self, cmol, sigma=1, rotations=True):
+        """Returns the (cached) sum and density of states of a species on the grid.
+
+        Parameters
+        ----------
+        cmol : CMol
+            The molecule.
+        sigma : int, optional
+            The rotational symmetry factor of the molecule, by default 1
+        rotations : bool, optional
+            Whether the external rotations are active, by default True
+
+        Returns
+        -------
+        statmech.StatesResult
+            The energy grid, counts, density and sum of states.
+        """
+        per_mol = self._cache.setdefault(cmol, {})
+        key = (sigma, rotations)
+        if key not in per_mol:
+            per_mol[key] = cmol.calc_states(
+                sigma,
+                grain=self.grain,
+                e_max=self.e_max,
+                scale=self.scale,
+                rotations=rotations,
+                method=self.method,
+            )
+        return per_mol[key]
+
+    def barrier(self, reactant, ts):
+        """The zero-point corrected barrier height.
+
+        Parameters
+        ----------
+        reactant : CMol
+            The reactant.
+        ts : CMol
+            The transition state.
+
+        Returns
+        -------
+        float
+            E0 in cm^-1.
+        """
+        de = convertor(ts.energy - reactant.energy, "hartree", "wavenumber")
+        dzpve = ts.calc_ZPVE(scale=self.scale) - reactant.calc_ZPVE(scale=self.scale)
+        return de + convertor(dzpve, "kcal/mol", "wavenumber")
+
+    def rate(self, reactant, ts, reactant_sigma=1, ts_sigma=1, J=None):
+        """RRKM rate constant k(E) or k(E, J) for a single channel.
+
+        With `J=None` the external rotations are active and
+        k(E) = W_TS(E - E0) / (h rho(E)). Otherwise the 2D (J) rotor is adiabatic,
+        each species is shifted by its centrifugal energy B J(J + 1) and only the
+        internal states are counted.
+
+        Parameters
+        ----------
+        reactant : CMol
+            The reactant.
+        ts : CMol
+            The transition state, its imaginary mode is excluded from the state count.
+        reactant_sigma : int, optional
+            The rotational symmetry factor of the reactant, by default 1
+        ts_sigma : int, optional
+            The rotational symmetry factor of the transition state, by default 1
+        J : iterable (list or `np.ndarray`), optional
+            Total angular momentum quantum numbers, by default None
+
+        Returns
+        -------
+        RRKMResult
+            The energy grid, J values, rate constants (1/s) and barrier.
+        """
+        e0 = self.barrier(reactant, ts)
+        if J is None:
+            rho = self.states(reactant, reactant_sigma).density
+            w_ts = self.states(ts, ts_sigma).sum_of_states
+            k = self._k(w_ts, rho, e0, 0.0, 0.0)
+            return RRKMResult(self.energies, None, k, e0)
+
+        J = np.asarray(J, dtype=float)
+        e_rot = J * (J + 1)
+        rho = self.states(reactant, rotations=False).density
+        w_ts = self.states(ts, rotations=False).sum_of_states
+        k = self._k(
+            w_ts,
+            rho,
+            e0,
+            e_rot[:, np.newaxis] * _b_2d(ts),
+            e_rot[:, np.newaxis] * _b_2d(reactant),
+        )
+        # The external symmetry numbers only enter through the reaction path degeneracy
+        return RRKMResult(self.energies, J, k * reactant_sigma / ts_sigma, e0)
+
+    def rates(self, reactant, transition_states, reactant_sigma=1, ts_sigmas=None, J=None):
+        """RRKM rate constants for several channels out of the same reactant.
+
+        Parameters
+        ----------
+        reactant : CMol
+            The reactant.
+        transition_states : list of CMol
+            The transition state of each channel.
+        reactant_sigma : int, optional
+            The rotational symmetry factor of the reactant, by default 1
+        ts_sigmas : list of int, optional
+            The rotational symmetry factor of each transition state, by default 1 for all
+        J : iterable (list or `np.ndarray`), optional
+            Total angular momentum quantum numbers, by default None
+
+        Returns
+        -------
+        list of RRKMResult
+            The rate constants of each channel, in the same order as `transition_states`.
+        """
+        if ts_sigmas is None:
+            ts_sigmas = [1] * len(transition_states)
+        return [
+            self.rate(reactant, ts, reactant_sigma, ts_sigma, J=J)
+            for ts, ts_sigma in zip(transition_states, ts_sigmas)
+        ]
+
+    def _k(self, w_ts, rho, e0, e_rot_ts, e_rot_reac):
+        """k = c W_TS(E - E0 - E_rot,TS) / rho(E - E_rot,reac) with broadcasting over J."""
+        n_grains = self.energies.size
+        idx = np.arange(n_grains)
+        idx_ts = idx - np.rint((e0 + e_rot_ts) / self.grain).astype(int)
+        idx_reac = idx - np.rint(e_rot_reac / self.grain).astype(int)
+        idx_ts, idx_reac = np.broadcast_arrays(idx_ts, idx_reac)
+
+        # A submerged barrier can ask for TS states above the top of the grid
+        if np.any(idx_ts >= n_grains):
+            raise ValueError(
+                f"The TS states are needed above e_max={self.e_max} cm^-1, increase e_max"
+            )
+
+        w = np.where(idx_ts >= 0, w_ts[np.clip(idx_ts, 0, None)], 0.0)
+        r = np.where(idx_reac >= 0, rho[np.clip(idx_reac, 0, None)], 0.0)
+        k = np.zeros(w.shape)
+        np.divide(c_in_cm * w, r, out=k, where=r > 0)
+        return k
+
+
+def _b_2d(cmol):
+    """Rotational constant (cm^-1) of the adiabatic 2D rotor, from the two smallest constants."""
+    consts = np.sort(statmech.rotational_constants(cmol.mom_inertia))
+    return np.sqrt(consts[0] * consts[1])
@@ -0,0 +1,163 @@
+"""
+Canonical variational transition state theory along a reaction path
+"""
+
+import numpy as np
+from scipy.constants import h, Boltzmann
+
+from cantherm.chemistry.kinetics import Reaction, REACTION_TYPES, R_kcal, _zpe_corrected_energy
+from cantherm.chemistry.molecule import CMol
+from cantherm.statmech.kinetics import log_tst_rate
+from cantherm.utils import spawn_pool
+
+
+def _load_point(file_path):
+    # CMol is lazy, so parse (and derive what the rates use) here, in the worker
+    cmol = CMol(file_path)
+    cmol.energy, cmol.vibfreqs, cmol.mom_inertia
+    return cmol
+
+
+def load_path(file_paths, processes=1):
+    """Parses the frequency calculations of the points along a reaction path.
+
+    Parameters
+    ----------
+    file_paths : list of str
+        The output files, in order along the path.
+    processes : int, optional
+        The number of worker processes that parse the files, by default 1 (serial)
+
+    Returns
+    -------
+    list of CMol
+        The path points, in the order of `file_paths`.
+    """
+    file_paths = list(file_paths)
+    if processes <= 1 or len(file_paths) <= 1:
+        return [_load_point(path) for path in file_paths]
+    with spawn_pool(min(processes, len(file_paths))) as pool:
+        return pool.map(_load_point, file_paths)
+
+
+class VariationalReaction(Reaction):
+    """Canonical variational TST: the dividing surface is placed, at every temperature,
+    at the point of the reaction path with the largest generalized free energy of
+    activation (the smallest generalized TST rate).
+
+    The reactant partition functions are computed once and shared by all path points,
+    and the generalized rates of the whole path are one (n_points, n_T) array. Tunneling
+    corrections are taken through the highest energy point of the path (`ts`).
+
+    Attributes
+    ----------
+    path : list of CMol
+        The points along the reaction path.
+    path_sigma : list of int
+        The rotational symmetry factors of the path points.
+    delta_g : `np.ndarray`
+        The generalized free energies of activation in kcal/mol, shape (n_points, n_T),
+        set by `calc_TST_rates`.
+    ts_index : `np.ndarray`
+        The index of the variational transition state at every temperature, set by
+        `calc_TST_rates`.
+    """
+
+    def __init__(self,
+                 reactants,
+                 path,
+                 temp,
+                 reac_type='Unimol',
+                 products=[],
+                 tunneling=None,
+                 scale=0.99,
+                 reactants_sigma=1,
+                 path_sigma=1,
+                 processes=1):
+        """
+        Parameters
+        ----------
+        reactants : CMol or list of CMol
+            The reactant (unimolecular) or the two reactants (bimolecular).
+        path : list of CMol or list of str
+            The points along the reaction path, or their output files which are then
+            parsed with `load_path`.
+        temp : iterable (list or `np.ndarray`)
+            The temperatures in K.
+        reac_type : str, optional
+            'Unimol' or 'Bimol', by default 'Unimol'
+        products : CMol or list of CMol, optional
+            The products, only used for the reverse barrier of Eckart tunneling.
+        tunneling : str, optional
+            None, 'Wigner' or 'Eckart', by default None
+        scale : float, optional
+            Scale of the frequencies, by default 0.99
+        reactants_sigma : int or list of int, optional
+            The rotational symmetry factors of the reactants, by default 1
+        path_sigma : int or list of int, optional
+            The rotational symmetry factors of the path points, by default 1
+        processes : int, optional
+            The number of worker processes used to parse `path`, by default 1
+        """
+        path = list(path)
+        if not path:
+            raise ValueError("The reaction path needs at least one point")
+        if isinstance(path[0], str):
+            path = load_path(path, processes=processes)
+        if not isinstance(path_sigma, (list, tuple)):
+            path_sigma = [path_sigma] * len(path)
+        if len(path_sigma) != len(path):
+            raise ValueError("path_sigma needs one symmetry factor per path point")
+
+        self.path = path
+        self.path_sigma = list(path_sigma)
+        self.delta_g = None
+        self.ts_index = None
+
+        saddle = int(np.argmax([_zpe_corrected_energy(point, scale) for point in path]))
+        super().__init__(
+            reactants, path[saddle], temp, reac_type=reac_type, products=products,
+            tunneling=tunneling, scale=scale, reactants_sigma=reactants_sigma,
+            ts_sigma=self.path_sigma[saddle],
+        )
+
+    def calc_TST_rates(self):
+        """Calculates the canonical variational TST rate constants at all of the given
+            temperatures at once.
+
+        Returns
+        -------
+        `np.ndarray`
+            The rate constants (also stored in `rates`).
+        """
+        temp = np.asarray(self.temp, dtype=float)
+        log_q_react = self.calc_log_Q_reactants(temp)
+        e_react = _zpe_corrected_energy(self.reactants, self.scale)
+
+        log_q_path = np.array([
+            point.calc_log_Q(temp, sigma, scale=self.scale)
+            for point, sigma in zip(self.path, self.path_sigma)
+        ]).reshape(len(self.path), -1)
+        barriers = np.array(
+            [_zpe_corrected_energy(point, self.scale) for point in self.path]
+        ) - e_react
+
+        # Generalized TST rates of every point at every temperature, (n_points, n_T)
+        log_k = log_tst_rate(
+            temp.reshape(-1), log_q_path, log_q_react, barriers[:, np.newaxis],
+            molecularity=REACTION_TYPES[self.reac_type]
+        )
+        log_kt_h = np.log(Boltzmann * temp.reshape(-1) / h)
+        self.delta_g = -R_kcal * temp.reshape(-1) * (log_k - log_kt_h)
+
+        # The variational TS minimizes k (maximizes Delta G) at every temperature
+        self.ts_index = np.argmin(log_k, axis=0).reshape(temp.shape)
+        log_k_min = log_k.min(axis=0).reshape(temp.shape)
+        log_q_ts = np.take_along_axis(
+            log_q_path, self.ts_index.reshape(1, -1), axis=0
+        ).reshape(temp.shape)
+
+        self.q_ratio = np.exp(np.log(Boltzmann * temp / h) + log_q_ts - log_q_react)
+        self.tunneling_coeff = self.calc_tunneling(temp)
+        self.rates = np.exp(log_k_min) * self.tunneling_coeff
+        return self.rates
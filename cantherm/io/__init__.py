@@ -0,0 +1,3 @@
+from .parsed import ParsedData
+from .fast_reader import read_fast
+from .cache import ParseCache, parse_file, read_file
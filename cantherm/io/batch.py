@@ -0,0 +1,203 @@
+"""
+Parallel loading of many quantum chemistry output files
+"""
+import glob
+import os
+from typing import NamedTuple
+
+from cantherm.chemistry.molecule import CMol
+from cantherm.io.parsed import ParsedData
+from cantherm.utils import spawn_pool
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+OUTPUT_PATTERNS = ("*.log", "*.out")
+
+
+class LoadFailure(NamedTuple):
+    """A file that couldn't be loaded.
+
+    Attributes
+    ----------
+    file_path : str
+        The output file.
+    error : str
+        The exception type and message.
+    """
+
+    file_path: str
+    error: str
+
+
+class BatchResult(NamedTuple):
+    """The outcome of `load_batch`.
+
+    Attributes
+    ----------
+    molecules : dict
+        file path -> CMol for every file that loaded, in the order of the input files.
+    failures : list of LoadFailure
+        The files that didn't load, in the order of the input files.
+    """
+
+    molecules: dict
+    failures: list
+
+
+def find_outputs(directory, patterns=OUTPUT_PATTERNS, recursive=True):
+    """Lists the output files in a directory.
+
+    Parameters
+    ----------
+    directory : str
+        The directory to search.
+    patterns : iterable of str, optional
+        Glob patterns of the output files, by default ("*.log", "*.out")
+    recursive : bool, optional
+        Whether to search the subdirectories too, by default True
+
+    Returns
+    -------
+    list of str
+        The sorted file paths.
+    """
+    prefix = os.path.join(directory, "**") if recursive else directory
+    paths = set()
+    for pattern in patterns:
+        paths.update(glob.glob(os.path.join(prefix, pattern), recursive=recursive))
+    return sorted(p for p in paths if os.path.isfile(p))
+
+
+def _init_worker(max_memory):
+    # Caps the address space of the worker, a parse that needs more fails with MemoryError
+    if max_memory is not None and resource is not None:
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        resource.setrlimit(resource.RLIMIT_AS, (max_memory, hard))
+
+
+def _load_worker(file_path, cache, compact, reader):
+    # Never raises, a failure comes back as the error message
+    try:
+        cmol = CMol(file_path, cache=cache, reader=reader)
+        cmol.energy  # parses the file and checks that the job succeeded
+        if compact and not isinstance(cmol.data, ParsedData):
+            cmol.data = ParsedData.from_ccdata(cmol.data)
+    except Exception as err:
+        return file_path, None, f"{type(err).__name__}: {err}"
+    return file_path, cmol, None
+
+
+def iter_load(file_paths, processes=None, max_memory=None, cache=None, compact=False,
+              max_tasks_per_child=None, reader="cclib"):
+    """Loads output files over a process pool, yielding each one as soon as it's done.
+
+    Parameters
+    ----------
+    file_paths : iterable of str
+        The output files.
+    processes : int, optional
+        The largest number of worker processes, by default the number of CPUs. With 1
+        the files are loaded serially in this process.
+    max_memory : int, optional
+        The largest address space of each worker in bytes (Unix only), by default None
+        (no limit)
+    cache : ParseCache, optional
+        The parse cache shared by the workers, by default None
+    compact : bool, optional
+        Whether to keep only the arrays CMol uses instead of the full cclib data, which
+        makes the molecules much smaller to send back and to keep around, by default False
+    max_tasks_per_child : int, optional
+        The number of files a worker loads before it's replaced with a fresh process,
+        by default None (workers live as long as the pool)
+    reader : str, optional
+        "cclib" or "fast", see `cantherm.io.cache.read_file`, by default "cclib"
+
+    Yields
+    ------
+    tuple(str, CMol or None, str or None)
+        The file path, the molecule (None on failure) and the error (None on success),
+        in the order the files finish.
+    """
+    file_paths = list(file_paths)
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = min(processes, len(file_paths))
+
+    if processes <= 1:
+        for path in file_paths:
+            yield _load_worker(path, cache, compact, reader)
+        return
+
+    with spawn_pool(
+        processes,
+        initializer=_init_worker,
+        initargs=(max_memory,),
+        maxtasksperchild=max_tasks_per_child,
+    ) as pool:
+        args = [(path, cache, compact, reader) for path in file_paths]
+        yield from pool.imap_unordered(_load_star, args)
+
+
+def _load_star(args):
+    return _load_worker(*args)
+
+
+def load_batch(paths, processes=None, max_memory=None, cache=None, compact=False,
+               patterns=OUTPUT_PATTERNS, progress=None, max_tasks_per_child=None,
+               reader="cclib"):
+    """Loads a directory (or a list) of output files in parallel.
+
+    A file that fails to load (unsuccessful job, unknown format, ...) is recorded in
+    `failures` instead of stopping the run.
+
+    Parameters
+    ----------
+    paths : str or iterable of str
+        A directory, searched recursively with `patterns`, or the output files.
+    processes : int, optional
+        The largest number of worker processes, by default the number of CPUs
+    max_memory : int, optional
+        The largest address space of each worker in bytes (Unix only), by default None
+    cache : ParseCache, optional
+        The parse cache shared by the workers, by default None
+    compact : bool, optional
+        Whether to keep only the arrays CMol uses, see `iter_load`, by default False
+    patterns : iterable of str, optional
+        Glob patterns of the output files in a directory, by default ("*.log", "*.out")
+    progress : callable, optional
+        Called with (file path, CMol or None, error or None) as each file finishes,
+        by default None
+    max_tasks_per_child : int, optional
+        The number of files a worker loads before it's replaced, by default None
+    reader : str, optional
+        "cclib" or "fast", see `cantherm.io.cache.read_file`, by default "cclib"
+
+    Returns
+    -------
+    BatchResult
+        The molecules and the failures.
+    """
+    if isinstance(paths, str):
+        file_paths = find_outputs(paths, patterns=patterns)
+    else:
+        file_paths = list(paths)
+
+    loaded, errors = {}, {}
+    for path, cmol, error in iter_load(
+        file_paths, processes=processes, max_memory=max_memory, cache=cache,
+        compact=compact, max_tasks_per_child=max_tasks_per_child, reader=reader,
+    ):
+        if progress is not None:
+            progress(path, cmol, error)
+        if error is None:
+            loaded[path] = cmol
+        else:
+            errors[path] = error
+
+    return BatchResult(
+        molecules={path: loaded[path] for path in file_paths if path in loaded},
+        failures=[LoadFailure(path, errors[path]) for path in file_paths if path in errors],
+    )
@@ -0,0 +1,271 @@
+"""
+Persistent on-disk cache of the parsed quantum chemistry outputs used by CMol
+
+Each entry is an uncompressed .npz holding only the arrays CMol reads (energies,
+coordinates, atomic numbers, frequencies) and the JSON encodable part of the metadata.
+Entries are content addressed: the key hashes the file contents (or its path, size and
+modification time), the reader, the cclib version and the cache format, so a changed
+file or a new parser never returns stale data. The total size is bounded, least
+recently used entries are evicted first.
+"""
+import hashlib
+import json
+import os
+
+import numpy as np
+import cclib
+
+from cantherm.io.parsed import ParsedData, CACHED_ATTRIBUTES
+from cantherm.io.fast_reader import read_fast
+
+# Bump when the stored fields change, old entries then simply stop matching
+CACHE_FORMAT = 1
+
+READERS = ("cclib", "fast")
+
+
+class ParseCache:
+    """Size bounded directory of parsed output files.
+
+    Attributes
+    ----------
+    directory : str
+        The cache directory.
+    max_bytes : int
+        The largest total size of the entries, the least recently used are evicted
+        beyond it.
+    hash_contents : bool
+        Whether entries are keyed on the file contents rather than on its path, size
+        and modification time.
+    """
+
+    def __init__(self, directory=None, max_bytes=2 ** 30, hash_contents=True):
+        """
+        Parameters
+        ----------
+        directory : str, optional
+            The cache directory, by default $CANTHERM_CACHE_DIR or ~/.cache/cantherm
+        max_bytes : int, optional
+            The largest total size of the entries in bytes, by default 1 GiB
+        hash_contents : bool, optional
+            Whether to key entries on the file contents (robust to copies and touched
+            files) rather than on path, size and modification time (no read needed),
+            by default True
+        """
+        if directory is None:
+            directory = os.environ.get(
+                "CANTHERM_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "cantherm")
+            )
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hash_contents = hash_contents
+        os.makedirs(directory, exist_ok=True)
+        # Running estimate of the total size, so a put doesn't list the whole directory
+        self._size = None
+
+    def key(self, file_path, reader="cclib"):
+        """Returns the cache key of a file.
+
+        Parameters
+        ----------
+        file_path : str
+            The output file.
+        reader : str, optional
+            The reader that parses the file, "cclib" or "fast", by default "cclib"
+
+        Returns
+        -------
+        str
+            The hex digest identifying the file and the parser.
+        """
+        digest = hashlib.sha256(f"{CACHE_FORMAT}:{reader}:{cclib.__version__}:".encode())
+        if self.hash_contents:
+            with open(file_path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(block)
+        else:
+            stat = os.stat(file_path)
+            digest.update(f"{os.path.abspath(file_path)}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+        return digest.hexdigest()
+
+    def _entry(self, key):
+        return os.path.join(self.directory, key + ".npz")
+
+    def get(self, file_path, reader="cclib"):
+        """Loads a cached file.
+
+        Parameters
+        ----------
+        file_path : str
+            The output file.
+        reader : str, optional
+            The reader that parsed the file, by default "cclib"
+
+        Returns
+        -------
+        ParsedData or None
+            The cached data, None on a miss.
+        """
+        entry = self._entry(self.key(file_path, reader))
+        try:
+            with np.load(entry, allow_pickle=False) as npz:
+                metadata = json.loads(str(npz["metadata"]))
+                arrays = {name: npz[name] for name in npz.files if name != "metadata"}
+        except (OSError, ValueError, KeyError):
+            return None
+        # The modification time of an entry is its last use, for the LRU eviction
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+        return ParsedData(metadata, **arrays)
+
+    def put(self, file_path, data, reader="cclib"):
+        """Stores a parsed file, then evicts old entries if the cache is too large.
+
+        The total size is tracked as a running estimate (seeded from the directory on
+        the first put), and the directory is only scanned by `evict` once the estimate
+        exceeds `max_bytes`. Entries written by other processes are counted at that
+        scan.
+
+        Parameters
+        ----------
+        file_path : str
+            The output file.
+        data : ccData or ParsedData
+            The parsed file.
+        reader : str, optional
+            The reader that parsed the file, by default "cclib"
+
+        Returns
+        -------
+        ParsedData
+            The data as it will be loaded from the cache.
+        """
+        if not isinstance(data, ParsedData):
+            data = ParsedData.from_ccdata(data)
+        arrays = {
+            name: getattr(data, name) for name in CACHED_ATTRIBUTES if hasattr(data, name)
+        }
+        entry = self._entry(self.key(file_path, reader))
+        # Write then rename, so concurrent readers never see a partial entry
+        tmp = f"{entry}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            np.savez(f, metadata=np.array(json.dumps(data.metadata)), **arrays)
+        os.replace(tmp, entry)
+        if self._size is None:
+            self._size = self.size()
+        else:
+            # Overwriting an entry counts it twice, which at worst evicts a bit early
+            self._size += os.path.getsize(entry)
+        if self._size > self.max_bytes:
+            self.evict()
+        return data
+
+    def evict(self):
+        """Removes the least recently used entries until the cache fits in `max_bytes`.
+
+        Returns
+        -------
+        int
+            The number of removed entries.
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".npz"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        self._size = total
+        return removed
+
+    def clear(self):
+        """Removes every entry."""
+        for name in os.listdir(self.directory):
+            if name.endswith(".npz"):
+                os.remove(os.path.join(self.directory, name))
+        self._size = 0
+
+    def size(self):
+        """Returns the total size of the entries in bytes."""
+        return sum(
+            os.path.getsize(os.path.join(self.directory, name))
+            for name in os.listdir(self.directory)
+            if name.endswith(".npz")
+        )
+
+
+def read_file(file_path, reader="cclib"):
+    """Parses an output file.
+
+    Parameters
+    ----------
+    file_path : str
+        The output file.
+    reader : str, optional
+        "cclib" (full parse) or "fast" (`read_fast` for Gaussian and ORCA outputs, with
+        cclib as the fallback for anything it doesn't handle), by default "cclib"
+
+    Returns
+    -------
+    ccData or ParsedData
+        The parsed file.
+
+    Raises
+    ------
+    ValueError
+        If the reader is unknown or cclib can't parse the file.
+    """
+    if reader not in READERS:
+        raise ValueError(f"Unknown reader {reader}, choose from {READERS}")
+    if reader == "fast":
+        data = read_fast(file_path)
+        if data is not None:
+            return data
+    data = cclib.io.ccread(file_path)
+    if data is None:
+        raise ValueError(f"cclib couldn't parse {file_path}")
+    return data
+
+
+def parse_file(file_path, cache=None, reader="cclib"):
+    """Parses an output file, going through the cache when one is given.
+
+    Parameters
+    ----------
+    file_path : str
+        The output file.
+    cache : ParseCache, optional
+        The cache, by default None (always parse)
+    reader : str, optional
+        "cclib" or "fast", see `read_file`, by default "cclib"
+
+    Returns
+    -------
+    ccData or ParsedData
+        The parsed file. A warm cache load never parses the output file, but with
+        `hash_contents=True` (the default) the key still reads and hashes it, the fast
+        path is a cache with `hash_contents=False`.
+    """
+    if cache is None:
+        return read_file(file_path, reader)
+    data = cache.get(file_path, reader)
+    if data is None:
+        data = cache.put(file_path, read_file(file_path, reader), reader)
+    return data
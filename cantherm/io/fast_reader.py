@@ -0,0 +1,248 @@
+"""
+Targeted reader for Gaussian and ORCA outputs
+
+cclib parses every section of an output (orbitals, every SCF cycle, populations, ...)
+while CMol only needs the final energy and geometry, the atomic numbers, the frequencies
+and whether the job succeeded. This reader memory maps the file and jumps straight to
+those sections, searching from the end so the final geometry and energy are found
+without walking through an optimization. Whenever it isn't sure to reproduce cclib
+(ONIOM, BOMD, counterpoise, semiempirical methods, an unconverged SCF, high precision
+modes, an unexpected layout, ...) it returns None and the caller falls back to cclib.
+"""
+import mmap
+import re
+
+import numpy as np
+from cclib.parser.utils import PeriodicTable, convertor
+
+from cantherm.io.parsed import ParsedData
+
+_periodic_table = PeriodicTable()
+
+# Gaussian jobs whose geometry or energy cclib assembles in special ways
+_GAUSSIAN_UNSUPPORTED = (b"ONIOM", b"Summary information for step", b"Counterpoise")
+
+_ORCA_FREQ = re.compile(rb"^\s*\d+:\s+(-?\d+\.\d+) cm\*\*-1", re.MULTILINE)
+_GAUSSIAN_FREQ = re.compile(rb"^ Frequencies --(.*)$", re.MULTILINE)
+
+
+def _float(text):
+    # Fortran double precision exponents, e.g. -0.39780330187275D+02
+    return float(text.replace("D", "E"))
+
+
+def _line_at(mm, pos):
+    # The line containing pos
+    start = mm.rfind(b"\n", 0, pos) + 1
+    end = mm.find(b"\n", pos)
+    if end < 0:
+        end = len(mm)
+    return mm[start:end].decode("ascii", "replace").rstrip("\r")
+
+
+def _lines_after(mm, pos):
+    # The lines following the one containing pos
+    start = mm.find(b"\n", pos)
+    while start >= 0:
+        end = mm.find(b"\n", start + 1)
+        yield mm[start + 1:len(mm) if end < 0 else end].decode("ascii", "replace").rstrip("\r")
+        start = end
+
+
+def _count(mm, marker):
+    n, pos = 0, mm.find(marker)
+    while pos >= 0:
+        n += 1
+        pos = mm.find(marker, pos + 1)
+    return n
+
+
+def _parsed(metadata, method, scf, cc, atomnos, coords, freqs):
+    metadata["methods"] = [method]
+    arrays = {
+        "scfenergies": np.array([convertor(scf, "hartree", "eV")]),
+        "atomnos": np.array(atomnos, dtype=int),
+        "atomcoords": np.array([coords], dtype=float),
+    }
+    if cc is not None:
+        arrays["ccenergies"] = np.array([convertor(cc, "hartree", "eV")])
+    if freqs is not None:
+        arrays["vibfreqs"] = np.array(freqs, dtype=float)
+    return ParsedData(metadata, **arrays)
+
+
+def _read_gaussian(mm):
+    if any(mm.find(marker) >= 0 for marker in _GAUSSIAN_UNSUPPORTED):
+        return None
+
+    # The job succeeded if the last termination message is a normal one
+    normal = mm.rfind(b"\n Normal termination of Gaussian")
+    metadata = {"package": "Gaussian", "success": normal > mm.rfind(b"\n Error termination")}
+    if not metadata["success"]:
+        return ParsedData(metadata)
+
+    # Final geometry, the standard orientation unless the job only prints the input one
+    pos = mm.rfind(b"Standard orientation:")
+    standard = pos >= 0
+    if not standard:
+        pos = max(mm.rfind(b"Input orientation:"), mm.rfind(b"Z-Matrix orientation:"))
+    if pos < 0:
+        return None
+    lines = _lines_after(mm, pos)
+    for _ in range(4):  # dashes, two header lines, dashes
+        next(lines)
+    atomnos, coords = [], []
+    for line in lines:
+        if set(line.strip()) == {"-"}:
+            break
+        fields = line.split()
+        if int(fields[1]) == -1:  # dummy atoms of the Z-matrix orientation
+            continue
+        atomnos.append(int(fields[1]))
+        coords.append([float(x) for x in (fields[-3:] if standard else fields[3:6])])
+
+    # Final energies, the method of the latest energy decides which one CMol uses
+    scf_pos = mm.rfind(b"\n SCF Done:")
+    if scf_pos < 0:
+        return None
+    fields = _line_at(mm, scf_pos + 1).split()
+    scf = _float(fields[4])
+    markers = [(scf_pos, "HF" if fields[2] == "E(RHF)" else "DFT")]
+
+    cc = None
+    ccsd_pos = mm.rfind(b"\n DE(Corr)=")
+    while ccsd_pos >= 0 and _line_at(mm, ccsd_pos + 1)[27:35] != "E(CORR)=":
+        ccsd_pos = mm.rfind(b"\n DE(Corr)=", 0, ccsd_pos)
+    if ccsd_pos >= 0:
+        markers.append((ccsd_pos, "CCSD"))
+        cc = _float(_line_at(mm, ccsd_pos + 1).split()[3])
+    ccsdt_pos = mm.rfind(b"\n CCSD(T)= ")
+    if ccsdt_pos >= 0 and _line_at(mm, ccsdt_pos).startswith(" T5(CCSD)="):
+        markers.append((ccsdt_pos, "CCSD-T"))
+        if ccsdt_pos > ccsd_pos:
+            cc = _float(_line_at(mm, ccsdt_pos + 1).split()[1])
+    for marker, method in ((b"EUMP2", "MP2"), (b"EUMP3=", "MP3"), (b"UMP4(DQ)=", "MP4"), (b"MP5 =", "MP5")):
+        markers.append((mm.rfind(marker), method))
+    method = max(markers)[1]
+
+    pos = mm.rfind(b"\n Standard basis:")
+    if pos >= 0:
+        metadata["basis_set"] = _line_at(mm, pos + 1).split()[2]
+
+    # The last frequency analysis, without the high precision modes
+    freqs = None
+    pos = mm.rfind(b"Harmonic frequencies (cm**-1)")
+    if pos >= 0:
+        end = mm.find(b"- Thermochemistry -", pos)
+        block = mm[pos:len(mm) if end < 0 else end]
+        if b"Frequencies ---" in block:
+            return None
+        freqs = [_float(f) for line in _GAUSSIAN_FREQ.findall(block) for f in line.decode().split()]
+
+    return _parsed(metadata, method, scf, cc, atomnos, coords, freqs)
+
+
+def _read_orca(mm):
+    if mm.find(b"FIT TO SLATER BASIS") >= 0:  # semiempirical
+        return None
+
+    metadata = {"package": "ORCA", "success": mm.rfind(b"\nTOTAL RUN TIME:") >= 0}
+    if not metadata["success"]:
+        return ParsedData(metadata)
+
+    pos = mm.rfind(b"\nCARTESIAN COORDINATES (ANGSTROEM)")
+    if pos < 0:
+        return None
+    lines = _lines_after(mm, pos + 1)
+    next(lines)  # dashes
+    atomnos, coords = [], []
+    for line in lines:
+        if not line:
+            break
+        atom, x, y, z = line.split()
+        if atom[-1] != ">":  # embedding potentials
+            atomnos.append(_periodic_table.number[atom])
+            coords.append([float(x), float(y), float(z)])
+
+    scf_pos = mm.rfind(b"SCF CONVERGED AFTER")
+    if scf_pos < 0 or mm.rfind(b"SCF NOT CONVERGED AFTER") > scf_pos:
+        return None
+    scf = float(_line_at(mm, mm.find(b"Total Energy       :", scf_pos)).split()[3])
+
+    # Like cclib, the dispersion correction is added to the SCF energy it belongs to
+    n_disp = _count(mm, b"DFT DISPERSION CORRECTION")
+    if n_disp:
+        if n_disp != _count(mm, b"SCF CONVERGED AFTER"):
+            return None
+        pos = mm.find(b"Dispersion correction", mm.rfind(b"DFT DISPERSION CORRECTION") + 1)
+        scf += float(_line_at(mm, pos).split()[-1])
+
+    markers = [(scf_pos, "DFT" if mm.find(b"\n Density Functional") >= 0 else "HF")]
+    markers.append((mm.find(b"\nMP2 TOTAL ENERGY"), "MP2"))
+    markers.append((mm.rfind(b"\nE(MP3)"), "MP3"))
+    cc = None
+    pos = mm.rfind(b"\nCOUPLED CLUSTER ENERGY")
+    if pos >= 0:
+        markers.append((pos, "CCSD"))
+        cc = float(_line_at(mm, mm.find(b"\nE(TOT)", pos) + 1).split()[-1])
+        pos = mm.find(b"\nE(CCSD(T))", pos)
+        if pos >= 0:
+            markers.append((pos, "CCSD(T)"))
+            cc = float(_line_at(mm, pos + 1).split()[-1])
+    method = max(markers)[1]
+
+    pos = mm.rfind(b"\nYour calculation utilizes the basis:")
+    if pos >= 0:
+        metadata["basis_set"] = _line_at(mm, pos + 1)[37:].strip()
+
+    freqs = None
+    pos = mm.rfind(b"\nVIBRATIONAL FREQUENCIES")
+    if pos >= 0:
+        n_modes = 3 * len(atomnos)
+        if len(atomnos) == 1:
+            freqs = []
+        else:
+            end = mm.find(b"NORMAL MODES", pos)
+            values = _ORCA_FREQ.findall(mm[pos:len(mm) if end < 0 else end])[:n_modes]
+            if len(values) != n_modes:
+                return None
+            values = np.array(values, dtype=float)
+            # Drop the (zero) translations and rotations like cclib
+            freqs = values[np.nonzero(values)[0][0]:]
+
+    return _parsed(metadata, method, scf, cc, atomnos, coords, freqs)
+
+
+def read_fast(file_path):
+    """Reads what CMol needs from a Gaussian or ORCA output without a full parse.
+
+    Only the final energy (SCF, and coupled cluster when present), the final geometry,
+    the atomic numbers, the frequencies, the success flag, the basis set and the final
+    method are read. `metadata["methods"]` holds only that final method.
+
+    Parameters
+    ----------
+    file_path : str
+        The output file.
+
+    Returns
+    -------
+    ParsedData or None
+        The parsed data, None if the file isn't a Gaussian or ORCA output or uses
+        something this reader doesn't handle (parse it with cclib instead).
+    """
+    with open(file_path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            return None
+        with mm:
+            head = mm[:16384]
+            try:
+                if b"Entering Gaussian System" in head or b"Gaussian, Inc." in head:
+                    return _read_gaussian(mm)
+                if b"O   R   C   A" in head:
+                    return _read_orca(mm)
+            except (ValueError, IndexError, KeyError, StopIteration):
+                return None
+    return None
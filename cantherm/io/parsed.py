@@ -0,0 +1,55 @@
+"""
+The parsed data of a quantum chemistry output, as much of it as CMol uses
+"""
+import json
+
+import numpy as np
+
+# The ccData attributes kept for every file (when the parser found them)
+CACHED_ATTRIBUTES = ("scfenergies", "ccenergies", "atomcoords", "atomnos", "vibfreqs")
+
+
+class ParsedData:
+    """The subset of `cclib.parser.data.ccData` that CMol uses.
+
+    Only the attributes present in the parsed file are set, so a missing one raises
+    AttributeError exactly like it does on ccData.
+
+    Attributes
+    ----------
+    metadata : dict
+        The JSON encodable part of the parser metadata.
+    """
+
+    def __init__(self, metadata, **arrays):
+        self.metadata = metadata
+        for name, value in arrays.items():
+            setattr(self, name, value)
+
+    @classmethod
+    def from_ccdata(cls, data):
+        """Keeps the cached attributes of a ccData (or anything that has them).
+
+        Parameters
+        ----------
+        data : ccData
+            The parsed file.
+
+        Returns
+        -------
+        ParsedData
+            The attributes CMol uses.
+        """
+        metadata = {}
+        for key, value in data.metadata.items():
+            try:
+                json.dumps(value)
+            except (TypeError, ValueError):
+                continue
+            metadata[key] = value
+        arrays = {
+            name: np.asarray(getattr(data, name))
+            for name in CACHED_ATTRIBUTES
+            if hasattr(data, name)
+        }
+        return cls(metadata, **arrays)
@@ -177,7 +177,6 @@ def calc_principal_moi(
             # If any of the values are substantially smaller
             # than the largest principal moment, set them to
             # zero
-            print(moi_i)
             moi_i[moi_i / moi_i.max() < zero_tol] = 0
             return moi_i
         else:
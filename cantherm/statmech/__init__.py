@@ -1,6 +1,16 @@
-from .partition_function import q_tr, q_rot, q_vib
+from .backend import set_backend, get_backend, available_backends
+from .harmonic_oscillator import HOThermo, ho_thermo, ho_thermo_from_energies, mode_energies
+from .harmonic_oscillator import combine_thermo, zpve_from_energies
+from .hindered_rotor import HinderedRotor, fit_fourier_potential
+from .quasi_harmonic import truhlar_energies, grimme_weights, grimme_s_vib
+from .density_of_states import StatesResult, count_states, rotational_constants
+from .density_of_states import beyer_swinehart, stein_rabinovitch, convolve_counts
+from .density_of_states import hindered_rotor_levels
+from .partition_function import q_tr, q_rot, q_vib, log_q_tr, log_q_rot, log_q_vib
 from .enthalpy import h_tr, h_rot, h_vib
 from .entropy import s_tr, s_rot, s_vib
 from .heat_capacity import cp_tr, cp_rot, cp_vib
 from .gibbs_free_energy import g_tr, g_rot, g_vib
 from .zero_point_vibration import zpve
+from .tunneling import wigner_correction, EckartBarrier, eckart_barrier, eckart_correction
+from .kinetics import standard_concentration, log_tst_rate
@@ -0,0 +1,197 @@
+"""
+Pluggable kernels for the harmonic oscillator sums
+
+The "numpy" backend is always available. The "numba" backend is used when Numba is
+installed and compiles the same sums into loops that run in parallel over temperatures
+(and molecules for the segmented kernel). The backend is picked at import time from the
+CANTHERM_BACKEND environment variable ("auto", "numpy", or "numba"; "auto" by default) and
+can be changed at any time with `set_backend`. The compiled kernels are cached on disk
+(Numba's `cache=True`), so spawned worker processes load them instead of recompiling.
+"""
+import math
+import os
+import warnings
+
+import numpy as np
+from scipy.constants import Boltzmann
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+def _ho_sums_numpy(energies, temps):
+    x = energies / (Boltzmann * temps[:, np.newaxis])  # (temps, modes)
+    em = np.expm1(-x)
+    n = -(1.0 + em) / em
+    return (
+        -np.sum(np.log(-em), axis=-1),
+        np.sum(x * n, axis=-1),
+        np.sum(x ** 2 * n * (1.0 + n), axis=-1),
+    )
+
+
+def _ho_sums_segmented_numpy(energies, offsets, temps):
+    n_mol = offsets.size - 1
+    out = np.zeros((3, n_mol, temps.size))
+    if energies.size == 0:
+        return out[0], out[1], out[2]
+
+    x = energies / (Boltzmann * temps[:, np.newaxis])  # (temps, all modes)
+    em = np.expm1(-x)
+    n = -(1.0 + em) / em
+    terms = np.stack([-np.log(-em), x * n, x ** 2 * n * (1.0 + n)])
+
+    # reduceat returns the element at the start index for empty segments, mask those
+    nonempty = offsets[1:] > offsets[:-1]
+    starts = offsets[:-1][nonempty]
+    out[:, nonempty, :] = np.add.reduceat(terms, starts, axis=-1).transpose(0, 2, 1)
+    return out[0], out[1], out[2]
+
+
+if numba is not None:
+
+    @numba.njit(parallel=True, cache=True)
+    def _ho_sums_numba(energies, temps):
+        n_t = temps.size
+        log_q = np.zeros(n_t)
+        h_red = np.zeros(n_t)
+        cp_red = np.zeros(n_t)
+        for i in numba.prange(n_t):
+            beta = 1.0 / (Boltzmann * temps[i])
+            for e in energies:
+                x = e * beta
+                em = math.expm1(-x)
+                n = -(1.0 + em) / em
+                log_q[i] -= math.log(-em)
+                h_red[i] += x * n
+                cp_red[i] += x * x * n * (1.0 + n)
+        return log_q, h_red, cp_red
+
+    @numba.njit(parallel=True, cache=True)
+    def _ho_sums_segmented_numba(energies, offsets, temps):
+        n_mol = offsets.size - 1
+        n_t = temps.size
+        log_q = np.zeros((n_mol, n_t))
+        h_red = np.zeros((n_mol, n_t))
+        cp_red = np.zeros((n_mol, n_t))
+        for k in numba.prange(n_mol * n_t):
+            m = k // n_t
+            i = k % n_t
+            beta = 1.0 / (Boltzmann * temps[i])
+            for j in range(offsets[m], offsets[m + 1]):
+                x = energies[j] * beta
+                em = math.expm1(-x)
+                n = -(1.0 + em) / em
+                log_q[m, i] -= math.log(-em)
+                h_red[m, i] += x * n
+                cp_red[m, i] += x * x * n * (1.0 + n)
+        return log_q, h_red, cp_red
+
+
+_BACKENDS = {"numpy": (_ho_sums_numpy, _ho_sums_segmented_numpy)}
+if numba is not None:
+    _BACKENDS["numba"] = (_ho_sums_numba, _ho_sums_segmented_numba)
+
+_current = None
+
+
+def available_backends():
+    """Returns the names of the backends that can be used in this environment.
+
+    Returns
+    -------
+    list of str
+        The usable backend names.
+    """
+    return list(_BACKENDS)
+
+
+def set_backend(name="auto"):
+    """Selects the kernel backend used by all of the vibrational statmech functions.
+
+    Parameters
+    ----------
+    name : str, optional
+        "numpy", "numba", or "auto" (Numba if it's installed, NumPy otherwise), by default "auto"
+
+    Raises
+    ------
+    ValueError
+        If the backend is unknown or not available (e.g. Numba isn't installed).
+
+    Notes
+    -----
+    The choice is per process. Pools made with `cantherm.utils.spawn_pool` pass it on
+    to their workers, other processes start from CANTHERM_BACKEND.
+    """
+    global _current
+    if name == "auto":
+        name = "numba" if "numba" in _BACKENDS else "numpy"
+    if name not in _BACKENDS:
+        raise ValueError(
+            f"Backend {name} isn't available, choose from {available_backends()}"
+        )
+    _current = name
+
+
+def get_backend():
+    """Returns the name of the current kernel backend.
+
+    Returns
+    -------
+    str
+        The backend name.
+    """
+    return _current
+
+
+def ho_sums(energies, temps):
+    """Harmonic oscillator sums over modes for every temperature.
+
+    Parameters
+    ----------
+    energies : `np.ndarray`
+        The energy of each mode in J, shape (n_modes,).
+    temps : `np.ndarray`
+        The temperatures in K, shape (n_temps,).
+
+    Returns
+    -------
+    tuple(`np.ndarray`, `np.ndarray`, `np.ndarray`)
+        ln Q, H/RT and Cp/R, each with shape (n_temps,).
+    """
+    energies = np.ascontiguousarray(energies, dtype=float)
+    temps = np.ascontiguousarray(temps, dtype=float)
+    return _BACKENDS[_current][0](energies, temps)
+
+
+def ho_sums_segmented(energies, offsets, temps):
+    """Harmonic oscillator sums for many molecules stored as one flat mode array.
+
+    Parameters
+    ----------
+    energies : `np.ndarray`
+        The mode energies of every molecule in J, concatenated, shape (n_modes_total,).
+    offsets : `np.ndarray`
+        Molecule m owns energies[offsets[m]:offsets[m + 1]], shape (n_molecules + 1,).
+    temps : `np.ndarray`
+        The temperatures in K, shape (n_temps,).
+
+    Returns
+    -------
+    tuple(`np.ndarray`, `np.ndarray`, `np.ndarray`)
+        ln Q, H/RT and Cp/R, each with shape (n_molecules, n_temps).
+    """
+    energies = np.ascontiguousarray(energies, dtype=float)
+    offsets = np.ascontiguousarray(offsets, dtype=np.int64)
+    temps = np.ascontiguousarray(temps, dtype=float)
+    return _BACKENDS[_current][1](energies, offsets, temps)
+
+
+try:
+    set_backend(os.environ.get("CANTHERM_BACKEND", "auto"))
+except ValueError as err:
+    warnings.warn(f"{err}, falling back to the numpy backend", RuntimeWarning)
+    set_backend("numpy")
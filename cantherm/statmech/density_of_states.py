@@ -0,0 +1,281 @@
+"""
+Sums and densities of states on an energy grid
+
+All energies are in cm^-1 and the grid is made of grains of width `grain`: counts[i] is the
+number of states with energy in [i * grain, (i + 1) * grain).
+"""
+from typing import NamedTuple
+
+import numpy as np
+from scipy.constants import h, c
+from scipy.signal import fftconvolve
+
+c_in_cm = c * 100
+
+
+class StatesResult(NamedTuple):
+    """Sum and density of states on an energy grid.
+
+    Attributes
+    ----------
+    energies : `np.ndarray`
+        The lower edge of each energy grain in cm^-1.
+    counts : `np.ndarray`
+        The number of states in each grain.
+    density : `np.ndarray`
+        The density of states in states / cm^-1.
+    sum_of_states : `np.ndarray`
+        The number of states with energy up to (and including) each grain.
+    """
+
+    energies: np.ndarray
+    counts: np.ndarray
+    density: np.ndarray
+    sum_of_states: np.ndarray
+
+
+def rotational_constants(I_ext):
+    """Converts moments of inertia to rotational constants.
+
+    Parameters
+    ----------
+    I_ext : `iterable` (list or `np.ndarray`)
+        The moments of inertia in kg * m^2 (as stored in `CMol.mom_inertia`).
+
+    Returns
+    -------
+    `np.ndarray`
+        The rotational constants in cm^-1, np.inf for zero moments.
+    """
+    I_ext = np.asarray(I_ext, dtype=float)
+    with np.errstate(divide="ignore"):
+        return h / (8 * np.pi ** 2 * c_in_cm * I_ext)
+
+
+def rotor_counts(rot_consts, sigma, grain, n_grains):
+    """Classical rigid rotor state counts for each grain.
+
+    A linear molecule (one infinite rotational constant) is treated as a 2D rotor,
+    otherwise as a 3D asymmetric top.
+
+    Parameters
+    ----------
+    rot_consts : `iterable` (list or `np.ndarray`)
+        The rotational constants in cm^-1, see `rotational_constants`.
+    sigma : int
+        The rotational symmetry factor of the molecule.
+    grain : float
+        The grain width in cm^-1.
+    n_grains : int
+        The number of grains.
+
+    Returns
+    -------
+    `np.ndarray`
+        The number of rotational states in each grain.
+    """
+    rot_consts = np.asarray(rot_consts, dtype=float)
+    edges = np.arange(n_grains + 1) * grain
+    if np.any(np.isinf(rot_consts)):  # linear, rho(E) = 1 / (sigma B)
+        b = np.min(rot_consts)
+        return np.diff(edges) / (sigma * b)
+
+    # non-linear, rho(E) = 2 / sigma * sqrt(E / ABC)
+    cumulative = 4.0 / (3.0 * sigma * np.sqrt(np.prod(rot_consts))) * edges ** 1.5
+    return np.diff(cumulative)
+
+
+def beyer_swinehart(freqs, grain, n_grains, initial=None):
+    """Beyer-Swinehart direct count of harmonic oscillator states.
+
+    Adding a mode with a step of k grains turns counts[i] into sum_m counts[i - m k], which
+    is a cumulative sum with stride k. Each mode is therefore one reshape + cumsum over the
+    whole grid rather than a loop over grains.
+
+    Parameters
+    ----------
+    freqs : iterable (list or `np.ndarray`)
+        The (scaled) vibrational frequencies in cm^-1.
+    grain : float
+        The grain width in cm^-1.
+    n_grains : int
+        The number of grains.
+    initial : `np.ndarray`, optional
+        Counts to convolve the oscillators into (e.g. rotor states), by default a single
+        state at zero energy.
+
+    Returns
+    -------
+    `np.ndarray`
+        The number of states in each grain.
+    """
+    counts = _initial_counts(initial, n_grains)
+    for step in np.maximum(np.rint(np.asarray(freqs, dtype=float) / grain), 1).astype(int):
+        if step >= n_grains:
+            continue
+        n_rows = -(-n_grains // step)
+        padded = np.zeros(n_rows * step)
+        padded[:n_grains] = counts
+        counts = np.cumsum(padded.reshape(n_rows, step), axis=0).ravel()[:n_grains]
+    return counts
+
+
+def stein_rabinovitch(levels, grain, n_grains, initial=None):
+    """Stein-Rabinovitch count for modes with arbitrary (e.g. anharmonic or hindered) levels.
+
+    Parameters
+    ----------
+    levels : list of `np.ndarray`
+        For each mode, its energy levels in cm^-1 measured from the mode's ground level.
+    grain : float
+        The grain width in cm^-1.
+    n_grains : int
+        The number of grains.
+    initial : `np.ndarray`, optional
+        Counts to convolve the modes into, by default a single state at zero energy.
+
+    Returns
+    -------
+    `np.ndarray`
+        The number of states in each grain.
+    """
+    counts = _initial_counts(initial, n_grains)
+    for mode_levels in levels:
+        shifts = np.rint(np.asarray(mode_levels, dtype=float) / grain).astype(int)
+        shifts, degeneracy = np.unique(shifts[shifts < n_grains], return_counts=True)
+        new = np.zeros(n_grains)
+        for shift, g in zip(shifts, degeneracy):
+            new[shift:] += g * counts[: n_grains - shift]
+        counts = new
+    return counts
+
+
+def convolve_counts(counts_a, counts_b):
+    """Combines two independently counted spectra with an FFT convolution.
+
+    The round-off is relative to the largest count on the grid, so this is meant for
+    combining a handful of large spectra (e.g. rotor and vibrational states) on long
+    grids, not for adding oscillators one at a time.
+
+    Parameters
+    ----------
+    counts_a : `np.ndarray`
+        The number of states in each grain of the first spectrum.
+    counts_b : `np.ndarray`
+        The number of states in each grain of the second spectrum (same grid).
+
+    Returns
+    -------
+    `np.ndarray`
+        The number of states in each grain of the combined system.
+    """
+    n_grains = min(counts_a.size, counts_b.size)
+    counts = fftconvolve(counts_a[:n_grains], counts_b[:n_grains])[:n_grains]
+
+    # Drop the round-off noise in (nearly) empty grains
+    noise = 64 * np.finfo(float).eps * np.abs(counts).max()
+    counts[counts < noise] = 0.0
+    return counts
+
+
+def _initial_counts(initial, n_grains):
+    if initial is None:
+        counts = np.zeros(n_grains)
+        counts[0] = 1.0
+        return counts
+    counts = np.zeros(n_grains)
+    initial = np.asarray(initial, dtype=float)[:n_grains]
+    counts[: initial.size] = initial
+    return counts
+
+
+def count_states(
+    freqs,
+    grain=10.0,
+    e_max=35000.0,
+    rot_consts=None,
+    sigma=1,
+    levels=None,
+    level_sigmas=None,
+    method="bs",
+):
+    """Builds the sum and density of states for a molecule.
+
+    Parameters
+    ----------
+    freqs : iterable (list or `np.ndarray`)
+        The (scaled) harmonic vibrational frequencies in cm^-1.
+    grain : float, optional
+        The grain width in cm^-1, by default 10.0
+    e_max : float, optional
+        The top of the energy grid in cm^-1, by default 35000.0 (~100 kcal/mol)
+    rot_consts : `iterable` (list or `np.ndarray`), optional
+        Rotational constants in cm^-1 of the active external rotor, by default None (no rotor)
+    sigma : int, optional
+        The rotational symmetry factor, by default 1
+    levels : list of `np.ndarray`, optional
+        Energy levels (cm^-1, from each mode's ground level) of anharmonic or hindered
+        modes counted with Stein-Rabinovitch, by default None
+    level_sigmas : list of int, optional
+        Symmetry number of each mode in `levels`, by default 1 for all
+    method : str, optional
+        "bs" convolves every contribution directly into one array with Beyer-Swinehart.
+        "fft" counts the harmonic modes, the Stein-Rabinovitch modes and the rotor
+        separately and combines them with FFT convolutions, by default "bs"
+
+    Returns
+    -------
+    StatesResult
+        The energy grid, counts, density and sum of states.
+
+    Raises
+    ------
+    ValueError
+        If `method` is unknown.
+    """
+    if method not in ("bs", "fft"):
+        raise ValueError(f"Unknown state counting method {method}, use 'bs' or 'fft'")
+    n_grains = int(np.ceil(e_max / grain)) + 1
+
+    spectra = []
+    if rot_consts is not None:
+        spectra.append(rotor_counts(rot_consts, sigma, grain, n_grains))
+    if levels:
+        sr_counts = None if method == "fft" else (spectra.pop() if spectra else None)
+        sr_counts = stein_rabinovitch(levels, grain, n_grains, initial=sr_counts)
+        if level_sigmas is not None:
+            sr_counts /= np.prod(level_sigmas)
+        spectra.append(sr_counts)
+
+    if method == "bs":
+        counts = beyer_swinehart(freqs, grain, n_grains, initial=spectra[-1] if spectra else None)
+    else:
+        counts = beyer_swinehart(freqs, grain, n_grains)
+        for spectrum in spectra:
+            counts = convolve_counts(counts, spectrum)
+
+    return StatesResult(
+        energies=np.arange(n_grains) * grain,
+        counts=counts,
+        density=counts / grain,
+        sum_of_states=np.cumsum(counts),
+    )
+
+
+def hindered_rotor_levels(rotor, e_max=35000.0):
+    """Returns a hindered rotor's levels in the form `count_states` expects.
+
+    Parameters
+    ----------
+    rotor : HinderedRotor
+        The rotor.
+    e_max : float, optional
+        Levels above this energy (cm^-1) are dropped, by default 35000.0
+
+    Returns
+    -------
+    `np.ndarray`
+        The rotor levels in cm^-1 measured from its ground level.
+    """
+    levels = (rotor.energy_levels - rotor.energy_levels[0]) / (h * c_in_cm)
+    return levels[levels <= e_max]
@@ -1,5 +1,6 @@
 import numpy as np
 from scipy.constants import Boltzmann, N_A, h, c, calorie, physical_constants
+from cantherm.statmech.harmonic_oscillator import ho_thermo
 
 c_in_cm = c*100
 R_kcal = physical_constants['molar gas constant'][0]/(calorie*1e3)
@@ -12,14 +13,15 @@ def h_tr(temp):
     
     Parameters
     ----------
-    temp : float
-        The temperature in K.
+    temp : float or `np.ndarray`
+        The temperature(s) in K.
     
     Returns
     -------
-    float
-        The translational enthalpy contribution in kcal/mol.
+    float or `np.ndarray`
+        The translational enthalpy contribution in kcal/mol, with the same shape as `temp`.
     """
+    temp = np.asarray(temp, dtype=float)
     H = 5.0 / 2.0 * R_kcal * temp
     return H
 
@@ -32,14 +34,15 @@ def h_rot(temp):
     
     Parameters
     ----------
-    temp : float
-        The temperature in K.
+    temp : float or `np.ndarray`
+        The temperature(s) in K.
     
     Returns
     -------
-    float
-        The rotational enthalpy contribution in kcal/mol.
+    float or `np.ndarray`
+        The rotational enthalpy contribution in kcal/mol, with the same shape as `temp`.
     """
+    temp = np.asarray(temp, dtype=float)
     H = 3.0 / 2.0 * R_kcal * temp
     return H
 
@@ -54,20 +57,15 @@ def h_vib(freqs, temp, scale=0.99):
     ----------
     freqs : iterable (list or `np.ndarray`)
         A list of the vibrational frequencies in cm^-1.
-    temp : float
-        The temperature in K.
+    temp : float or `np.ndarray`
+        The temperature(s) in K.
     scale : float, optional
         Scale of the frequencies, by default 0.99
     
     Returns
     -------
-    float 
-        The vibrational enthalpy contribution in kcal/mol
+    float or `np.ndarray`
+        The vibrational enthalpy contribution in kcal/mol, with the same shape as `temp`.
     """
-    freqs = freqs.copy()
-    freqs *= scale
-    H = 0
-    for nu in freqs:
-        ei = h * nu * c_in_cm  # hv for this mode in J
-        H += ei / (np.exp(ei / (Boltzmann * temp)) - 1.0) * (N_A / (calorie*1e3))
+    H = ho_thermo(freqs, temp, scale=scale).h
     return H
@@ -1,7 +1,8 @@
 import numpy as np
 
 from scipy.constants import Boltzmann, N_A, h, c, calorie, physical_constants
-from cantherm.statmech import q_tr, q_rot, q_vib, h_rot
+from cantherm.statmech import log_q_tr, log_q_rot, h_rot
+from cantherm.statmech.harmonic_oscillator import ho_thermo
 
 c_in_cm = c*100
 R_cal = physical_constants['molar gas constant'][0]/(calorie)
@@ -18,15 +19,15 @@ def s_tr(masses, temp):
     ----------
     masses : `np.ndarray`
         The masses of the atoms in the molecules. Units should be in g.
-    temp : float
-        The temperature in K.
+    temp : float or `np.ndarray`
+        The temperature(s) in K.
     
     Returns
     -------
-    float
-        The translational entropy contribution in cal/(mol K).
+    float or `np.ndarray`
+        The translational entropy contribution in cal/(mol K), with the same shape as `temp`.
     """
-    s = R_cal * (np.log(q_tr(masses, temp)) + 5.0 / 2.0)
+    s = R_cal * (log_q_tr(masses, temp) + 5.0 / 2.0)
     return s
 
 
@@ -42,19 +43,20 @@ def s_rot(sigma, I_ext, temp):
         The rotational symmetry factor of the molecule.
     I_ext : `iterable` (list or `np.ndarray`)
         The moments of interia for the molecule. Units should be amu * ang.^2.
-    temp : float
-        The temperature in K.
+    temp : float or `np.ndarray`
+        The temperature(s) in K.
     
     Returns
     -------
-    float
-        The rotational entropic contribution in cal/(mol K).
+    float or `np.ndarray`
+        The rotational entropic contribution in cal/(mol K), with the same shape as `temp`.
     """
-    s = h_rot(temp) * 1e3 / temp + R_cal * np.log(q_rot(sigma, I_ext, temp))
+    temp = np.asarray(temp, dtype=float)
+    s = h_rot(temp) * 1e3 / temp + R_cal * log_q_rot(sigma, I_ext, temp)
     return s
 
 
-def s_vib(freqs, temp, scale=0.99):
+def s_vib(freqs, temp, scale=0.99, qrrho=None, qrrho_cutoff=100.0):
     """Calculates the vibrational entropic contribution.
 
    For more details see
@@ -64,24 +66,20 @@ def s_vib(freqs, temp, scale=0.99):
     ----------
     freqs : iterable (list or `np.ndarray`)
         A list of the vibrational frequencies in cm^-1.
-    temp : float
-        The temperature in K.
+    temp : float or `np.ndarray`
+        The temperature(s) in K.
     scale : float, optional
         Scale of the frequencies, by default 0.99
+    qrrho : str, optional
+        Quasi-RRHO treatment of the soft modes, None, "truhlar", or "grimme", by default None
+    qrrho_cutoff : float, optional
+        The quasi-RRHO cutoff frequency in cm^-1, by default 100.0
     
     Returns
     -------
-    float 
-        The vibrational entropic contribution in cal/(mol K)
+    float or `np.ndarray`
+        The vibrational entropic contribution in cal/(mol K), with the same shape as `temp`.
     """
-    freqs = freqs.copy()
-    freqs *= scale
-    s = 0
-    for nu in freqs:
-        ei = h * nu * c_in_cm  # hv for this mode in J
-        s += R_cal * (
-            (ei / (Boltzmann * temp)) / (np.exp(ei / (Boltzmann * temp)) - 1.0)
-            - np.log(1.0 - np.exp(-ei / (Boltzmann * temp)))
-        )
+    s = ho_thermo(freqs, temp, scale=scale, qrrho=qrrho, qrrho_cutoff=qrrho_cutoff).s
 
     return s
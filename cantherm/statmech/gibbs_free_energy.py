@@ -1,6 +1,7 @@
 import numpy as np
 
 from cantherm.statmech import h_tr, h_rot, h_vib, s_tr, s_rot, s_vib
+from cantherm.statmech.harmonic_oscillator import ho_thermo
 from scipy.constants import Boltzmann, N_A, h, c
 c_in_cm = c*100
 
@@ -13,14 +14,15 @@ def g_tr(masses, temp):
     ----------
     masses : `np.ndarray`
         The masses of the atoms in the molecules. Units should be in g.
-    temp : float
-        The temperature in K.
+    temp : float or `np.ndarray`
+        The temperature(s) in K.
     
     Returns
     -------
-    float     
-        The translational contribution to the Gibbs free energys in kcal/mol.
+    float or `np.ndarray`
+        The translational contribution to the Gibbs free energys in kcal/mol, with the same shape as `temp`.
     """
+    temp = np.asarray(temp, dtype=float)
     g = h_tr(temp) - temp * s_tr(masses, temp) / 1e3
     return g
 
@@ -37,19 +39,20 @@ def g_rot(sigma, I_ext, temp):
         The rotational symmetry factor of the molecule.
     I_ext : `iterable` (list or `np.ndarray`)
         The moments of interia for the molecule. Units should be amu * ang.^2.
-    temp : float
-        The temperature in K.
+    temp : float or `np.ndarray`
+        The temperature(s) in K.
     
     Returns
     -------
-    float
-        The rotational contribution to the Gibbs free energy in kcal/mol.
+    float or `np.ndarray`
+        The rotational contribution to the Gibbs free energy in kcal/mol, with the same shape as `temp`.
     """
+    temp = np.asarray(temp, dtype=float)
     g = h_rot(temp) - temp * s_rot(sigma, I_ext, temp) / 1e3
     return g
 
 
-def g_vib(freqs, temp, scale=0.99):
+def g_vib(freqs, temp, scale=0.99, qrrho=None, qrrho_cutoff=100.0):
     """Calculates the vibrational contribution to the Gibbs free energy.
 
     This calculation assumes vibrations act as harmonic oscillators.
@@ -58,18 +61,19 @@ def g_vib(freqs, temp, scale=0.99):
     ----------
     freqs : iterable (list or `np.ndarray`)
         A list of the vibrational frequencies in cm^-1.
-    temp : float
-        The temperature in K.
+    temp : float or `np.ndarray`
+        The temperature(s) in K.
     scale : float, optional
         Scale of the frequencies, by default 0.99
+    qrrho : str, optional
+        Quasi-RRHO treatment of the soft modes, None, "truhlar", or "grimme", by default None
+    qrrho_cutoff : float, optional
+        The quasi-RRHO cutoff frequency in cm^-1, by default 100.0
     
     Returns
     -------
-    float
-        The vibrational contribution to the Gibbs free energy in kcal/mol.
+    float or `np.ndarray`
+        The vibrational contribution to the Gibbs free energy in kcal/mol, with the same shape as `temp`.
     """
-    g = (
-        h_vib(freqs.copy(), temp, scale=scale)
-        - temp * s_vib(freqs.copy(), temp, scale=scale) / 1e3
-    )
+    g = ho_thermo(freqs, temp, scale=scale, qrrho=qrrho, qrrho_cutoff=qrrho_cutoff).g
     return g
@@ -0,0 +1,203 @@
+from typing import NamedTuple
+
+import numpy as np
+from scipy.constants import Boltzmann, N_A, h, c, calorie, physical_constants
+
+from cantherm.statmech import backend
+from cantherm.statmech.quasi_harmonic import truhlar_energies, grimme_s_vib
+
+QRRHO_METHODS = (None, "truhlar", "grimme")
+
+c_in_cm = c * 100
+R_cal = physical_constants["molar gas constant"][0] / (calorie)
+R_kcal = R_cal / 1e3
+
+
+class HOThermo(NamedTuple):
+    """Harmonic oscillator thermochemistry for a set of vibrational modes.
+
+    Every temperature dependent field has the same shape as the `temp` passed to the
+    kernel that produced it.
+
+    Attributes
+    ----------
+    q : float or `np.ndarray`
+        The vibrational partition function (referenced to the vibrational ground state).
+    log_q : float or `np.ndarray`
+        The natural log of `q`, which stays finite when `q` itself overflows.
+    h : float or `np.ndarray`
+        The vibrational enthalpy contribution in kcal/mol (ZPVE not included).
+    s : float or `np.ndarray`
+        The vibrational entropy contribution in cal/(mol K).
+    cp : float or `np.ndarray`
+        The vibrational heat capacity contribution in cal/(mol K).
+    g : float or `np.ndarray`
+        The vibrational Gibbs free energy contribution in kcal/mol (ZPVE not included).
+    zpve : float
+        The zero point vibrational energy in kcal/mol.
+    """
+
+    q: np.ndarray
+    log_q: np.ndarray
+    h: np.ndarray
+    s: np.ndarray
+    cp: np.ndarray
+    g: np.ndarray
+    zpve: float
+
+
+def mode_energies(freqs, scale=0.99):
+    """Returns the energy quantum (hv) of each vibrational mode.
+
+    Parameters
+    ----------
+    freqs : iterable (list or `np.ndarray`)
+        A list of the vibrational frequencies in cm^-1.
+    scale : float, optional
+        Scale of the frequencies, by default 0.99
+
+    Returns
+    -------
+    `np.ndarray`
+        The energy of each mode in J. The input frequencies are never modified.
+    """
+    return h * np.asarray(freqs, dtype=float) * scale * c_in_cm
+
+
+def zpve_from_energies(energies):
+    """Returns the zero point vibrational energy from precomputed mode energies.
+
+    Parameters
+    ----------
+    energies : `np.ndarray`
+        The energy of each vibrational mode in J, see `mode_energies`.
+
+    Returns
+    -------
+    float
+        The zero point vibrational energy in kcal/mol.
+    """
+    return 0.5 * np.sum(energies) * N_A / (calorie * 1e3)
+
+
+def ho_thermo_from_energies(energies, temp, qrrho=None, qrrho_cutoff=100.0):
+    """Evaluates every harmonic oscillator property from precomputed mode energies.
+
+    The reduced energies x = hv/kT and the Boltzmann factors are computed once for all
+    modes and temperatures, and every property is built from them. The sums over modes are
+    done by the active kernel backend (see `cantherm.statmech.backend`). For more details see
+    The NIST Reference Database I.D.2 (VII.C.6.) <https://cccbdb.nist.gov/thermo.asp> equations 25-28
+
+    Low frequency modes can optionally get a quasi-RRHO treatment: "truhlar" raises every
+    mode below `qrrho_cutoff` to the cutoff before anything is evaluated, while "grimme"
+    replaces the entropy (and so G) of the soft modes with a damped free rotor
+    interpolation, leaving Q, H and Cp harmonic.
+
+    Parameters
+    ----------
+    energies : `np.ndarray`
+        The energy of each vibrational mode in J, see `mode_energies`.
+    temp : float or `np.ndarray`
+        The temperature(s) in K.
+    qrrho : str, optional
+        None (pure harmonic), "truhlar", or "grimme", by default None
+    qrrho_cutoff : float, optional
+        The quasi-RRHO cutoff frequency in cm^-1, by default 100.0
+
+    Returns
+    -------
+    HOThermo
+        The vibrational partition function, enthalpy, entropy, heat capacity,
+        Gibbs free energy, and ZPVE.
+
+    Raises
+    ------
+    ValueError
+        If `qrrho` isn't one of the supported treatments.
+    """
+    if qrrho not in QRRHO_METHODS:
+        raise ValueError(f"Unknown quasi-RRHO treatment {qrrho}, choose from {QRRHO_METHODS}")
+    if qrrho == "truhlar":
+        energies = truhlar_energies(energies, cutoff=qrrho_cutoff)
+
+    temp = np.asarray(temp, dtype=float)
+
+    # ln Q, H / RT and Cp / R summed over modes, one expm1 per mode and temperature
+    log_q, h_red, cp_red = (
+        arr.reshape(temp.shape)[()] for arr in backend.ho_sums(energies, temp.ravel())
+    )
+
+    zpve = zpve_from_energies(energies)  # kcal/mol
+
+    # Q itself may overflow to inf for very large systems, log_q is always usable
+    with np.errstate(over="ignore"):
+        q = np.exp(log_q)
+
+    H = R_kcal * temp * h_red
+    if qrrho == "grimme":
+        S = grimme_s_vib(energies, temp, cutoff=qrrho_cutoff)
+        G = H - temp * S / 1e3
+    else:
+        S = R_cal * (h_red + log_q)
+        G = -R_kcal * temp * log_q
+
+    return HOThermo(
+        q=q, log_q=log_q, h=H, s=S, cp=R_cal * cp_red, g=G, zpve=zpve,
+    )
+
+
+def ho_thermo(freqs, temp, scale=0.99, qrrho=None, qrrho_cutoff=100.0):
+    """Calculates all of the vibrational thermochemistry in a single pass.
+
+    This calculation assumes vibrations act as harmonic oscillators.
+
+    Parameters
+    ----------
+    freqs : iterable (list or `np.ndarray`)
+        A list of the vibrational frequencies in cm^-1.
+    temp : float or `np.ndarray`
+        The temperature(s) in K.
+    scale : float, optional
+        Scale of the frequencies, by default 0.99
+    qrrho : str, optional
+        None (pure harmonic), "truhlar", or "grimme", see `ho_thermo_from_energies`, by default None
+    qrrho_cutoff : float, optional
+        The quasi-RRHO cutoff frequency in cm^-1, by default 100.0
+
+    Returns
+    -------
+    HOThermo
+        The vibrational partition function, enthalpy, entropy, heat capacity,
+        Gibbs free energy, and ZPVE.
+    """
+    return ho_thermo_from_energies(
+        mode_energies(freqs, scale=scale), temp, qrrho=qrrho, qrrho_cutoff=qrrho_cutoff
+    )
+
+
+def combine_thermo(*parts):
+    """Sums independent contributions (e.g. harmonic modes and hindered rotors).
+
+    Parameters
+    ----------
+    *parts : HOThermo
+        The contributions to combine, all evaluated on the same temperatures.
+
+    Returns
+    -------
+    HOThermo
+        The combined contributions, partition functions are multiplied and
+        everything else is added.
+    """
+    log_q = sum(p.log_q for p in parts)
+    with np.errstate(over="ignore"):
+        q = np.exp(log_q)
+    return HOThermo(
+        q=q,
+        log_q=log_q,
+        h=sum(p.h for p in parts),
+        s=sum(p.s for p in parts),
+        cp=sum(p.cp for p in parts),
+        g=sum(p.g for p in parts),
+        zpve=sum(p.zpve for p in parts),
+    )
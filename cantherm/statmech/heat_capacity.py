@@ -1,37 +1,54 @@
 import numpy as np
 
 from scipy.constants import Boltzmann, N_A, h, c, physical_constants, calorie
+from cantherm.statmech.harmonic_oscillator import ho_thermo
 
 c_in_cm = c*100
 R_cal = physical_constants['molar gas constant'][0]/(calorie)
 
-def cp_tr():
+def cp_tr(temp=None):
     """Returns the translational contribution to the heat capcity.
 
     This approximate molecules as an ideal gas particle. For more details see 
     The NIST Reference Database I.D.2 (VII.C.6.) <https://cccbdb.nist.gov/thermo.asp> equation 15
+
+    Parameters
+    ----------
+    temp : float or `np.ndarray`, optional
+        The temperature(s) in K. The contribution doesn't depend on temperature, but passing
+        a temperature grid broadcasts the result to the same shape, by default None
     
     Returns
     -------
-    float     
+    float or `np.ndarray`
         The translational contribution to the heat capacity at constant pressure in cal/(mol K).
     """
     cp = 5.0 / 2.0 * R_cal
+    if temp is not None:
+        cp = cp * np.ones_like(np.asarray(temp, dtype=float))
     return cp
 
 
-def cp_rot():
+def cp_rot(temp=None):
     """Returns the rotational contribution to the heat capacity. ASSUMES molecules are non-linear.
 
     This calculation assumes rigid body rotation. Also assumes the molecule is non-linear. For more details see 
     The NIST Reference Database I.D.2 (VII.C.6.) <https://cccbdb.nist.gov/thermo.asp> equation 20
+
+    Parameters
+    ----------
+    temp : float or `np.ndarray`, optional
+        The temperature(s) in K. The contribution doesn't depend on temperature, but passing
+        a temperature grid broadcasts the result to the same shape, by default None
     
     Returns
     -------
-    float
+    float or `np.ndarray`
         The rotational contribution to the heat capacity at constant pressure in cal/(mol K).
     """
-    cp = 5.0 / 2.0 * R_cal  # TODO
+    cp = 3.0 / 2.0 * R_cal
+    if temp is not None:
+        cp = cp * np.ones_like(np.asarray(temp, dtype=float))
     return cp
 
 
@@ -45,25 +62,16 @@ def cp_vib(freqs, temp, scale=0.99):
     ----------
     freqs : iterable (list or `np.ndarray`)
         A list of the vibrational frequencies in cm^-1.
-    temp : float
-        The temperature in K.
+    temp : float or `np.ndarray`
+        The temperature(s) in K.
     scale : float, optional
         Scale of the frequencies, by default 0.99
     
     Returns
     -------
-    float
-        The vibrational contribution to the heat capacity at constant pressure in cal/(mol K).
+    float or `np.ndarray`
+        The vibrational contribution to the heat capacity at constant pressure in cal/(mol K),
+        with the same shape as `temp`.
     """
-    cp = 0
-    freqs = freqs.copy()
-    freqs *= scale
-    for nu in freqs:
-        ei = h * nu * c_in_cm  # hv for this mode in J
-        cp += (
-            R_cal
-            * (ei / (Boltzmann * temp)) ** 2
-            * np.exp(ei / (Boltzmann * temp))
-            / (1.0 - np.exp(ei / (Boltzmann * temp))) ** 2
-        )
+    cp = ho_thermo(freqs, temp, scale=scale).cp
     return cp
@@ -1,2 +1,198 @@
 import numpy as np
+from scipy.constants import Boltzmann, N_A, hbar, c, calorie
 
+from cantherm.statmech.harmonic_oscillator import HOThermo, R_cal, R_kcal
+
+c_in_cm = c * 100
+kcal_to_J = calorie * 1e3 / N_A  # kcal/mol -> J / molecule
+amu_ang2_to_kg_m2 = 1e-3 / N_A * 1e-20
+
+
+def fit_fourier_potential(angles, energies, n_terms=5):
+    """Least-squares fit of a torsional scan to a Fourier series.
+
+    V(phi) = a_0 + sum_k a_k cos(k phi) + b_k sin(k phi) for k = 1..n_terms
+
+    Parameters
+    ----------
+    angles : `np.ndarray`
+        The dihedral angles of the scan in radians.
+    energies : `np.ndarray`
+        The energies of the scan in kcal/mol.
+    n_terms : int, optional
+        The number of cosine (and sine) terms to fit, by default 5
+
+    Returns
+    -------
+    tuple(`np.ndarray`, `np.ndarray`)
+        The cosine and sine coefficients (a_1..a_n, b_1..b_n) in kcal/mol. The constant
+        term is dropped since `HinderedRotor` references energies to the potential minimum.
+    """
+    angles = np.asarray(angles, dtype=float)
+    k = np.arange(1, n_terms + 1)
+    basis = np.hstack(
+        [
+            np.ones((angles.size, 1)),
+            np.cos(np.outer(angles, k)),
+            np.sin(np.outer(angles, k)),
+        ]
+    )
+    coeffs = np.linalg.lstsq(basis, np.asarray(energies, dtype=float), rcond=None)[0]
+    return coeffs[1 : n_terms + 1], coeffs[n_terms + 1 :]
+
+
+class HinderedRotor:
+    """One dimensional hindered internal rotor.
+
+    The Hamiltonian -hbar^2/(2I) d^2/dphi^2 + V(phi) is diagonalized once in a plane-wave
+    basis exp(i m phi), m = -n_max..n_max, and the energy levels are cached. Every
+    thermodynamic property is then a vectorized Boltzmann sum over the cached levels for the
+    whole temperature grid.
+
+    Attributes
+    ----------
+    I_red : float
+        The reduced moment of inertia of the rotor in amu * ang.^2.
+    cos_coeffs : `np.ndarray`
+        Cosine Fourier coefficients of the potential (k = 1, 2, ...) in kcal/mol.
+    sin_coeffs : `np.ndarray`
+        Sine Fourier coefficients of the potential (k = 1, 2, ...) in kcal/mol.
+    sigma : int
+        The symmetry number of the rotor (number of equivalent minima).
+    n_max : int
+        The largest plane-wave quantum number in the basis.
+    energy_levels : `np.ndarray`
+        The eigenvalues of the rotor Hamiltonian in J, relative to the potential minimum.
+    """
+
+    def __init__(self, I_red, cos_coeffs, sin_coeffs=None, sigma=1, n_max=None):
+        """Builds the rotor and diagonalizes its Hamiltonian.
+
+        Parameters
+        ----------
+        I_red : float
+            The reduced moment of inertia of the rotor in amu * ang.^2.
+        cos_coeffs : iterable (list or `np.ndarray`)
+            Cosine Fourier coefficients of the potential (k = 1, 2, ...) in kcal/mol.
+        sin_coeffs : iterable (list or `np.ndarray`), optional
+            Sine Fourier coefficients of the potential (k = 1, 2, ...) in kcal/mol, by default None
+        sigma : int, optional
+            The symmetry number of the rotor, by default 1
+        n_max : int, optional
+            The largest plane-wave quantum number in the basis. By default it's chosen so
+            the basis spans 100 kcal/mol above the barrier, which converges the thermo to
+            well past 3000 K.
+        """
+        self.I_red = float(I_red)
+        self.cos_coeffs = np.atleast_1d(np.asarray(cos_coeffs, dtype=float))
+        if sin_coeffs is None:
+            sin_coeffs = np.zeros_like(self.cos_coeffs)
+        self.sin_coeffs = np.atleast_1d(np.asarray(sin_coeffs, dtype=float))
+        if self.sin_coeffs.size != self.cos_coeffs.size:
+            raise ValueError("cos_coeffs and sin_coeffs must be the same length")
+        self.sigma = sigma
+
+        # Rotational constant hbar^2 / 2I in J
+        self._B = hbar ** 2 / (2.0 * self.I_red * amu_ang2_to_kg_m2)
+
+        # Reference the potential to its minimum
+        self._phi_grid = np.linspace(0.0, 2.0 * np.pi, 3601)[:-1]
+        v_grid = self.potential(self._phi_grid)
+        self.v_min = v_grid.min()
+        self.v_max = v_grid.max()
+        self.phi_min = self._phi_grid[np.argmin(v_grid)]
+
+        if n_max is None:
+            e_cut = (self.v_max - self.v_min + 100.0) * kcal_to_J
+            n_max = int(np.ceil(np.sqrt(e_cut / self._B)))
+        self.n_max = n_max
+
+        self.energy_levels = self._diagonalize()
+
+    def potential(self, phi):
+        """Evaluates the torsional potential (without the constant term).
+
+        Parameters
+        ----------
+        phi : float or `np.ndarray`
+            The dihedral angle(s) in radians.
+
+        Returns
+        -------
+        float or `np.ndarray`
+            The potential energy in kcal/mol.
+        """
+        phi = np.asarray(phi, dtype=float)
+        k = np.arange(1, self.cos_coeffs.size + 1)
+        k_phi = phi[..., np.newaxis] * k
+        return np.cos(k_phi) @ self.cos_coeffs + np.sin(k_phi) @ self.sin_coeffs
+
+    def _diagonalize(self):
+        m = np.arange(-self.n_max, self.n_max + 1)
+        ham = np.diag(self._B * m ** 2 - self.v_min * kcal_to_J).astype(complex)
+
+        # <m|cos(k phi)|n> = 1/2 and <m|sin(k phi)|n> = -+i/2 for m - n = +-k
+        for k, (a_k, b_k) in enumerate(zip(self.cos_coeffs, self.sin_coeffs), start=1):
+            if k >= m.size:
+                break
+            v_k = 0.5 * (a_k - 1j * b_k) * kcal_to_J
+            off_diag = np.full(m.size - k, v_k)
+            ham += np.diag(off_diag, -k) + np.diag(off_diag.conj(), k)
+
+        return np.linalg.eigvalsh(ham)
+
+    @property
+    def zpve(self):
+        """The zero point energy of the rotor (ground level above the minimum) in kcal/mol."""
+        return self.energy_levels[0] / kcal_to_J
+
+    @property
+    def harmonic_freq(self):
+        """The harmonic frequency (cm^-1) at the bottom of the torsional well."""
+        k = np.arange(1, self.cos_coeffs.size + 1)
+        k_phi = k * self.phi_min
+        curvature = -np.sum(
+            k ** 2 * (self.cos_coeffs * np.cos(k_phi) + self.sin_coeffs * np.sin(k_phi))
+        )
+        curvature *= kcal_to_J  # J / rad^2
+        if curvature <= 0:
+            return 0.0
+        omega = np.sqrt(curvature / (self.I_red * amu_ang2_to_kg_m2))
+        return omega / (2.0 * np.pi * c_in_cm)
+
+    def thermo(self, temp):
+        """Calculates the rotor contributions to the thermochemistry.
+
+        The levels are referenced to the rotor ground state (i.e. like the harmonic
+        oscillator functions, H and G don't include the ZPVE).
+
+        Parameters
+        ----------
+        temp : float or `np.ndarray`
+            The temperature(s) in K.
+
+        Returns
+        -------
+        HOThermo
+            The rotor Q, ln Q, H (kcal/mol), S (cal/(mol K)), Cp (cal/(mol K)),
+            G (kcal/mol), and ZPVE (kcal/mol).
+        """
+        temp = np.asarray(temp, dtype=float)
+        x = (self.energy_levels - self.energy_levels[0]) / (
+            Boltzmann * temp[..., np.newaxis]
+        )  # (temps, levels)
+        w = np.exp(-x)
+        z = np.sum(w, axis=-1)
+        x_avg = np.sum(w * x, axis=-1) / z
+        x2_avg = np.sum(w * x ** 2, axis=-1) / z
+
+        log_q = np.log(z) - np.log(self.sigma)
+        return HOThermo(
+            q=np.exp(log_q),
+            log_q=log_q,
+            h=R_kcal * temp * x_avg,
+            s=R_cal * (x_avg + log_q),
+            cp=R_cal * (x2_avg - x_avg ** 2),
+            g=-R_kcal * temp * log_q,
+            zpve=self.zpve,
+        )
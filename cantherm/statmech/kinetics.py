@@ -1,71 +1,64 @@
-class Reaction:
-    '''
-    Attributes:
-
-        reactants ():
-
-        ts ():
-
-        temp ():
-
-        reac_type ():
-
-        products ():
-
-        tunneling ():
-
-        scale ():
-
-        rates ():
-
-        activation_energy ():
-
-    '''
-
-    def __init__(self,
-                 reactants,
-                 ts,
-                 temp,
-                 reac_type='Unimol',
-                 products=[],
-                 tunneling=None,
-                 scale=0.99):
-        self.reactants = reactants
-        self.ts = ts
-        self.temp = temp     #YES
-        self.reac_type = reac_type     #YES
-        self.products = products
-        self.tunneling = tunneling
-        self.scale = scale
-        self.rates = None     #YES
-        self.tunneling_coeff = None     #YES
-        self.q_ratio = None     #YES
-        return
-
-    ############################################################################
-
-    def calc_TST_rates(self):
-        '''
-            Calculates the transition state theory rate constants for the
-            reaction at the given temperatures.
-        '''
-        self.rates = [0] * len(self.temp)
-        self.tunneling_coeff = [0] * len(self.temp)
-        self.q_ratio = [0] * len(self.temp)
-
-        for i in range(len(self.temp)):
-            t = self.temp[i]
-            if self.reac_type == 'Unimol':
-                Q_react = self.reactants.calculate_Q(t)
-                Q_TS = self.ts.calculate_Q(t)
-
-            self.q_ratio[i] = (Boltzmann * t / h) * (Q_TS / Q_react)
-            self.rates[i] = (Boltzmann * t / h) * (Q_TS / Q_react)
-            self.rates[i] *= math.exp(-(self.ts.Energy - \
-                                        self.reactants.Energy) * ha_to_kcal \
-                                        / R_kcal / t)
-
-            if self.tunneling == "Wigner":
-                kappa = wigner_correction(t, self.ts.imagFreq, self.scale)
-                self.rates[i] *= kappa
-                self.tunneling_coeff[i] = kappa
\ No newline at end of file
+"""
+Transition state theory rate expressions evaluated over whole temperature arrays
+"""
+import numpy as np
+from scipy.constants import Boltzmann, h, calorie, physical_constants
+
+R_kcal = physical_constants["molar gas constant"][0] / (calorie * 1e3)
+R_SI = physical_constants["molar gas constant"][0]
+
+
+def standard_concentration(temp, pressure=101325.0):
+    """Concentration of an ideal gas at the standard state pressure.
+
+    Parameters
+    ----------
+    temp : float or `np.ndarray`
+        The temperature(s) in K.
+    pressure : float, optional
+        The standard state pressure in Pa, by default 101325.0 (1 atm, the standard
+        state of `q_tr`)
+
+    Returns
+    -------
+    float or `np.ndarray`
+        c = P / RT in mol / cm^3, with the same shape as `temp`.
+    """
+    return pressure / (R_SI * np.asarray(temp, dtype=float)) * 1e-6
+
+
+def log_tst_rate(temp, log_q_ts, log_q_reactants, barrier, molecularity=1):
+    """Natural log of the canonical TST rate constant.
+
+    ln k = ln(kT / h) + ln Q_TS - sum ln Q_R - E0 / RT - (m - 1) ln c
+
+    where the partition functions are per molecule at the standard state of `q_tr`
+    and c is the matching `standard_concentration`.
+
+    Parameters
+    ----------
+    temp : float or `np.ndarray`
+        The temperature(s) in K.
+    log_q_ts : float or `np.ndarray`
+        ln Q of the transition state (vibrations referenced to the zero-point level).
+    log_q_reactants : float or `np.ndarray`
+        The sum of ln Q over the reactants.
+    barrier : float
+        The zero-point corrected barrier in kcal/mol.
+    molecularity : int or `np.ndarray`, optional
+        The number of reactants, by default 1. An array (e.g. one molecularity per
+        reaction, shape (n_reactions, 1)) is broadcast against ln k.
+
+    Returns
+    -------
+    float or `np.ndarray`
+        ln k with k in 1/s (unimolecular) or cm^3 / (mol s) (bimolecular), with the same
+        shape as `temp`.
+    """
+    temp = np.asarray(temp, dtype=float)
+    log_k = np.log(Boltzmann * temp / h) + log_q_ts - log_q_reactants
+    log_k = log_k - barrier / (R_kcal * temp)
+    extra = np.asarray(molecularity) - 1
+    if np.any(extra):
+        log_k = log_k - extra * np.log(standard_concentration(temp))
+    return log_k
@@ -1,6 +1,7 @@
 import numpy as np
 
 from scipy.constants import Boltzmann, N_A, h, c
+from cantherm.statmech.harmonic_oscillator import ho_thermo
 
 c_in_cm = c * 100
 
@@ -17,16 +18,17 @@ def q_tr(masses, temp):
     ----------
     masses : `np.ndarray`
         The masses of the atoms in the molecules. Units should be in g.
-    temp : float
-        The temperature in K.
+    temp : float or `np.ndarray`
+        The temperature(s) in K.
     
     Returns
     -------
-    float     
-        The translational contribution to the partition function.
+    float or `np.ndarray`
+        The translational contribution to the partition function, with the same shape as `temp`.
     """
     # Translational Contrib.
     # TODO Assuming Unimolecular for now so it's technically per volume
+    temp = np.asarray(temp, dtype=float)
     mass = masses.sum() / 1e3 / N_A  # Mass in kg / molecule
     q = ((2 * np.pi * mass) / h ** 2) ** 1.5 / 101325 * (Boltzmann * temp) ** 2.5
     return q
@@ -46,14 +48,15 @@ def q_rot(sigma, I_ext, temp):
         The rotational symmetry factor of the molecule.
     I_ext : `iterable` (list or `np.ndarray`)
         The moments of interia for the molecule. Units should be amu * ang.^2.
-    temp : float
-        The temperature in K.
+    temp : float or `np.ndarray`
+        The temperature(s) in K.
     
     Returns
     -------
-    float
-        The rotational partition function.
+    float or `np.ndarray`
+        The rotational partition function, with the same shape as `temp`.
     """
+    temp = np.asarray(temp, dtype=float)
     q = 1
     if np.min(I_ext) == 0:  # linear
         q *= (8 * np.pi ** 2 * np.max(I_ext) * Boltzmann * temp) / (sigma * h ** 2)
@@ -75,20 +78,93 @@ def q_vib(freqs, temp, scale=0.99):
     ----------
     freqs : iterable (list or `np.ndarray`)
         A list of the vibrational frequencies in cm^-1.
-    temp : float
-        The temperature in K.
+    temp : float or `np.ndarray`
+        The temperature(s) in K.
     scale : float, optional
         Scale of the frequencies, by default 0.99
     
     Returns
     -------
-    float
-        The vibrational contribution to the partition function.
+    float or `np.ndarray`
+        The vibrational contribution to the partition function, with the same shape as `temp`.
     """
-    q = 1.0
-    freqs = freqs.copy()
-    freqs *= scale
-    for nu in freqs:
-        ei = h * nu * c_in_cm  # hv for this mode in J
-        q *= 1.0 / (1.0 - np.exp(-ei / (Boltzmann * temp)))
+    q = ho_thermo(freqs, temp, scale=scale).q
     return q
+
+
+def log_q_tr(masses, temp):
+    """Returns the natural log of the translational partition function.
+
+    Evaluated term by term in log space so it can be combined with other log partition
+    functions without ever forming the (very large) partition function itself. See `q_tr`.
+
+    Parameters
+    ----------
+    masses : `np.ndarray`
+        The masses of the atoms in the molecules. Units should be in g.
+    temp : float or `np.ndarray`
+        The temperature(s) in K.
+
+    Returns
+    -------
+    float or `np.ndarray`
+        ln(q_tr), with the same shape as `temp`.
+    """
+    temp = np.asarray(temp, dtype=float)
+    mass = masses.sum() / 1e3 / N_A  # Mass in kg / molecule
+    log_q = 1.5 * np.log((2 * np.pi * mass) / h ** 2) - np.log(101325)
+    log_q = log_q + 2.5 * np.log(Boltzmann * temp)
+    return log_q
+
+
+def log_q_rot(sigma, I_ext, temp):
+    """Returns the natural log of the rotational partition function.
+
+    Evaluated term by term in log space, see `q_rot`.
+
+    Parameters
+    ----------
+    sigma : int
+        The rotational symmetry factor of the molecule.
+    I_ext : `iterable` (list or `np.ndarray`)
+        The moments of interia for the molecule. Units should be amu * ang.^2.
+    temp : float or `np.ndarray`
+        The temperature(s) in K.
+
+    Returns
+    -------
+    float or `np.ndarray`
+        ln(q_rot), with the same shape as `temp`.
+    """
+    temp = np.asarray(temp, dtype=float)
+    I_ext = np.asarray(I_ext, dtype=float)
+    if np.min(I_ext) == 0:  # linear
+        log_q = np.log(8 * np.pi ** 2 * np.max(I_ext) * Boltzmann * temp / h ** 2)
+    else:  # non-linear
+        log_q = 0.5 * (np.log(np.pi) + np.sum(np.log(I_ext[:3])))
+        log_q = log_q + 1.5 * np.log(8.0 * np.pi ** 2 * Boltzmann * temp / h ** 2)
+    return log_q - np.log(sigma)
+
+
+def log_q_vib(freqs, temp, scale=0.99):
+    """Returns the natural log of the vibrational partition function.
+
+    The per-mode factors are summed as -ln(1 - exp(-hv/kT)) using `expm1`, so the result
+    stays finite and accurate for systems with hundreds of modes, see `q_vib`.
+
+    Parameters
+    ----------
+    freqs : iterable (list or `np.ndarray`)
+        A list of the vibrational frequencies in cm^-1.
+    temp : float or `np.ndarray`
+        The temperature(s) in K.
+    scale : float, optional
+        Scale of the frequencies, by default 0.99
+
+    Returns
+    -------
+    float or `np.ndarray`
+        ln(q_vib), with the same shape as `temp`.
+    """
+    log_q = ho_thermo(freqs, temp, scale=scale).log_q
+    return log_q
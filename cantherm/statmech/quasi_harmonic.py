@@ -0,0 +1,90 @@
+import numpy as np
+from scipy.constants import Boltzmann, h, c, calorie, physical_constants
+
+c_in_cm = c * 100
+R_cal = physical_constants["molar gas constant"][0] / (calorie)
+
+# Average moment of inertia used to bound the free rotor entropy of very soft modes (kg m^2)
+B_AV = 1e-44
+
+
+def truhlar_energies(energies, cutoff=100.0):
+    """Raises every mode below the cutoff to the cutoff (Truhlar's quasi-harmonic treatment).
+
+    See Ribeiro, Marenich, Cramer, and Truhlar, J. Phys. Chem. B 115, 14556 (2011).
+
+    Parameters
+    ----------
+    energies : `np.ndarray`
+        The (already scaled) energy of each mode in J.
+    cutoff : float, optional
+        The smallest allowed frequency in cm^-1, by default 100.0
+
+    Returns
+    -------
+    `np.ndarray`
+        A new array of mode energies in J.
+    """
+    return np.maximum(energies, h * cutoff * c_in_cm)
+
+
+def grimme_weights(energies, cutoff=100.0, alpha=4):
+    """Head-Gordon damping weights used in Grimme's quasi-RRHO entropy.
+
+    Parameters
+    ----------
+    energies : `np.ndarray`
+        The energy of each mode in J.
+    cutoff : float, optional
+        The frequency (cm^-1) where harmonic and free rotor entropies are weighted equally, by default 100.0
+    alpha : int, optional
+        The damping exponent, by default 4
+
+    Returns
+    -------
+    `np.ndarray`
+        The weight of the harmonic oscillator entropy for each mode (between 0 and 1).
+    """
+    return 1.0 / (1.0 + (h * cutoff * c_in_cm / energies) ** alpha)
+
+
+def grimme_s_vib(energies, temp, cutoff=100.0, alpha=4):
+    """Vibrational entropy with Grimme's damped free rotor interpolation.
+
+    Each mode contributes w S_HO + (1 - w) S_FR, where S_FR is the entropy of a free rotor
+    with the same frequency. See S. Grimme, Chem. Eur. J. 18, 9955 (2012). The weights are
+    fixed per mode, so the interpolation is a single masked (temps, modes) array operation.
+
+    Parameters
+    ----------
+    energies : `np.ndarray`
+        The (already scaled) energy of each mode in J.
+    temp : float or `np.ndarray`
+        The temperature(s) in K.
+    cutoff : float, optional
+        The frequency (cm^-1) where harmonic and free rotor entropies are weighted equally, by default 100.0
+    alpha : int, optional
+        The damping exponent, by default 4
+
+    Returns
+    -------
+    float or `np.ndarray`
+        The vibrational entropy in cal/(mol K), with the same shape as `temp`.
+    """
+    temp = np.asarray(temp, dtype=float)
+    w = grimme_weights(energies, cutoff=cutoff, alpha=alpha)
+    x = energies / (Boltzmann * temp[..., np.newaxis])  # (temps, modes)
+    em = np.expm1(-x)
+    s_ho = -(1.0 + em) / em * x - np.log(-em)
+
+    # Free rotor entropy only matters where the rotor weight is non-negligible
+    soft = w < 1.0 - 1e-12
+    mu = h ** 2 / (8 * np.pi ** 2 * energies[soft])  # h / (8 pi^2 nu) in kg m^2
+    mu_eff = mu * B_AV / (mu + B_AV)
+    s_fr = 0.5 + 0.5 * np.log(
+        8 * np.pi ** 3 * mu_eff * Boltzmann * temp[..., np.newaxis] / h ** 2
+    )
+
+    s = s_ho.copy()
+    s[..., soft] = w[soft] * s_ho[..., soft] + (1.0 - w[soft]) * s_fr
+    return R_cal * np.sum(s, axis=-1)
@@ -0,0 +1,217 @@
+"""
+Wigner and Eckart tunneling corrections
+"""
+from functools import lru_cache
+
+import numpy as np
+from scipy.constants import Boltzmann, h, c, calorie, physical_constants, N_A
+
+c_in_cm = c * 100
+R_kcal = physical_constants["molar gas constant"][0] / (calorie * 1e3)
+wavenumber_to_kcal = h * c_in_cm * N_A / (calorie * 1e3)
+
+
+def wigner_correction(temp, freq, scale):
+    """Wigner tunneling coefficient.
+
+    See doi:10.1103/PhysRev.40.749 and doi:10.1039/TF9595500001.
+
+    Parameters
+    ----------
+    temp : float or `np.ndarray`
+        The temperature(s) in K.
+    freq : float
+        The imaginary frequency of the TS in cm^-1 (the sign is ignored).
+    scale : float
+        Scale of the frequency.
+
+    Returns
+    -------
+    float or `np.ndarray`
+        kappa(T), with the same shape as `temp`.
+    """
+    temp = np.asarray(temp, dtype=float)
+    u = h * abs(freq) * scale * c_in_cm / (Boltzmann * temp)
+    return 1.0 + u ** 2 / 24.0
+
+
+class EckartBarrier:
+    """Asymmetric Eckart barrier fitted to a TS imaginary frequency and two barrier heights.
+
+    The transmission probability is evaluated once on an energy grid (with Simpson
+    weights folded in) when the barrier is built. kappa(T) for any number of temperatures
+    is then a single (temps, grid) exponential times the cached vector, i.e.
+
+        kappa(T) = beta exp(beta V1) int P(E) exp(-beta E) dE
+
+    with E measured from the reactants. Above the top of the grid P(E) = 1 and the tail of
+    the integral is added analytically.
+
+    Attributes
+    ----------
+    freq : float
+        The magnitude of the (scaled) imaginary frequency in cm^-1.
+    v_forward : float
+        The zero-point corrected barrier from the reactants in kcal/mol.
+    v_reverse : float
+        The zero-point corrected barrier from the products in kcal/mol.
+    energies : `np.ndarray`
+        The energy grid in kcal/mol, measured from the reactants.
+    probability : `np.ndarray`
+        The transmission probability on the grid.
+    """
+
+    def __init__(self, freq, v_forward, v_reverse, n_points=4001):
+        """
+        Parameters
+        ----------
+        freq : float
+            The magnitude of the (scaled) imaginary frequency in cm^-1.
+        v_forward : float
+            The zero-point corrected barrier from the reactants in kcal/mol.
+        v_reverse : float
+            The zero-point corrected barrier from the products in kcal/mol.
+        n_points : int, optional
+            The number of grid points (made odd for Simpson's rule), by default 4001
+
+        Raises
+        ------
+        ValueError
+            If either barrier isn't positive.
+        """
+        if v_forward <= 0 or v_reverse <= 0:
+            raise ValueError("Eckart tunneling needs positive forward and reverse barriers")
+        self.freq = abs(freq)
+        self.v_forward = v_forward
+        self.v_reverse = v_reverse
+
+        # From the higher of the two asymptotes to well past the top, where P(E) = 1
+        h_nu = self.freq * wavenumber_to_kcal
+        e_min = max(0.0, v_forward - v_reverse)
+        self._e_top = v_forward + 8 * h_nu
+        n_points += 1 - n_points % 2
+        self.energies = np.linspace(e_min, self._e_top, n_points)
+        self.probability = self.transmission(self.energies)
+
+        weights = np.full(n_points, 2.0)
+        weights[1::2] = 4.0
+        weights[[0, -1]] = 1.0
+        weights *= (self._e_top - e_min) / (3 * (n_points - 1))
+        with np.errstate(divide="ignore"):
+            self._log_wp = np.log(weights * self.probability)
+
+    def transmission(self, energies):
+        """Eckart transmission probability.
+
+        See H. S. Johnston and J. Heicklen, J. Phys. Chem. 66, 532 (1962). The cosh terms
+        are scaled by their largest exponent and 1 - P is written as a product of sinh
+        terms, so the probability is accurate from deep tunneling to far above the barrier.
+
+        Parameters
+        ----------
+        energies : float or `np.ndarray`
+            The energy in kcal/mol, measured from the reactants.
+
+        Returns
+        -------
+        float or `np.ndarray`
+            The transmission probability, zero below the higher asymptote.
+        """
+        energies = np.asarray(energies, dtype=float)
+        h_nu = self.freq * wavenumber_to_kcal
+        # The barrier seen from the higher asymptote plays the role of V1
+        e_min = max(0.0, self.v_forward - self.v_reverse)
+        dv1 = min(self.v_forward, self.v_reverse)
+        dv2 = max(self.v_forward, self.v_reverse)
+        alpha1 = 2 * np.pi * dv1 / h_nu
+        alpha2 = 2 * np.pi * dv2 / h_nu
+        norm = 1.0 / np.sqrt(alpha1) + 1.0 / np.sqrt(alpha2)
+
+        xi = np.clip((energies - e_min) / dv1, 0.0, None)
+        a = 2 * np.sqrt(alpha1 * xi) / norm
+        b = 2 * np.sqrt(np.abs((xi - 1.0) * alpha1 + alpha2)) / norm
+        d2 = alpha1 * alpha2 - np.pi ** 2 / 4
+
+        # P = 2 sinh(a) sinh(b) / (cosh(a + b) + cosh(d)), with cosh(d) -> cos(d) if d^2 < 0
+        d = 2 * np.sqrt(abs(d2))
+        m = np.maximum(a + b, d if d2 > 0 else 0.0)
+        if d2 > 0:
+            cosh_d = 0.5 * (np.exp(d - m) + np.exp(-d - m))
+        else:
+            cosh_d = np.cos(d) * np.exp(-m)
+        cosh_ab = 0.5 * (np.exp(a + b - m) + np.exp(-a - b - m))
+        sinh_ab = 0.5 * np.exp(a + b - m) * np.expm1(-2 * a) * np.expm1(-2 * b)
+        prob = sinh_ab / (cosh_ab + cosh_d)
+        return np.where(energies < e_min, 0.0, prob)
+
+    def kappa(self, temp):
+        """Tunneling correction to the TST rate.
+
+        Parameters
+        ----------
+        temp : float or `np.ndarray`
+            The temperature(s) in K.
+
+        Returns
+        -------
+        float or `np.ndarray`
+            kappa(T), with the same shape as `temp`.
+        """
+        temp = np.asarray(temp, dtype=float)
+        beta = 1.0 / (R_kcal * temp[..., np.newaxis])
+        integral = np.sum(
+            np.exp(beta * (self.v_forward - self.energies) + self._log_wp), axis=-1
+        )
+        tail = np.exp(beta[..., 0] * (self.v_forward - self._e_top)) / beta[..., 0]
+        return beta[..., 0] * (integral + tail)
+
+
+@lru_cache(maxsize=1024)
+def eckart_barrier(freq, v_forward, v_reverse, n_points=4001):
+    """Returns a cached `EckartBarrier`, reactions with the same parameters share one grid.
+
+    Parameters
+    ----------
+    freq : float
+        The magnitude of the (scaled) imaginary frequency in cm^-1.
+    v_forward : float
+        The zero-point corrected barrier from the reactants in kcal/mol.
+    v_reverse : float
+        The zero-point corrected barrier from the products in kcal/mol.
+    n_points : int, optional
+        The number of grid points, by default 4001
+
+    Returns
+    -------
+    EckartBarrier
+        The barrier.
+    """
+    return EckartBarrier(freq, v_forward, v_reverse, n_points=n_points)
+
+
+def eckart_correction(temp, freq, scale, v_forward, v_reverse=None):
+    """Eckart tunneling coefficient, the Eckart counterpart of `wigner_correction`.
+
+    Parameters
+    ----------
+    temp : float or `np.ndarray`
+        The temperature(s) in K.
+    freq : float
+        The imaginary frequency of the TS in cm^-1 (the sign is ignored).
+    scale : float
+        Scale of the frequency.
+    v_forward : float
+        The zero-point corrected barrier from the reactants in kcal/mol.
+    v_reverse : float, optional
+        The zero-point corrected barrier from the products in kcal/mol, by default
+        `v_forward` (symmetric barrier)
+
+    Returns
+    -------
+    float or `np.ndarray`
+        kappa(T), with the same shape as `temp`.
+    """
+    if v_reverse is None:
+        v_reverse = v_forward
+    barrier = eckart_barrier(abs(freq) * scale, float(v_forward), float(v_reverse))
+    return barrier.kappa(temp)
@@ -1,4 +1,6 @@
+import numpy as np
 from scipy.constants import calorie, c, N_A, h
+from cantherm.statmech.harmonic_oscillator import mode_energies, zpve_from_energies
 c_in_cm = c*100
 
 def zpve(freqs, scale=0.99):
@@ -18,11 +20,6 @@ def zpve(freqs, scale=0.99):
     float
         The zero point vibrational energy in kcal/mol.
     """
-    energy = 0
-    freqs = freqs.copy()
-    freqs *= scale
-
-    for nu in freqs:
-        energy += 0.5 * h * nu * c_in_cm * N_A / (calorie * 1e3)  # kcal/mol
+    energy = zpve_from_energies(mode_energies(freqs, scale=scale))  # kcal/mol
 
     return energy
@@ -0,0 +1,170 @@
+"""
+Boltzmann weighted thermochemistry of a conformer ensemble
+"""
+from typing import NamedTuple
+
+import numpy as np
+from scipy.constants import calorie, physical_constants
+from scipy.special import logsumexp
+from cclib.parser.utils import convertor
+
+from cantherm import statmech
+from cantherm.statmech.partition_function import log_q_tr, log_q_rot
+
+R_cal = physical_constants["molar gas constant"][0] / (calorie)
+R_kcal = R_cal / 1e3
+
+
+class EnsembleThermo(NamedTuple):
+    """Thermochemistry of a conformer ensemble on a temperature grid.
+
+    Attributes
+    ----------
+    log_q : `np.ndarray`
+        ln Q of the ensemble, referenced to the zero point energy of the lowest conformer,
+        shape (n_T,).
+    g : `np.ndarray`
+        The Gibbs free energy in kcal/mol, electronic energy and ZPVE included, shape (n_T,).
+    h : `np.ndarray`
+        The enthalpy in kcal/mol, electronic energy and ZPVE included, shape (n_T,).
+    s : `np.ndarray`
+        The entropy in cal/(mol K), mixing entropy included, shape (n_T,).
+    s_mix : `np.ndarray`
+        The conformational mixing entropy -R sum(w ln w) in cal/(mol K), shape (n_T,).
+    weights : `np.ndarray`
+        The Boltzmann weights of the kept conformers, shape (n_conformers, n_T).
+    """
+
+    log_q: np.ndarray
+    g: np.ndarray
+    h: np.ndarray
+    s: np.ndarray
+    s_mix: np.ndarray
+    weights: np.ndarray
+
+
+class ConformerEnsemble:
+    """Many conformers (CMol objects) of one species treated as a single species.
+
+    The ensemble partition function is the sum of the conformer partition functions, each
+    referenced to its own zero point energy, so G = -RT ln sum(exp(-G_i / RT)) with a
+    log-sum-exp over the conformers. H is the Boltzmann average of the conformer
+    enthalpies and S = (H - G) / T, which includes the mixing entropy.
+
+    Attributes
+    ----------
+    conformers : list of CMol
+        The conformers kept after the energy window.
+    pruned : list of CMol
+        The conformers above the energy window.
+    sigma : `np.ndarray`
+        The rotational symmetry factor of each kept conformer.
+    """
+
+    def __init__(self, conformers, sigma=1, energy_window=None):
+        """
+        Parameters
+        ----------
+        conformers : iterable of CMol
+            The conformers of the species.
+        sigma : int or iterable of int, optional
+            The rotational symmetry factor, one for all conformers or one per conformer,
+            by default 1
+        energy_window : float, optional
+            Conformers whose electronic energy is more than this above the lowest one are
+            dropped, in kcal/mol, by default None (keep all). Only the energies are read
+            to prune, the frequencies of the dropped conformers are never used.
+
+        Raises
+        ------
+        ValueError
+            If there are no conformers or the symmetry factors don't match them.
+        """
+        conformers = list(conformers)
+        if not conformers:
+            raise ValueError("A conformer ensemble needs at least one conformer")
+        sigma = np.asarray(sigma, dtype=float)
+        if sigma.ndim and sigma.size != len(conformers):
+            raise ValueError("There must be one symmetry factor per conformer")
+        sigma = np.broadcast_to(sigma, (len(conformers),))
+
+        keep = np.ones(len(conformers), dtype=bool)
+        if energy_window is not None:
+            energies = convertor(
+                np.array([cmol.energy for cmol in conformers]), "hartree", "kcal/mol"
+            )
+            keep = energies - energies.min() <= energy_window
+
+        self.conformers = [cmol for cmol, k in zip(conformers, keep) if k]
+        self.pruned = [cmol for cmol, k in zip(conformers, keep) if not k]
+        self.sigma = sigma[keep]
+
+    def __len__(self):
+        return len(self.conformers)
+
+    def conformer_thermo(self, temps, scale=1.0):
+        """Returns ln Q, the zero point energy and H of every kept conformer.
+
+        Parameters
+        ----------
+        temps : float or `np.ndarray`
+            The temperature(s) in K.
+        scale : float, optional
+            Scale of the frequencies, by default 1.0
+
+        Returns
+        -------
+        tuple(`np.ndarray`, `np.ndarray`, `np.ndarray`)
+            ln Q (shape (n_conformers, n_T)), the electronic energy plus ZPVE in kcal/mol
+            (shape (n_conformers,)) and H in kcal/mol (shape (n_conformers, n_T)).
+        """
+        temps = np.atleast_1d(np.asarray(temps, dtype=float))
+        log_q = np.empty((len(self), temps.size))
+        h = np.empty((len(self), temps.size))
+        e0 = np.empty(len(self))
+        h_ext = statmech.h_tr(temps) + statmech.h_rot(temps)
+        for i, (cmol, sigma) in enumerate(zip(self.conformers, self.sigma)):
+            vib = cmol.calc_vib_thermo(temps, scale=scale)
+            e0[i] = convertor(cmol.energy, "hartree", "kcal/mol") + vib.zpve
+            log_q[i] = log_q_tr(cmol.masses, temps)
+            log_q[i] += log_q_rot(sigma, cmol.mom_inertia, temps) + vib.log_q
+            h[i] = h_ext + vib.h + e0[i]
+        return log_q, e0, h
+
+    def calc_thermo(self, temps, scale=1.0):
+        """Evaluates the ensemble Q, G, H and S.
+
+        Parameters
+        ----------
+        temps : float or `np.ndarray`
+            The temperature(s) in K.
+        scale : float, optional
+            Scale of the frequencies, by default 1.0
+
+        Returns
+        -------
+        EnsembleThermo
+            The ensemble thermochemistry and the conformer weights.
+        """
+        temps = np.atleast_1d(np.asarray(temps, dtype=float))
+        log_q, e0, h = self.conformer_thermo(temps, scale=scale)
+        rt = R_kcal * temps
+
+        # ln Q_i relative to the lowest zero point energy, the largest term is factored out
+        e_ref = e0.min()
+        terms = log_q - (e0 - e_ref)[:, np.newaxis] / rt
+        log_q_ens = logsumexp(terms, axis=0)
+        log_w = terms - log_q_ens
+        weights = np.exp(log_w)
+
+        g = e_ref - rt * log_q_ens
+        h_ens = np.sum(weights * h, axis=0)
+        s_mix = -R_cal * np.sum(weights * log_w, axis=0)
+        return EnsembleThermo(
+            log_q=log_q_ens,
+            g=g,
+            h=h_ens,
+            s=(h_ens - g) * 1e3 / temps,
+            s_mix=s_mix,
+            weights=weights,
+        )
@@ -0,0 +1,166 @@
+"""
+Chebyshev lookup tables for fast G(T) and H(T) queries
+"""
+import numpy as np
+from numpy.polynomial import chebyshev
+from cclib.parser.utils import convertor
+
+from cantherm.thermo.nasa import thermo_table
+
+
+class ThermoInterpolant:
+    """Chebyshev interpolant of G(T) and H(T) for a single molecule.
+
+    The statmech functions are sampled once on Chebyshev nodes in [t_min, t_max] and the
+    degree is increased until the interpolant matches the exact values to within `tol`
+    on a dense check grid. That is a measured error, not a bound, the deviation between
+    the check points isn't computed. Queries are then a fixed-degree Chebyshev evaluation, i.e.
+    O(1) in the number of temperatures sampled and independent of the molecule size.
+
+    The object only holds NumPy arrays (no reference to the CMol), so it pickles cheaply
+    and can be shipped to worker processes.
+
+    Attributes
+    ----------
+    t_min : float
+        The lowest valid temperature in K.
+    t_max : float
+        The highest valid temperature in K.
+    degree : int
+        The degree of the Chebyshev series.
+    max_error : float
+        The largest deviation (kcal/mol) from the exact G and H measured on the check grid.
+    """
+
+    def __init__(
+        self,
+        cmol,
+        sigma,
+        t_min=200.0,
+        t_max=3000.0,
+        scale=1.0,
+        tol=1e-6,
+        max_degree=128,
+    ):
+        """Samples the molecule's thermochemistry and builds the interpolant.
+
+        Parameters
+        ----------
+        cmol : CMol
+            The molecule.
+        sigma : int
+            The rotational symmetry factor of the molecule.
+        t_min : float, optional
+            The lowest valid temperature in K, by default 200.0
+        t_max : float, optional
+            The highest valid temperature in K, by default 3000.0
+        scale : float, optional
+            Scale of the frequencies, by default 1.0
+        tol : float, optional
+            The required accuracy of G and H in kcal/mol, by default 1e-6
+        max_degree : int, optional
+            The largest degree tried before giving up, by default 128
+
+        Raises
+        ------
+        ValueError
+            If `tol` can't be reached with `max_degree`.
+        """
+        self.t_min = float(t_min)
+        self.t_max = float(t_max)
+
+        # G and H are both stored relative to the electronic energy + ZPVE so the
+        # fit isn't dominated by a huge constant
+        self._offset = convertor(cmol.energy, "hartree", "kcal/mol") + cmol.calc_ZPVE(
+            scale=scale
+        )
+
+        def exact(temps):
+            _, h, s = thermo_table(cmol, temps, sigma, scale=scale)
+            g = h - temps * s / 1e3
+            return np.stack([g, h]) - self._offset
+
+        t_check = np.linspace(self.t_min, self.t_max, 4 * max_degree + 1)
+        exact_check = exact(t_check)
+
+        degree = 8
+        while True:
+            nodes = chebyshev.chebpts1(degree + 1)
+            coeffs = chebyshev.chebfit(nodes, exact(self._to_temp(nodes)).T, degree)
+            error = np.abs(
+                chebyshev.chebval(self._to_x(t_check), coeffs) - exact_check
+            ).max()
+            if error <= tol:
+                break
+            if degree >= max_degree:
+                raise ValueError(
+                    f"ThermoInterpolant couldn't reach tol={tol} (error={error}) with degree {max_degree}"
+                )
+            degree = min(2 * degree, max_degree)
+
+        self.degree = degree
+        self.max_error = float(error)
+        self._coeffs_g = coeffs[:, 0].copy()
+        self._coeffs_h = coeffs[:, 1].copy()
+
+    def _to_x(self, temp):
+        return (2.0 * temp - (self.t_max + self.t_min)) / (self.t_max - self.t_min)
+
+    def _to_temp(self, x):
+        return 0.5 * (x * (self.t_max - self.t_min) + self.t_max + self.t_min)
+
+    def _check_range(self, temp):
+        if np.any(temp < self.t_min) or np.any(temp > self.t_max):
+            raise ValueError(
+                f"Temperatures must be in [{self.t_min}, {self.t_max}] K for this interpolant"
+            )
+
+    def free_energy(self, temp):
+        """Interpolated Gibbs free energy (same as `CMol.calc_free_energy`).
+
+        Parameters
+        ----------
+        temp : float or `np.ndarray`
+            The temperature(s) in K.
+
+        Returns
+        -------
+        float or `np.ndarray`
+            G in kcal/mol, with the same shape as `temp`.
+        """
+        temp = np.asarray(temp, dtype=float)
+        self._check_range(temp)
+        return chebyshev.chebval(self._to_x(temp), self._coeffs_g) + self._offset
+
+    def enthalpy(self, temp):
+        """Interpolated enthalpy (same as `CMol.calc_enthalpy`).
+
+        Parameters
+        ----------
+        temp : float or `np.ndarray`
+            The temperature(s) in K.
+
+        Returns
+        -------
+        float or `np.ndarray`
+            H in kcal/mol, with the same shape as `temp`.
+        """
+        temp = np.asarray(temp, dtype=float)
+        self._check_range(temp)
+        return chebyshev.chebval(self._to_x(temp), self._coeffs_h) + self._offset
+
+    def entropy(self, temp):
+        """Entropy from the interpolated G and H.
+
+        Parameters
+        ----------
+        temp : float or `np.ndarray`
+            The temperature(s) in K.
+
+        Returns
+        -------
+        float or `np.ndarray`
+            S in kcal/(mol K), with the same shape as `temp`.
+        """
+        temp = np.asarray(temp, dtype=float)
+        return (self.enthalpy(temp) - self.free_energy(temp)) / temp
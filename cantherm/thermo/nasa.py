@@ -0,0 +1,421 @@
+"""
+NASA 7-coefficient polynomial fitting and export for CMol thermochemistry
+"""
+import os
+from typing import NamedTuple
+
+import numpy as np
+from scipy.constants import calorie, physical_constants
+from scipy.linalg import null_space
+from cclib.parser.utils import PeriodicTable, convertor
+
+from cantherm import statmech
+
+R_cal = physical_constants["molar gas constant"][0] / (calorie)
+R_kcal = R_cal / 1e3
+
+
+def _cp_basis(temp):
+    # Cp / R
+    one, zero = np.ones_like(temp), np.zeros_like(temp)
+    return np.stack([one, temp, temp ** 2, temp ** 3, temp ** 4, zero, zero], axis=-1)
+
+
+def _dcp_basis(temp):
+    # d(Cp / R) / dT
+    zero = np.zeros_like(temp)
+    return np.stack(
+        [zero, np.ones_like(temp), 2 * temp, 3 * temp ** 2, 4 * temp ** 3, zero, zero],
+        axis=-1,
+    )
+
+
+def _h_basis(temp):
+    # H / RT
+    return np.stack(
+        [
+            np.ones_like(temp),
+            temp / 2,
+            temp ** 2 / 3,
+            temp ** 3 / 4,
+            temp ** 4 / 5,
+            1.0 / temp,
+            np.zeros_like(temp),
+        ],
+        axis=-1,
+    )
+
+
+def _s_basis(temp):
+    # S / R
+    return np.stack(
+        [
+            np.log(temp),
+            temp,
+            temp ** 2 / 2,
+            temp ** 3 / 3,
+            temp ** 4 / 4,
+            np.zeros_like(temp),
+            np.ones_like(temp),
+        ],
+        axis=-1,
+    )
+
+
+class NASAPolynomial(NamedTuple):
+    """Two-range NASA 7-coefficient polynomial for a single species.
+
+    Attributes
+    ----------
+    name : str
+        The species name used in the exported thermo blocks.
+    composition : dict
+        Element symbol -> number of atoms.
+    t_low : float
+        The lowest valid temperature in K.
+    t_mid : float
+        The temperature in K where the two ranges meet.
+    t_high : float
+        The highest valid temperature in K.
+    coeffs_low : `np.ndarray`
+        The 7 coefficients for [t_low, t_mid].
+    coeffs_high : `np.ndarray`
+        The 7 coefficients for [t_mid, t_high].
+    h298 : float
+        The enthalpy at 298.15 K in kcal/mol (e.g. of formation) the fit was referenced
+        to. None when the polynomial holds the absolute enthalpy (E + ZPVE + thermal),
+        which can't be exported.
+    """
+
+    name: str
+    composition: dict
+    t_low: float
+    t_mid: float
+    t_high: float
+    coeffs_low: np.ndarray
+    coeffs_high: np.ndarray
+    h298: float = None
+
+    def _check_reference(self):
+        if self.h298 is None:
+            raise ValueError(
+                f"{self.name} has no enthalpy reference, fit it with h298 before exporting"
+            )
+
+    def _eval(self, basis, temp):
+        temp = np.asarray(temp, dtype=float)
+        coeffs = np.where(
+            (temp < self.t_mid)[..., np.newaxis], self.coeffs_low, self.coeffs_high
+        )
+        return np.sum(basis(temp) * coeffs, axis=-1)
+
+    def cp(self, temp):
+        """Heat capacity at constant pressure in cal/(mol K)."""
+        return R_cal * self._eval(_cp_basis, temp)
+
+    def h(self, temp):
+        """Enthalpy in kcal/mol."""
+        return R_kcal * np.asarray(temp, dtype=float) * self._eval(_h_basis, temp)
+
+    def s(self, temp):
+        """Entropy in cal/(mol K)."""
+        return R_cal * self._eval(_s_basis, temp)
+
+    def g(self, temp):
+        """Gibbs free energy in kcal/mol."""
+        return self.h(temp) - np.asarray(temp, dtype=float) * self.s(temp) / 1e3
+
+    def to_chemkin(self) -> str:
+        """Formats the polynomial as a fixed column CHEMKIN thermo block.
+
+        Returns
+        -------
+        str
+            The four 80 column lines of the thermo entry.
+
+        Raises
+        ------
+        ValueError
+            If the species has more than 4 elements (the limit of the fixed format) or
+            no enthalpy reference (`h298`).
+        """
+        self._check_reference()
+        if len(self.composition) > 4:
+            raise ValueError(
+                f"CHEMKIN thermo blocks support at most 4 elements, {self.name} has {len(self.composition)}"
+            )
+        elements = "".join(f"{el:<2}{n:>3d}" for el, n in self.composition.items())
+        hi, lo = self.coeffs_high, self.coeffs_low
+
+        def fmt(coeffs):
+            return "".join(f"{a:15.8E}" for a in coeffs)
+
+        lines = [
+            f"{self.name:<18.18}{'':6}{elements:<20}G{self.t_low:10.3f}{self.t_high:10.3f}{self.t_mid:8.2f}{'':6}1",
+            f"{fmt(hi[:5]):<79}2",
+            f"{fmt(np.concatenate([hi[5:], lo[:3]])):<79}3",
+            f"{fmt(lo[3:]):<79}4",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def to_cantera(self) -> str:
+        """Formats the polynomial as a Cantera YAML species entry.
+
+        Returns
+        -------
+        str
+            The species entry (as an item of a YAML `species` list).
+
+        Raises
+        ------
+        ValueError
+            If the species has no enthalpy reference (`h298`).
+        """
+        self._check_reference()
+        composition = ", ".join(f"{el}: {n}" for el, n in self.composition.items())
+
+        def fmt(coeffs):
+            return "[" + ", ".join(f"{a:.8e}" for a in coeffs) + "]"
+
+        lines = [
+            f"- name: {self.name}",
+            f"  composition: {{{composition}}}",
+            "  thermo:",
+            "    model: NASA7",
+            f"    temperature-ranges: [{self.t_low}, {self.t_mid}, {self.t_high}]",
+            "    data:",
+            f"    - {fmt(self.coeffs_low)}",
+            f"    - {fmt(self.coeffs_high)}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+def fit_nasa_tables(temps, cp, h, s, t_mid=1000.0):
+    """Constrained two-range least-squares fit of tabulated thermo to NASA polynomials.
+
+    Cp/R, H/RT and S/R are fit simultaneously in each range with Cp, dCp/dT, H and S
+    forced to be continuous at `t_mid`. The design matrix only depends on the temperature
+    grid, so every species is fit in one batched least-squares solve.
+
+    Parameters
+    ----------
+    temps : `np.ndarray`
+        The temperature grid in K, shape (n_temps,).
+    cp : `np.ndarray`
+        Heat capacities in cal/(mol K), shape (n_species, n_temps) or (n_temps,).
+    h : `np.ndarray`
+        Enthalpies in kcal/mol, same shape as `cp`.
+    s : `np.ndarray`
+        Entropies in cal/(mol K), same shape as `cp`.
+    t_mid : float, optional
+        The temperature where the ranges meet in K, by default 1000.0
+
+    Returns
+    -------
+    tuple(`np.ndarray`, `np.ndarray`)
+        The low and high range coefficients, each with shape (n_species, 7) (or (7,) for
+        a single species).
+    """
+    temps = np.asarray(temps, dtype=float)
+    cp, h, s = (np.asarray(arr, dtype=float) for arr in (cp, h, s))
+    single = cp.ndim == 1
+    cp, h, s = (np.atleast_2d(arr) for arr in (cp, h, s))
+
+    lo, hi = temps <= t_mid, temps >= t_mid
+    design, targets = [], []
+    for basis, values in [(_cp_basis, cp / R_cal), (_h_basis, h / (R_kcal * temps)), (_s_basis, s / R_cal)]:
+        for mask, block in [(lo, 0), (hi, 1)]:
+            rows = np.zeros((mask.sum(), 14))
+            rows[:, 7 * block : 7 * (block + 1)] = basis(temps[mask])
+            design.append(rows)
+            targets.append(values[:, mask].T)
+    design = np.vstack(design)
+    targets = np.vstack(targets)  # (rows, n_species)
+
+    # Continuity constraints C x = 0 at t_mid, solved in the null space of C
+    t_c = np.array([t_mid])
+    constraints = np.vstack(
+        [
+            np.hstack([basis(t_c), -basis(t_c)])
+            for basis in (_cp_basis, _dcp_basis, _h_basis, _s_basis)
+        ]
+    )
+    col_scale = np.linalg.norm(design, axis=0)
+    null = null_space(constraints / col_scale)
+    z = np.linalg.lstsq(design / col_scale @ null, targets, rcond=None)[0]
+    coeffs = (null @ z).T / col_scale  # (n_species, 14)
+
+    coeffs_low, coeffs_high = coeffs[:, :7], coeffs[:, 7:]
+    if single:
+        return coeffs_low[0], coeffs_high[0]
+    return coeffs_low, coeffs_high
+
+
+def _composition(cmol):
+    table = PeriodicTable()
+    composition = {}
+    for num in cmol.data.atomnos:
+        el = table.element[num]
+        composition[el] = composition.get(el, 0) + 1
+    return composition
+
+
+def thermo_table(cmol, temps, sigma, scale=1.0):
+    """Evaluates Cp, H and S for a molecule on a temperature grid with one vibrational kernel call.
+
+    Parameters
+    ----------
+    cmol : CMol
+        The molecule.
+    temps : `np.ndarray`
+        The temperature grid in K.
+    sigma : int
+        The rotational symmetry factor of the molecule.
+    scale : float, optional
+        Scale of the frequencies, by default 1.0
+
+    Returns
+    -------
+    tuple(`np.ndarray`, `np.ndarray`, `np.ndarray`)
+        Cp in cal/(mol K), H in kcal/mol (including the electronic energy and ZPVE),
+        and S in cal/(mol K).
+    """
+    temps = np.asarray(temps, dtype=float)
+    vib = cmol.calc_vib_thermo(temps, scale=scale)
+
+    cp = statmech.cp_tr(temps) + statmech.cp_rot(temps) + vib.cp
+    h = statmech.h_tr(temps) + statmech.h_rot(temps) + vib.h + vib.zpve
+    h += convertor(cmol.energy, "hartree", "kcal/mol")
+    s = statmech.s_tr(cmol.masses, temps) + statmech.s_rot(sigma, cmol.mom_inertia, temps)
+    s += vib.s
+    return cp, h, s
+
+
+def fit_nasa(
+    cmols,
+    sigmas,
+    names=None,
+    t_low=200.0,
+    t_mid=1000.0,
+    t_high=3000.0,
+    scale=1.0,
+    h298=None,
+    n_points=100,
+):
+    """Fits NASA 7-coefficient polynomials to the thermochemistry of a batch of molecules.
+
+    Parameters
+    ----------
+    cmols : list of CMol
+        The molecules to fit.
+    sigmas : list of int
+        The rotational symmetry factor of each molecule.
+    names : list of str, optional
+        Species names, by default the file names of the molecules.
+    t_low : float, optional
+        The lowest fitted temperature in K, by default 200.0
+    t_mid : float, optional
+        The temperature where the ranges meet in K, by default 1000.0
+    t_high : float, optional
+        The highest fitted temperature in K, by default 3000.0
+    scale : float, optional
+        Scale of the frequencies, by default 1.0
+    h298 : list of float, optional
+        Enthalpies (e.g. of formation) at 298.15 K in kcal/mol. If given, each H(T) is
+        shifted to match it, otherwise the absolute enthalpy (E + ZPVE + thermal) is fit.
+        Only referenced polynomials can be written with `write_chemkin` or
+        `write_cantera`, combustion and kinetics codes can't use absolute enthalpies.
+    n_points : int, optional
+        The number of temperatures sampled in each range, by default 100
+
+    Returns
+    -------
+    list of NASAPolynomial
+        One polynomial per molecule.
+    """
+    if names is None:
+        names = [os.path.splitext(os.path.basename(m.file_path))[0] for m in cmols]
+    temps = np.unique(
+        np.concatenate(
+            [np.linspace(t_low, t_mid, n_points), np.linspace(t_mid, t_high, n_points)]
+        )
+    )
+
+    # 298.15 K rides along in the same table for the reference, it's only fit if it's
+    # one of the grid points
+    table_temps = np.union1d(temps, [298.15])
+    fit = np.isin(table_temps, temps)
+    tables = [thermo_table(m, table_temps, sig, scale=scale) for m, sig in zip(cmols, sigmas)]
+    cp, h, s = (np.array(arr) for arr in zip(*tables))
+    if h298 is not None:
+        h_ref = h[:, np.searchsorted(table_temps, 298.15)]
+        h += (np.asarray(h298, dtype=float) - h_ref)[:, np.newaxis]
+
+    coeffs_low, coeffs_high = fit_nasa_tables(
+        temps, cp[:, fit], h[:, fit], s[:, fit], t_mid=t_mid
+    )
+    refs = [None] * len(cmols) if h298 is None else [float(ref) for ref in h298]
+    return [
+        NASAPolynomial(name, _composition(m), t_low, t_mid, t_high, lo, hi, ref)
+        for name, m, lo, hi, ref in zip(names, cmols, coeffs_low, coeffs_high, refs)
+    ]
+
+
+def write_chemkin(polynomials, path=None) -> str:
+    """Writes a CHEMKIN THERMO section.
+
+    Parameters
+    ----------
+    polynomials : list of NASAPolynomial
+        The species to write.
+    path : str, optional
+        If given, the section is also written to this file, by default None
+
+    Returns
+    -------
+    str
+        The THERMO section.
+
+    Raises
+    ------
+    ValueError
+        If a species has no enthalpy reference, see `fit_nasa`.
+    """
+    t_low = min(p.t_low for p in polynomials)
+    t_mid = polynomials[0].t_mid
+    t_high = max(p.t_high for p in polynomials)
+    text = "THERMO ALL\n"
+    text += f"{t_low:10.3f}{t_mid:10.3f}{t_high:10.3f}\n"
+    text += "".join(p.to_chemkin() for p in polynomials)
+    text += "END\n"
+    if path is not None:
+        with open(path, "w") as f:
+            f.write(text)
+    return text
+
+
+def write_cantera(polynomials, path=None) -> str:
+    """Writes the species as a Cantera YAML `species` list.
+
+    Parameters
+    ----------
+    polynomials : list of NASAPolynomial
+        The species to write.
+    path : str, optional
+        If given, the YAML is also written to this file, by default None
+
+    Returns
+    -------
+    str
+        The YAML text.
+
+    Raises
+    ------
+    ValueError
+        If a species has no enthalpy reference, see `fit_nasa`.
+    """
+    text = "species:\n" + "".join(p.to_cantera() for p in polynomials)
+    if path is not None:
+        with open(path, "w") as f:
+            f.write(text)
+    return text
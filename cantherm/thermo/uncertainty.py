@@ -0,0 +1,358 @@
+"""
+Monte Carlo propagation of statmech input uncertainties to G(T) and k(T)
+"""
+from contextlib import ExitStack
+from typing import NamedTuple
+
+import numpy as np
+from scipy.constants import calorie, physical_constants
+from cclib.parser.utils import convertor
+
+from cantherm.statmech import backend
+from cantherm.statmech.harmonic_oscillator import mode_energies, zpve_from_energies
+from cantherm.statmech.kinetics import log_tst_rate
+from cantherm.statmech.partition_function import log_q_tr, log_q_rot
+from cantherm.statmech.tunneling import wigner_correction
+from cantherm.utils import spawn_pool
+
+R_kcal = physical_constants["molar gas constant"][0] / (calorie * 1e3)
+
+# Largest size in bytes of the (samples, modes, temperatures) work arrays of one chunk
+DEFAULT_MAX_MEMORY = 2 ** 27
+
+
+class Perturbations(NamedTuple):
+    """One set of statmech inputs per Monte Carlo sample.
+
+    Attributes
+    ----------
+    scale : `np.ndarray`
+        The frequency scale factors, shape (n_samples,).
+    energy : `np.ndarray`
+        The shifts of the electronic energy (or the barrier) in kcal/mol, shape (n_samples,).
+    sigma : `np.ndarray`
+        The rotational symmetry numbers, shape (n_samples,).
+    """
+
+    scale: np.ndarray
+    energy: np.ndarray
+    sigma: np.ndarray
+
+
+class UncertaintyResult(NamedTuple):
+    """Monte Carlo samples of a temperature dependent quantity and their statistics.
+
+    Attributes
+    ----------
+    samples : `np.ndarray`
+        The sampled values, shape (n_samples, n_T).
+    mean : `np.ndarray`
+        The sample mean, shape (n_T,).
+    std : `np.ndarray`
+        The sample standard deviation, shape (n_T,).
+    lower : `np.ndarray`
+        The lower bound of the central confidence interval, shape (n_T,).
+    upper : `np.ndarray`
+        The upper bound of the central confidence interval, shape (n_T,).
+    """
+
+    samples: np.ndarray
+    mean: np.ndarray
+    std: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+
+
+def sample_perturbations(
+    n_samples, scale=0.99, scale_std=0.0, energy_std=0.0, sigma=1, seed=None
+):
+    """Draws the perturbed inputs of a Monte Carlo run.
+
+    The scale factors and energy shifts are normally distributed, the symmetry numbers
+    are drawn uniformly from the candidates.
+
+    Parameters
+    ----------
+    n_samples : int
+        The number of samples.
+    scale : float, optional
+        The mean frequency scale factor, by default 0.99
+    scale_std : float, optional
+        The standard deviation of the scale factor, by default 0.0
+    energy_std : float, optional
+        The standard deviation of the energy shift in kcal/mol, by default 0.0
+    sigma : int or list of int, optional
+        The rotational symmetry number or the candidate symmetry numbers, by default 1
+    seed : int or `np.random.Generator`, optional
+        The seed of the random number generator, by default None
+
+    Returns
+    -------
+    Perturbations
+        The sampled inputs.
+    """
+    rng = np.random.default_rng(seed)
+    return Perturbations(
+        scale=rng.normal(scale, scale_std, n_samples),
+        energy=rng.normal(0.0, energy_std, n_samples),
+        sigma=rng.choice(np.atleast_1d(sigma), n_samples),
+    )
+
+
+def summarize(samples, ci=0.95):
+    """Statistics of Monte Carlo samples.
+
+    Parameters
+    ----------
+    samples : `np.ndarray`
+        The sampled values, shape (n_samples, n_T).
+    ci : float, optional
+        The coverage of the central confidence interval, by default 0.95
+
+    Returns
+    -------
+    UncertaintyResult
+        The samples with their mean, standard deviation and confidence interval.
+    """
+    lower, upper = np.quantile(samples, [(1 - ci) / 2, (1 + ci) / 2], axis=0)
+    return UncertaintyResult(
+        samples=samples,
+        mean=samples.mean(axis=0),
+        std=samples.std(axis=0, ddof=1) if len(samples) > 1 else np.zeros(samples.shape[1:]),
+        lower=lower,
+        upper=upper,
+    )
+
+
+class _SpeciesData(NamedTuple):
+    # Everything about a species that doesn't depend on the sampled inputs
+    energies: np.ndarray  # harmonic mode energies in J, unscaled
+    log_q_fixed: np.ndarray  # ln Q_tr + ln Q_rot (sigma = 1) + hindered rotors, (n_T,)
+    e_fixed: float  # electronic energy + hindered rotor ZPVE in kcal/mol
+
+
+def _species_data(cmol, temps):
+    log_q = log_q_tr(cmol.masses, temps) + log_q_rot(1, cmol.mom_inertia, temps)
+    energy = convertor(cmol.energy, "hartree", "kcal/mol")
+    for rotor, _ in cmol.hindered_rotors:
+        log_q = log_q + rotor.thermo(temps).log_q
+        energy += rotor.zpve
+    energies = mode_energies(cmol.harmonic_freqs(), scale=1.0)
+    return _SpeciesData(energies, log_q, energy)
+
+
+def _evaluate_chunk(data, temps, scale, sigma):
+    # ln Q (chunk, n_T) and E0 (chunk,) for a chunk of samples. Every sample is one
+    # segment of the segmented kernel, holding the mode energies at its scale factor.
+    n_modes = data.energies.size
+    energies = (scale[:, np.newaxis] * data.energies).ravel()
+    offsets = np.arange(scale.size + 1) * n_modes
+    log_q_vib = backend.ho_sums_segmented(energies, offsets, temps)[0]
+    zpve = scale * zpve_from_energies(data.energies)
+    log_q = data.log_q_fixed + log_q_vib - np.log(sigma)[:, np.newaxis]
+    return log_q, data.e_fixed + zpve
+
+
+def _evaluate_worker(data, temps, scale, sigma):
+    return _evaluate_chunk(data, temps, scale, sigma)
+
+
+def _pool(processes, stack):
+    # One pool per public call, shared by every species it evaluates
+    if processes <= 1:
+        return None
+    return stack.enter_context(spawn_pool(processes))
+
+
+def _evaluate(data, temps, scale, sigma, max_memory, pool):
+    # Splits the samples into chunks that fit in max_memory, optionally over a process pool
+    per_sample = 6 * 8 * max(data.energies.size, 1) * temps.size
+    chunk = max(1, int(max_memory // per_sample))
+    bounds = range(0, scale.size, chunk)
+    args = [(data, temps, scale[i:i + chunk], sigma[i:i + chunk]) for i in bounds]
+
+    if pool is not None and len(args) > 1:
+        results = pool.starmap(_evaluate_worker, args)
+    else:
+        results = [_evaluate_chunk(*arg) for arg in args]
+
+    log_q = np.concatenate([r[0] for r in results])
+    e0 = np.concatenate([r[1] for r in results])
+    return log_q, e0
+
+
+def free_energy_samples(
+    cmol, temps, perturbations, max_memory=DEFAULT_MAX_MEMORY, processes=1
+):
+    """Gibbs free energies of a species for every Monte Carlo sample.
+
+    Each sample is what `CMol.calc_free_energy` returns with the sample's scale factor
+    and symmetry number and the electronic energy shifted by the sample's energy.
+
+    Parameters
+    ----------
+    cmol : CMol
+        The molecule.
+    temps : iterable (list or `np.ndarray`)
+        The temperatures in K.
+    perturbations : Perturbations
+        The sampled inputs, see `sample_perturbations`.
+    max_memory : int, optional
+        The largest size in bytes of the work arrays of one chunk of samples, by default
+        `DEFAULT_MAX_MEMORY`
+    processes : int, optional
+        The number of worker processes that evaluate the chunks, by default 1 (serial)
+
+    Returns
+    -------
+    `np.ndarray`
+        G in kcal/mol, shape (n_samples, n_T).
+    """
+    temps = np.atleast_1d(np.asarray(temps, dtype=float))
+    with ExitStack() as stack:
+        log_q, e0 = _evaluate(
+            _species_data(cmol, temps),
+            temps,
+            np.asarray(perturbations.scale, dtype=float),
+            np.asarray(perturbations.sigma, dtype=float),
+            max_memory,
+            _pool(processes, stack),
+        )
+    return (e0 + perturbations.energy)[:, np.newaxis] - R_kcal * temps * log_q
+
+
+def free_energy_uncertainty(
+    cmol,
+    temps,
+    n_samples=10000,
+    scale=0.99,
+    scale_std=0.01,
+    energy_std=0.0,
+    sigma=1,
+    seed=None,
+    ci=0.95,
+    max_memory=DEFAULT_MAX_MEMORY,
+    processes=1,
+):
+    """Monte Carlo uncertainty of the Gibbs free energy of a species.
+
+    Parameters
+    ----------
+    cmol : CMol
+        The molecule.
+    temps : iterable (list or `np.ndarray`)
+        The temperatures in K.
+    n_samples : int, optional
+        The number of samples, by default 10000
+    scale : float, optional
+        The mean frequency scale factor, by default 0.99
+    scale_std : float, optional
+        The standard deviation of the scale factor, by default 0.01
+    energy_std : float, optional
+        The standard deviation of the electronic energy in kcal/mol, by default 0.0
+    sigma : int or list of int, optional
+        The rotational symmetry number or the candidate symmetry numbers, by default 1
+    seed : int, optional
+        The seed of the random number generator, by default None
+    ci : float, optional
+        The coverage of the confidence interval, by default 0.95
+    max_memory : int, optional
+        The largest size in bytes of the work arrays of one chunk of samples, by default
+        `DEFAULT_MAX_MEMORY`
+    processes : int, optional
+        The number of worker processes, by default 1 (serial). The samples are drawn
+        before they are split up, so the result doesn't depend on it.
+
+    Returns
+    -------
+    UncertaintyResult
+        G in kcal/mol.
+    """
+    perturbations = sample_perturbations(
+        n_samples, scale=scale, scale_std=scale_std, energy_std=energy_std,
+        sigma=sigma, seed=seed,
+    )
+    samples = free_energy_samples(
+        cmol, temps, perturbations, max_memory=max_memory, processes=processes
+    )
+    return summarize(samples, ci=ci)
+
+
+def rate_uncertainty(
+    reaction,
+    n_samples=10000,
+    scale_std=0.01,
+    barrier_std=0.0,
+    ts_sigma=None,
+    seed=None,
+    ci=0.95,
+    max_memory=DEFAULT_MAX_MEMORY,
+    processes=1,
+):
+    """Monte Carlo uncertainty of the TST rate constants of a reaction.
+
+    Every sample uses one scale factor for all species (it is a property of the level
+    of theory), shifts the barrier and can draw the symmetry number of the TS. Wigner
+    tunneling follows the sampled scale factor, an Eckart correction is taken at the
+    nominal inputs of `reaction` because every barrier height would need its own grid.
+
+    Parameters
+    ----------
+    reaction : Reaction
+        The reaction, its `scale` is the mean scale factor.
+    n_samples : int, optional
+        The number of samples, by default 10000
+    scale_std : float, optional
+        The standard deviation of the scale factor, by default 0.01
+    barrier_std : float, optional
+        The standard deviation of the barrier in kcal/mol, by default 0.0
+    ts_sigma : int or list of int, optional
+        The candidate symmetry numbers of the TS, by default `reaction.ts_sigma`
+    seed : int, optional
+        The seed of the random number generator, by default None
+    ci : float, optional
+        The coverage of the confidence interval, by default 0.95
+    max_memory : int, optional
+        The largest size in bytes of the work arrays of one chunk of samples, by default
+        `DEFAULT_MAX_MEMORY`
+    processes : int, optional
+        The number of worker processes, by default 1 (serial). One pool evaluates
+        the reactants and the TS.
+
+    Returns
+    -------
+    UncertaintyResult
+        k in the units of `reaction.rates`.
+    """
+    temps = np.atleast_1d(np.asarray(reaction.temp, dtype=float))
+    perturbations = sample_perturbations(
+        n_samples, scale=reaction.scale, scale_std=scale_std, energy_std=barrier_std,
+        sigma=reaction.ts_sigma if ts_sigma is None else ts_sigma, seed=seed,
+    )
+    scale = np.asarray(perturbations.scale, dtype=float)
+
+    reactants, sigmas = reaction._reactant_list()
+    log_q_react, e_react = 0.0, 0.0
+    with ExitStack() as stack:
+        pool = _pool(processes, stack)
+        for mol, sigma in zip(reactants, sigmas):
+            log_q, e0 = _evaluate(
+                _species_data(mol, temps), temps, scale, np.full(n_samples, float(sigma)),
+                max_memory, pool,
+            )
+            log_q_react = log_q_react + log_q
+            e_react = e_react + e0
+        log_q_ts, e_ts = _evaluate(
+            _species_data(reaction.ts, temps), temps, scale,
+            np.asarray(perturbations.sigma, dtype=float), max_memory, pool,
+        )
+
+    barrier = e_ts + perturbations.energy - e_react
+    log_k = log_tst_rate(
+        temps, log_q_ts, log_q_react, barrier[:, np.newaxis], molecularity=len(reactants)
+    )
+    if reaction.tunneling == "Wigner":
+        kappa = wigner_correction(temps, reaction.ts.imag_freq, scale[:, np.newaxis])
+    else:
+        kappa = reaction.calc_tunneling(temps)
+    return summarize(np.exp(log_k) * kappa, ci=ci)
@@ -0,0 +1,49 @@
+"""
+Helpers shared across the package
+"""
+import multiprocessing
+
+from cantherm.statmech import backend
+
+
+def _init_worker(backend_name, initializer, initargs):
+    # The backend choice is module state, which a spawned interpreter doesn't inherit
+    backend.set_backend(backend_name)
+    if initializer is not None:
+        initializer(*initargs)
+
+
+def spawn_pool(processes, initializer=None, initargs=(), maxtasksperchild=None):
+    """Creates a process pool whose workers are started with the "spawn" method.
+
+    Every pool in cantherm goes through here. A forked worker inherits the locks of the
+    parent's BLAS and Numba thread pools but not the threads holding them, so forking
+    once those pools are running can deadlock. Spawned workers start from a fresh
+    interpreter instead (and load the compiled Numba kernels from the on-disk cache).
+    The functions and arguments sent to the workers must therefore be picklable. The
+    workers use the kernel backend selected in the parent (`backend.set_backend`).
+
+    Parameters
+    ----------
+    processes : int
+        The number of worker processes.
+    initializer : callable, optional
+        Called with `initargs` in each worker when it starts, by default None
+    initargs : tuple, optional
+        The arguments of `initializer`, by default ()
+    maxtasksperchild : int, optional
+        The number of tasks a worker runs before it's replaced with a fresh process,
+        by default None (workers live as long as the pool)
+
+    Returns
+    -------
+    multiprocessing.pool.Pool
+        The pool, to be used as a context manager.
+    """
+    context = multiprocessing.get_context("spawn")
+    return context.Pool(
+        processes,
+        initializer=_init_worker,
+        initargs=(backend.get_backend(), initializer, initargs),
+        maxtasksperchild=maxtasksperchild,
+    )
@@ -0,0 +1,59 @@
+import numpy as np
+
+from cantherm.chemistry.arrhenius import R_kcal, fit_arrhenius, fit_reactions
+
+npt = np.testing
+
+temps = np.linspace(300.0, 2000.0, 20)
+
+
+def modified_arrhenius(A, n, Ea, temps):
+    return A[:, None] * temps ** n[:, None] * np.exp(-Ea[:, None] / (R_kcal * temps))
+
+
+def test_exact_recovery():
+    rng = np.random.default_rng(0)
+    A = 10 ** rng.uniform(5, 14, 10000)
+    n = rng.uniform(-2, 3, 10000)
+    Ea = rng.uniform(0, 60, 10000)
+    rates = modified_arrhenius(A, n, Ea, temps)
+
+    fit = fit_arrhenius(temps, rates)
+
+    npt.assert_allclose(fit.A, A, rtol=1e-6)
+    npt.assert_allclose(fit.n, n, atol=1e-8)
+    npt.assert_allclose(fit.Ea, Ea, atol=1e-6)
+    assert np.all(fit.max_rel_error < 1e-8)
+    npt.assert_allclose(fit.rate(temps), rates, rtol=1e-8)
+
+
+def test_refinement():
+    # Noisy rates: the refinement trades log error for relative error
+    rng = np.random.default_rng(1)
+    A, n, Ea = np.full(50, 1e12), np.full(50, 0.5), np.full(50, 25.0)
+    rates = modified_arrhenius(A, n, Ea, temps) * np.exp(rng.normal(0, 0.05, (50, 20)))
+
+    fit = fit_arrhenius(temps, rates)
+    refined = fit_arrhenius(temps, rates, refine=True)
+    rel = lambda f: np.sum((f.rate(temps) / rates - 1) ** 2, axis=-1)
+    assert np.all(rel(refined) <= rel(fit) + 1e-12)
+    assert np.all(refined.rms_log_error >= fit.rms_log_error - 1e-12)
+    assert fit.std_errors.shape == (50, 3) and np.all(fit.std_errors > 0)
+
+
+class FakeReaction:
+    def __init__(self, temp, rates):
+        self.temp = temp
+        self.rates = rates
+
+
+def test_fit_reactions():
+    A, n, Ea = np.array([1e10, 1e13, 1e8]), np.array([0.0, 1.0, 2.5]), np.array([10.0, 40.0, 5.0])
+    reactions = [
+        FakeReaction(list(temps), list(modified_arrhenius(A[:1], n[:1], Ea[:1], temps)[0])),
+        FakeReaction(temps[::2], modified_arrhenius(A[1:2], n[1:2], Ea[1:2], temps[::2])[0]),
+        FakeReaction(temps, modified_arrhenius(A[2:], n[2:], Ea[2:], temps)[0]),
+    ]
+    fit = fit_reactions(reactions)
+    npt.assert_allclose(fit.A, A, rtol=1e-6)
+    npt.assert_allclose(fit.Ea, Ea, atol=1e-6)
@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+from cantherm import get_sample_file_path
+from cantherm.chemistry.molecule import CMol
+from cantherm.chemistry.collection import CMolCollection
+from cantherm.io.batch import load_batch
+
+npt = np.testing
+
+data_files = ["bz.log", "BF3_uccsd_t.log", "oh_freq.log", "BF3_freq_orca.out", "phosphonyl.log"]
+
+
+@pytest.fixture(scope="module")
+def cmols():
+    return [CMol(get_sample_file_path(f)) for f in data_files]
+
+
+@pytest.fixture(scope="module")
+def collection(cmols):
+    return CMolCollection.from_cmols(cmols, names=data_files)
+
+
+def test_from_cmols(cmols, collection):
+    assert len(collection) == len(cmols)
+    npt.assert_array_equal(collection.n_atoms, [len(c.masses) for c in cmols])
+    for name, cmol in zip(data_files, cmols):
+        entry = collection[name]
+        assert entry.energy == cmol.energy
+        assert entry.method == cmol.method
+        npt.assert_array_equal(entry.masses, cmol.masses)
+        npt.assert_array_equal(entry.mom_inertia, cmol.mom_inertia)
+        npt.assert_allclose(collection.total_mass[collection.index(name)], cmol.masses.sum())
+
+    # The energy-only file has no frequencies
+    assert collection["BF3_uccsd_t.log"].vibfreqs.size == 0
+    npt.assert_array_equal(collection[0].vibfreqs, cmols[0].vibfreqs)
+    assert collection[-1].name == data_files[-1]
+
+
+def test_save_load(collection, tmp_path):
+    collection.save(str(tmp_path / "library"))
+    loaded = CMolCollection.load(str(tmp_path / "library"))
+    assert isinstance(loaded.vibfreqs, np.memmap)
+    assert not loaded.vibfreqs.flags.writeable
+    for name in ("names", "energy", "mom_inertia", "masses", "vibfreqs", "freq_offsets", "method"):
+        npt.assert_array_equal(getattr(loaded, name), getattr(collection, name))
+    assert loaded["oh_freq.log"].basis_set == collection["oh_freq.log"].basis_set
+
+    in_memory = CMolCollection.load(str(tmp_path / "library"), mmap=False)
+    assert not isinstance(in_memory.vibfreqs, np.memmap)
+
+
+def test_from_batch():
+    paths = [get_sample_file_path(f) for f in data_files[:3]]
+    collection = CMolCollection.from_batch(load_batch(paths, processes=1, compact=True))
+    npt.assert_array_equal(collection.names, paths)
+    npt.assert_array_equal(collection.energy, [CMol(p).energy for p in paths])
+
+
+def test_offsets_checked(collection):
+    arrays = {name: getattr(collection, name) for name in (
+        "names", "file_paths", "energy", "mom_inertia", "method", "basis_set",
+        "atom_offsets", "atomnos", "masses", "freq_offsets", "vibfreqs",
+    )}
+    arrays["freq_offsets"] = arrays["freq_offsets"][:-1]
+    with pytest.raises(ValueError):
+        CMolCollection(**arrays)
+
+
+def test_calc_thermo(cmols, collection):
+    temps = np.array([200.0, 298.15, 1000.0, 2500.0])
+    sigma = np.array([12, 1, 1, 6, 1])
+    thermo = collection.calc_thermo(temps, sigma=sigma, scale=0.98)
+    assert thermo.g.shape == (len(cmols), temps.size)
+
+    for i, cmol in enumerate(cmols):
+        if i == 1:  # energy-only, no vibrational contribution
+            cmol = CMol(cmol.file_path)
+            cmol.vibfreqs = []
+        npt.assert_allclose(thermo.log_q[i], cmol.calc_log_Q(temps, sigma[i], scale=0.98))
+        npt.assert_allclose(thermo.g[i], cmol.calc_free_energy(temps, sigma[i], scale=0.98))
+        npt.assert_allclose(thermo.h[i], cmol.calc_enthalpy(temps, scale=0.98))
+        npt.assert_allclose(thermo.s[i] / 1e3, cmol.calc_entropy(temps, sigma[i], scale=0.98))
+        npt.assert_allclose(thermo.cp[i], cmol.calc_heat_capacity(temps, scale=0.98))
+        assert thermo.zpve[i] == pytest.approx(cmol.calc_ZPVE(scale=0.98))
+
+
+def test_calc_thermo_chunks(collection):
+    temps = np.linspace(100.0, 3000.0, 7)
+    whole = collection.calc_thermo(temps)
+    # Small enough to put every molecule in its own chunk
+    chunked = collection.calc_thermo(temps, max_memory=1)
+    for a, b in zip(whole, chunked):
+        npt.assert_allclose(a, b, rtol=1e-12)
+    scalar = collection.calc_thermo(298.15)
+    npt.assert_allclose(scalar.g[:, 0], collection.calc_thermo([298.15, 500.0]).g[:, 0])
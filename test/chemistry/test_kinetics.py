@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from scipy.constants import Boltzmann, h, R
+from cantherm import get_sample_file_path
+from cantherm.chemistry.molecule import CMol
+from cantherm.chemistry.kinetics import Reaction, ha_to_kcal, R_kcal
+from cantherm.statmech.kinetics import log_tst_rate
+
+npt = np.testing
+
+temps = np.array([300.0, 500.0, 1000.0])
+
+
+@pytest.fixture(scope="module")
+def bz():
+    return CMol(get_sample_file_path("bz.log"))
+
+
+@pytest.fixture(scope="module")
+def bz_ts(make_bz):
+    return make_bz(0.03, imag_freq=-1500.0)
+
+
+def test_unimolecular(bz, bz_ts, capsys):
+    rxn = Reaction(bz, bz_ts, temps, reactants_sigma=12, ts_sigma=12, scale=1.0)
+    rates = rxn.calc_TST_rates()
+    assert capsys.readouterr().out == ""
+
+    e0 = (bz_ts.energy - bz.energy) * ha_to_kcal + bz_ts.calc_ZPVE() - bz.calc_ZPVE()
+    expected = [
+        Boltzmann * t / h
+        * bz_ts.calc_Q(t, 12, scale=1.0) / bz.calc_Q(t, 12, scale=1.0)
+        * np.exp(-e0 / (R_kcal * t))
+        for t in temps
+    ]
+    npt.assert_allclose(rates, expected, rtol=1e-10)
+    npt.assert_array_equal(rxn.tunneling_coeff, 1.0)
+
+    for tunneling in ["Wigner", "Eckart"]:
+        rxn = Reaction(bz, bz_ts, temps, tunneling=tunneling, reactants_sigma=12, ts_sigma=12, scale=1.0)
+        npt.assert_allclose(rxn.calc_TST_rates(), rates * rxn.tunneling_coeff)
+        assert np.all(rxn.tunneling_coeff > 1)
+
+
+def test_bimolecular(bz, bz_ts):
+    oh = CMol(get_sample_file_path("oh_freq.log"))
+    rxn = Reaction([bz, oh], bz_ts, temps, reac_type="Bimol", reactants_sigma=[12, 1], ts_sigma=12)
+    rates = rxn.calc_TST_rates()
+
+    # k = kT/h (Q_TS / Q_A Q_B) (RT / P) exp(-E0 / RT) in cm^3 / (mol s)
+    e0 = rxn.calc_barriers()[0]
+    expected = [
+        Boltzmann * t / h
+        * bz_ts.calc_Q(t, 12, scale=0.99)
+        / (bz.calc_Q(t, 12, scale=0.99) * oh.calc_Q(t, 1, scale=0.99))
+        * R * t / 101325 * 1e6
+        * np.exp(-e0 / (R_kcal * t))
+        for t in temps
+    ]
+    npt.assert_allclose(rates, expected, rtol=1e-10)
+
+
+def test_bad_input(bz, bz_ts):
+    with pytest.raises(ValueError):
+        Reaction(bz, bz_ts, temps, reac_type="Termol")
+    with pytest.raises(ValueError):
+        Reaction(bz, bz_ts, temps, tunneling="SCT")
+    with pytest.raises(ValueError):
+        Reaction(bz, bz_ts, temps, reac_type="Bimol").calc_TST_rates()
+
+
+def test_log_tst_rate_molecularity_array():
+    log_q_ts, log_q_react = np.array([[10.0], [20.0]]), np.array([[5.0], [12.0]])
+    rows = log_tst_rate(temps, log_q_ts, log_q_react, 10.0, molecularity=np.array([[1], [2]]))
+    for i, m in enumerate([1, 2]):
+        npt.assert_allclose(
+            rows[i], log_tst_rate(temps, log_q_ts[i], log_q_react[i], 10.0, molecularity=m)
+        )
@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from scipy.constants import Boltzmann, h, c
+from cantherm.chemistry.rrkm import RRKM
+from cantherm.chemistry.master_equation import MasterEquation, fit_chebyshev, fit_plog
+
+npt = np.testing
+
+c_in_cm = c * 100
+
+
+@pytest.fixture(scope="module")
+def species(make_bz):
+    # Benzene shifted in energy, the TSs lose their softest mode to the reaction coordinate
+    return {
+        "A": make_bz(0.0),
+        "B": make_bz(0.005),
+        "TS1": make_bz(0.08, imag_freq=-800.0),
+        "TS2": make_bz(0.09, imag_freq=-800.0),
+    }
+
+
+@pytest.fixture(scope="module")
+def rrkm():
+    return RRKM(grain=100.0, e_max=45000.0)
+
+
+def test_high_pressure_limit(species, rrkm):
+    me = MasterEquation(rrkm)
+    me.add_well("A", species["A"], 12)
+    me.add_dissociation("A", "P", species["TS1"], 12)
+
+    temp = 1000.0
+    res = rrkm.rate(species["A"], species["TS1"], 12, 12)
+    rho = rrkm.states(species["A"], 12).density
+    boltz = rho * np.exp(-res.energies * h * c_in_cm / (Boltzmann * temp))
+    k_inf = np.sum(res.k * boltz) / np.sum(boltz)
+
+    k = np.array([me.solve(temp, p)[1, 0] for p in [1e-3, 1.0, 1e5]])
+    npt.assert_allclose(k[-1], k_inf, rtol=1e-3)
+    assert k[0] < k[1] < k[2]
+
+
+def test_two_wells(species, rrkm):
+    me = MasterEquation(rrkm)
+    me.add_well("A", species["A"], 12)
+    me.add_well("B", species["B"], 12)
+    me.add_isomerization("A", "B", species["TS1"])
+    me.add_dissociation("B", "P", species["TS2"])
+    assert me.labels == ["A", "B", "P"]
+
+    temp = 1000.0
+    k = me.solve(temp, 1.0)
+    npt.assert_allclose(me.solve(temp, 1.0, solver="banded"), k, rtol=1e-6)
+
+    # Identical partition functions, so K_eq only depends on the energy gap
+    k_eq = np.exp(-0.005 * 219474.63 * h * c_in_cm / (Boltzmann * temp))
+    npt.assert_allclose(k[1, 0] / k[0, 1], k_eq, rtol=2e-2)
+    assert k[2, 0] == 0 or k[2, 0] < k[2, 1]
+
+    with pytest.raises(ValueError):
+        me.solve(temp, 1.0, solver="dense")
+
+
+def test_sweep_and_fits(species, rrkm):
+    me = MasterEquation(rrkm)
+    me.add_well("A", species["A"], 12)
+    me.add_dissociation("A", "P", species["TS1"], 12)
+
+    temps = np.linspace(900.0, 1300.0, 5)
+    pressures = np.logspace(-2, 2, 3)
+    sweep = me.sweep(temps, pressures, processes=2)
+    assert sweep.k.shape == (5, 3, 2, 1)
+    npt.assert_allclose(sweep.k[1, 2], me.solve(temps[1], pressures[2]))
+    assert sweep.channels() == [("A", "P")]
+
+    cheb = sweep.chebyshev(n_t=4, n_p=3)[("A", "P")]
+    npt.assert_allclose(cheb.rate(temps[:, None], pressures), sweep.k[:, :, 1, 0], rtol=1e-2)
+
+    plog = sweep.plog()[("A", "P")]
+    npt.assert_allclose(
+        [plog.rate(1100.0, p) for p in pressures], sweep.k[2, :, 1, 0], rtol=5e-2
+    )
+
+    # Exact modified Arrhenius data is recovered
+    k_exact = 1e12 * temps ** 0.5 * np.exp(-30.0 / (1.987204e-3 * temps))
+    fit = fit_plog(temps, [1.0], k_exact[:, None])
+    npt.assert_allclose([fit.A[0], fit.n[0], fit.Ea[0]], [1e12, 0.5, 30.0], rtol=1e-3)
+    fit = fit_chebyshev(temps, pressures, np.repeat(k_exact[:, None], 3, axis=1), n_t=5, n_p=1)
+    npt.assert_allclose(fit.rate(temps, 1.0), k_exact, rtol=1e-4)
@@ -77,3 +77,86 @@ def test_cmol_thermo(data_path, sigma):
         raise AssertionError(
             f"Cantherm's free energy doesn't match the known value error = {abs(err):6.f} Ha"
         )
+
+
+def test_cmol_hindered_rotor():
+    cmol = CMol(get_sample_file_path("bz.log"))
+    temps = np.array([298.15, 1000.0])
+    s_ho = cmol.calc_entropy(temps, 12, scale=1.0)
+
+    rotor = cantherm.statmech.HinderedRotor(3.0, [0.0, 0.0, -1.5], sigma=3)
+    mode = cmol.add_hindered_rotor(rotor, mode=0)
+    npt.assert_equal(mode, 0)
+    with pytest.raises(ValueError):
+        cmol.add_hindered_rotor(rotor, mode=0)
+
+    s_hr = cmol.calc_entropy(temps, 12, scale=1.0)
+    ds = (
+        rotor.thermo(temps).s
+        - cantherm.statmech.s_vib(cmol.vibfreqs[:1], temps, scale=1.0)
+    ) / 1000
+    npt.assert_allclose(s_hr - s_ho, ds, rtol=1e-8)
+
+
+def test_cmol_mode_energy_cache():
+    cmol = CMol(get_sample_file_path("bz.log"))
+    g1 = cmol.calc_free_energy(298.15, 12, scale=0.98)
+    energies = cmol._mode_energies(0.98)
+    npt.assert_equal(cmol._mode_energies(0.98) is energies, True)
+    npt.assert_equal(cmol.calc_free_energy(298.15, 12, scale=0.98), g1)
+
+    for scale in np.linspace(0.9, 1.0, 20):
+        cmol.calc_ZPVE(scale=scale)
+    npt.assert_equal(
+        len(cmol._mode_energy_cache), cantherm.chemistry.molecule.MODE_ENERGY_CACHE_SIZE
+    )
+
+
+def test_cmol_lazy(monkeypatch):
+    from cantherm.chemistry import molecule
+
+    calls = []
+    parse_file = molecule.parse_file
+    monkeypatch.setattr(
+        molecule, "parse_file", lambda *args, **kw: calls.append(1) or parse_file(*args, **kw)
+    )
+
+    def no_moi(*args, **kwargs):
+        raise AssertionError("moments of inertia computed for an energy-only use")
+
+    monkeypatch.setattr(molecule, "calc_principal_moi", no_moi)
+
+    cmol = CMol(get_sample_file_path("BF3_uccsd_t.log"))
+    assert calls == []
+    energy = cmol.energy
+    assert cmol.energy == energy
+    assert calls == [1]
+    assert "masses" not in vars(cmol) and "geom" not in vars(cmol)
+
+
+def test_cmol_vibfreqs_setter():
+    cmol = CMol(get_sample_file_path("bz.log"))
+    zpve = cmol.calc_ZPVE(scale=1.0)
+    cmol.vibfreqs = 2 * cmol.vibfreqs
+    npt.assert_allclose(cmol.calc_ZPVE(scale=1.0), 2 * zpve, rtol=1e-12)
+
+    # In-place edits would bypass the setter and leave the mode energies stale
+    with pytest.raises(ValueError):
+        cmol.vibfreqs[0] = 100.0
+
+
+def test_cmol_failed_job(tmp_path, capsys):
+    path = tmp_path / "bz_killed.log"
+    with open(get_sample_file_path("bz.log")) as f:
+        text = f.read()
+    path.write_text(text[: text.index(" Normal termination")])
+    cmol = CMol(str(path))
+    assert cmol.success is False
+    with pytest.raises(ValueError):
+        cmol.data
+
+    # A file without frequencies raises quietly
+    energy_only = CMol(get_sample_file_path("BF3_uccsd_t.log"))
+    assert energy_only.success is True
+    assert not hasattr(energy_only, "vibfreqs")
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from cantherm import get_sample_file_path
+from cantherm.chemistry.molecule import CMol
+from cantherm.chemistry.kinetics import Reaction
+from cantherm.chemistry.network import ReactionNetwork, R_kcal
+
+npt = np.testing
+
+temps = np.array([300.0, 600.0, 1200.0])
+
+
+class CountingCMol(CMol):
+    calls = 0
+
+    def calc_log_Q(self, temp, sigma, scale=1.0):
+        CountingCMol.calls += 1
+        return super().calc_log_Q(temp, sigma, scale=scale)
+
+
+@pytest.fixture(scope="module")
+def network(make_bz):
+    bz = CountingCMol(get_sample_file_path("bz.log"))
+    oh = CountingCMol(get_sample_file_path("oh_freq.log"))
+    ts = make_bz(0.03, imag_freq=-1500.0, cls=CountingCMol)
+
+    net = ReactionNetwork(temps)
+    net.add_species("bz", bz, 12)
+    net.add_species("oh", oh, 1)
+    net.add_species("ts", ts, 12)
+    net.add_reaction(["bz"], ["bz"], "ts")
+    net.add_reaction(["bz", "oh"], ["bz", "oh"], "ts", tunneling="Eckart")
+    net.add_reaction(["bz"], ["bz"], "ts", tunneling="Wigner")
+    return net
+
+
+def test_rates_match_reaction(network):
+    bz, oh, ts = (network._species[name][0] for name in ["bz", "oh", "ts"])
+    rates = network.calc_rates()
+
+    for r, (reactants, sigmas, kind, tunneling) in enumerate(
+        [(bz, 12, "Unimol", None), ([bz, oh], [12, 1], "Bimol", "Eckart"), (bz, 12, "Unimol", "Wigner")]
+    ):
+        rxn = Reaction(reactants, ts, temps, reac_type=kind, tunneling=tunneling,
+                       reactants_sigma=sigmas, ts_sigma=12)
+        if tunneling == "Eckart":
+            rxn.products = [bz, oh]
+        npt.assert_allclose(rates[r], rxn.calc_TST_rates(), rtol=1e-10)
+
+
+def test_tables_computed_once(network):
+    CountingCMol.calls = 0
+    network._tables = None
+    for _ in range(3):
+        network.calc_rates()
+        network.calc_equilibrium_constants()
+    assert CountingCMol.calls == len(network.species)
+
+
+def test_equilibrium_constants(network):
+    net = ReactionNetwork(temps)
+    bz, oh = (network._species[name][0] for name in ["bz", "oh"])
+    net.add_species("bz", bz, 12)
+    net.add_species("oh", oh, 1)
+    net.add_reaction(["bz", "oh"], ["bz"], "bz")
+    g = np.array([bz.calc_free_energy(t, 12, scale=0.99) for t in temps])
+    g_oh = np.array([oh.calc_free_energy(t, 1, scale=0.99) for t in temps])
+    npt.assert_allclose(net.free_energy_table[0], g, rtol=1e-8)
+
+    kp = net.calc_equilibrium_constants(concentration=False)[0]
+    npt.assert_allclose(kp, np.exp(g_oh / (R_kcal * temps)), rtol=1e-8)
+
+    with pytest.raises(ValueError):
+        net.add_reaction(["bz"], ["h2o"], "bz")
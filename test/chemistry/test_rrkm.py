@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from scipy.constants import Boltzmann, h, c
+from cantherm.chemistry.rrkm import RRKM
+
+npt = np.testing
+
+c_in_cm = c * 100
+
+
+@pytest.fixture(scope="module")
+def reaction(make_bz):
+    # A fake TS: benzene with its softest mode turned into the reaction coordinate
+    return make_bz(), make_bz(0.04, imag_freq=-800.0)
+
+
+def test_thermal_average(reaction):
+    # Boltzmann averaging k(E) must give back canonical TST
+    reactant, ts = reaction
+    rrkm = RRKM(grain=2.0, e_max=60000.0)
+    res = rrkm.rate(reactant, ts, 12, 12)
+    temp = 800.0
+
+    rho = rrkm.states(reactant, 12).density
+    boltz = np.exp(-res.energies * h * c_in_cm / (Boltzmann * temp))
+    k_avg = np.sum(res.k * rho * boltz) / np.sum(rho * boltz)
+
+    log_q_ratio = (
+        ts.calc_vib_thermo(temp).log_q - reactant.calc_vib_thermo(temp).log_q
+    )
+    k_tst = Boltzmann * temp / h * np.exp(
+        log_q_ratio - res.e0 * h * c_in_cm / (Boltzmann * temp)
+    )
+    npt.assert_allclose(k_avg, k_tst, rtol=2e-2)
+
+    assert np.all(res.k[res.energies < res.e0 - rrkm.grain] == 0)
+    assert np.all(np.diff(res.k[res.energies > res.e0 + rrkm.grain]) >= 0)
+
+
+def test_j_resolved(reaction):
+    reactant, ts = reaction
+    rrkm = RRKM()
+    res = rrkm.rate(reactant, ts, J=[0, 20, 60])
+    assert res.k.shape == (3, rrkm.energies.size)
+
+    # Same 2D rotor for both species here, so J only shifts the threshold
+    thresholds = [res.energies[np.argmax(k > 0)] for k in res.k]
+    assert thresholds[0] < thresholds[1] < thresholds[2]
+
+
+def test_states_cache(reaction):
+    reactant, ts = reaction
+    rrkm = RRKM()
+    results = rrkm.rates(reactant, [ts, ts], 12, [12, 6])
+    assert rrkm.states(reactant, 12) is rrkm.states(reactant, 12)
+    npt.assert_allclose(results[1].k, 2 * results[0].k)
+
+    rrkm.clear_cache()
+    assert len(rrkm._cache) == 0
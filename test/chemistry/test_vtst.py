@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from cantherm import get_sample_file_path
+from cantherm.chemistry.molecule import CMol
+from cantherm.chemistry.kinetics import Reaction, ha_to_kcal
+from cantherm.chemistry.vtst import VariationalReaction, load_path
+
+npt = np.testing
+
+temps = np.array([200.0, 300.0, 600.0, 1200.0, 2000.0])
+scale = 0.99
+
+
+def make_point(make_bz, stiffen=1.0, shift=0.0):
+    # A fake generalized TS made from benzene, `stiffen` scales its six softest modes
+    # and `shift` (kcal/mol) moves its zero-point corrected energy relative to the saddle
+    saddle = make_bz(0.03, imag_freq=-1500.0)
+    point = make_bz(0.03, imag_freq=-1500.0)
+    freqs = point.vibfreqs.copy()
+    freqs[1:7] *= stiffen
+    point.vibfreqs = freqs
+    d_zpve = point.calc_ZPVE(scale=scale) - saddle.calc_ZPVE(scale=scale)
+    point.energy += (shift - d_zpve) / ha_to_kcal
+    return point
+
+
+@pytest.fixture(scope="module")
+def reactant():
+    return CMol(get_sample_file_path("bz.log"))
+
+
+@pytest.fixture(scope="module")
+def path(make_bz):
+    # The saddle, then a point 1 kcal/mol lower with a tighter dividing surface
+    return [make_point(make_bz), make_point(make_bz, stiffen=3.0, shift=-1.0)]
+
+
+def test_single_point_is_tst(reactant, path):
+    tst = Reaction(reactant, path[0], temps, tunneling="Wigner", reactants_sigma=12, ts_sigma=12)
+    vtst = VariationalReaction(
+        reactant, path[:1], temps, tunneling="Wigner", reactants_sigma=12, path_sigma=12
+    )
+    npt.assert_allclose(vtst.calc_TST_rates(), tst.calc_TST_rates(), rtol=1e-12)
+    npt.assert_allclose(vtst.q_ratio, tst.q_ratio, rtol=1e-12)
+    npt.assert_array_equal(vtst.ts_index, 0)
+
+
+def test_variational_minimum(reactant, path):
+    vtst = VariationalReaction(reactant, path, temps)
+    rates = vtst.calc_TST_rates()
+    assert vtst.ts is path[0]
+    assert vtst.delta_g.shape == (2, temps.size)
+
+    for i, point in enumerate(path):
+        k = Reaction(reactant, point, temps).calc_TST_rates()
+        assert np.all(rates <= k * (1 + 1e-12))
+        npt.assert_allclose(rates[vtst.ts_index == i], k[vtst.ts_index == i], rtol=1e-12)
+
+    # Energy wins at low temperature, the entropy of the tighter point at high temperature
+    npt.assert_array_equal(vtst.ts_index, [0, 0, 1, 1, 1])
+    npt.assert_array_equal(vtst.ts_index, np.argmax(vtst.delta_g, axis=0))
+
+
+def test_load_path_parallel():
+    files = [get_sample_file_path("bz.log"), get_sample_file_path("oh_freq.log")]
+    serial = load_path(files)
+    parallel = load_path(files, processes=2)
+    for a, b in zip(serial, parallel):
+        # Parsed in the workers, not on first use in the parent
+        assert {"data", "energy", "_vibfreqs", "mom_inertia"} <= set(vars(b))
+        npt.assert_array_equal(a.vibfreqs, b.vibfreqs)
+        assert a.energy == b.energy
+
+    vtst = VariationalReaction(CMol(files[0]), files, 300.0)
+    assert [p.file_path for p in vtst.path] == files
@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+
+from cantherm import get_sample_file_path
+from cantherm.chemistry.molecule import CMol
+
+
+def _make_bz(de=0.0, imag_freq=None, cls=CMol):
+    cmol = cls(get_sample_file_path("bz.log"))
+    if imag_freq is not None:
+        cmol.vibfreqs = np.concatenate([[imag_freq], cmol.vibfreqs[1:]])
+    cmol.energy += de
+    return cmol
+
+
+@pytest.fixture(scope="session")
+def make_bz():
+    """Factory of fake species made from benzene.
+
+    `make_bz(de=0.0, imag_freq=None, cls=CMol)` shifts the electronic energy by `de`
+    hartree and, for a fake TS, turns the softest mode into an imaginary frequency
+    `imag_freq` (cm^-1). Every call returns a new molecule.
+    """
+    return _make_bz
@@ -0,0 +1,57 @@
+import shutil
+
+import numpy as np
+import pytest
+
+from cantherm import get_sample_file_path
+from cantherm.chemistry.molecule import CMol
+from cantherm.io.batch import find_outputs, iter_load, load_batch
+from cantherm.io.cache import ParsedData
+
+npt = np.testing
+
+data_files = ["bz.log", "oh_freq.log", "BF3_freq_orca.out"]
+
+
+@pytest.fixture(scope="module")
+def directory(tmp_path_factory):
+    root = tmp_path_factory.mktemp("outputs")
+    (root / "sub").mkdir()
+    for i, name in enumerate(data_files):
+        shutil.copy(get_sample_file_path(name), root / ("sub" if i else "") / name)
+    (root / "broken.log").write_text("Not a quantum chemistry output\n")
+    (root / "notes.txt").write_text("ignored\n")
+    return str(root)
+
+
+def test_find_outputs(directory):
+    names = [p[len(directory) + 1:] for p in find_outputs(directory)]
+    assert names == ["broken.log", "bz.log", "sub/BF3_freq_orca.out", "sub/oh_freq.log"]
+    assert len(find_outputs(directory, recursive=False)) == 2
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_load_batch(directory, processes):
+    seen = []
+    result = load_batch(
+        directory, processes=processes, compact=True,
+        progress=lambda path, cmol, error: seen.append(path),
+    )
+    paths = find_outputs(directory)
+    assert sorted(seen) == paths
+
+    assert [f.file_path for f in result.failures] == [paths[0]]
+    assert list(result.molecules) == paths[1:]
+    for path, cmol in result.molecules.items():
+        assert isinstance(cmol.data, ParsedData)
+        reference = CMol(path)
+        assert cmol.energy == reference.energy
+        npt.assert_array_equal(cmol.vibfreqs, reference.vibfreqs)
+        npt.assert_array_equal(cmol.mom_inertia, reference.mom_inertia)
+
+
+def test_iter_load_keeps_cclib_data(directory):
+    path = find_outputs(directory)[1]
+    (done_path, cmol, error), = iter_load([path], processes=1)
+    assert done_path == path and error is None
+    assert not isinstance(cmol.data, ParsedData)
@@ -0,0 +1,110 @@
+import os
+import shutil
+
+import numpy as np
+import pytest
+import cclib
+
+from cantherm import get_sample_file_path
+from cantherm.chemistry.molecule import CMol
+from cantherm.io.cache import ParseCache, ParsedData, parse_file
+
+npt = np.testing
+
+data_files = ["ch4_ccsd_freq_opt.log", "bz.log", "BF3_freq_orca.out", "oh_freq.log"]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ParseCache(str(tmp_path / "cache"))
+
+
+@pytest.mark.parametrize("filename", data_files)
+def test_warm_load_matches_cclib(cache, filename, monkeypatch):
+    path = get_sample_file_path(filename)
+    cold = CMol(path)
+    cold.data
+    CMol(path, cache=cache).data  # parsed on first use, this fills the cache
+
+    def fail(*args, **kwargs):
+        raise AssertionError("cclib was called on a warm load")
+
+    monkeypatch.setattr(cclib.io, "ccread", fail)
+    warm = CMol(path, cache=cache)
+    assert isinstance(warm.data, ParsedData)
+    assert warm.energy == cold.energy
+    assert warm.method == cold.method
+    npt.assert_array_equal(warm.vibfreqs, cold.vibfreqs)
+    npt.assert_array_equal(warm.geom, cold.geom)
+    temps = np.array([300.0, 1000.0])
+    npt.assert_array_equal(
+        warm.calc_free_energy(temps, 2), cold.calc_free_energy(temps, 2)
+    )
+
+
+def test_key(cache, tmp_path, monkeypatch):
+    path = str(tmp_path / "bz.log")
+    shutil.copy(get_sample_file_path("bz.log"), path)
+    key = cache.key(path)
+    # Content addressed, the same file anywhere shares the entry
+    assert key == cache.key(get_sample_file_path("bz.log"))
+
+    with open(path, "a") as f:
+        f.write("\n")
+    assert cache.key(path) != key
+
+    stat_cache = ParseCache(cache.directory, hash_contents=False)
+    stat_key = stat_cache.key(path)
+    os.utime(path, ns=(0, 0))
+    assert stat_cache.key(path) != stat_key
+
+    # A different parser version never reuses the entry
+    monkeypatch.setattr(cclib, "__version__", "0.0.0")
+    assert cache.key(get_sample_file_path("bz.log")) != key
+
+
+def test_eviction(cache):
+    paths = [get_sample_file_path(f) for f in data_files]
+    for path in paths:
+        parse_file(path, cache=cache)
+    sizes = [os.path.getsize(cache._entry(cache.key(p))) for p in paths]
+    assert cache.size() == sum(sizes)
+
+    # Use the first entry again, so the second one is now the least recently used
+    for i, path in enumerate(paths):
+        os.utime(cache._entry(cache.key(path)), (i, i))
+    assert cache.get(paths[0]) is not None
+
+    cache.max_bytes = cache.size() - 1
+    assert cache.evict() == 1
+    assert cache.get(paths[1]) is None
+    assert all(cache.get(p) is not None for p in paths[:1] + paths[2:])
+
+    cache.clear()
+    assert cache.size() == 0
+
+
+def test_unparsable_file(cache, tmp_path):
+    path = tmp_path / "notes.log"
+    path.write_text("Not a quantum chemistry output\n")
+    with pytest.raises(ValueError, match="notes.log"):
+        parse_file(str(path), cache=cache)
+    assert cache.size() == 0
+
+
+def test_put_scans_only_when_full(cache, monkeypatch):
+    paths = [get_sample_file_path(f) for f in data_files]
+    scans = []
+    evict = cache.evict
+    monkeypatch.setattr(cache, "evict", lambda: scans.append(1) or evict())
+    for path in paths:
+        parse_file(path, cache=cache)
+    assert scans == []
+
+    # The next put over the limit evicts down to it
+    cache.max_bytes = cache.size() - 1
+    cache.clear()
+    for path in paths:
+        parse_file(path, cache=cache)
+    assert len(scans) == 1
+    assert cache.size() <= cache.max_bytes
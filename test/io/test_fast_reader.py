@@ -0,0 +1,60 @@
+import glob
+import os
+
+import numpy as np
+import pytest
+import cclib
+
+from cantherm import get_sample_file_path
+from cantherm.chemistry.molecule import CMol
+from cantherm.io.cache import read_file
+from cantherm.io.fast_reader import read_fast
+
+npt = np.testing
+
+data_dir = os.path.dirname(get_sample_file_path("bz.log"))
+data_paths = sorted(glob.glob(os.path.join(data_dir, "*")))
+
+
+@pytest.mark.parametrize("data_path", data_paths, ids=os.path.basename)
+def test_matches_cclib(data_path):
+    fast = read_fast(data_path)
+    full = cclib.io.ccread(data_path)
+    assert fast is not None
+
+    assert fast.metadata["success"] == full.metadata["success"]
+    assert fast.metadata["methods"][-1] == full.metadata["methods"][-1]
+    assert fast.metadata["basis_set"] == full.metadata["basis_set"]
+    npt.assert_allclose(fast.scfenergies[-1], full.scfenergies[-1], rtol=0, atol=1e-8)
+    assert hasattr(fast, "ccenergies") == hasattr(full, "ccenergies")
+    if hasattr(full, "ccenergies"):
+        npt.assert_allclose(fast.ccenergies[-1], full.ccenergies[-1], rtol=0, atol=1e-8)
+    npt.assert_array_equal(fast.atomnos, full.atomnos)
+    npt.assert_allclose(fast.atomcoords[-1], full.atomcoords[-1], rtol=0, atol=1e-12)
+    assert hasattr(fast, "vibfreqs") == hasattr(full, "vibfreqs")
+    if hasattr(full, "vibfreqs"):
+        npt.assert_array_equal(fast.vibfreqs, full.vibfreqs)
+
+    cmol, reference = CMol(data_path, reader="fast"), CMol(data_path)
+    assert cmol.energy == reference.energy
+    npt.assert_allclose(cmol.mom_inertia, reference.mom_inertia, rtol=1e-12)
+
+
+def test_unfinished_job(tmp_path):
+    path = tmp_path / "bz_killed.log"
+    with open(get_sample_file_path("bz.log")) as f:
+        text = f.read()
+    path.write_text(text[: text.index(" Normal termination")])
+    assert read_fast(str(path)).metadata["success"] is False
+    with pytest.raises(ValueError):
+        CMol(str(path), reader="fast").energy
+
+
+def test_fallback(tmp_path):
+    path = tmp_path / "notes.log"
+    path.write_text("Not a Gaussian or ORCA output\n")
+    assert read_fast(str(path)) is None
+    (tmp_path / "empty.log").write_text("")
+    assert read_fast(str(tmp_path / "empty.log")) is None
+    with pytest.raises(ValueError):
+        read_file(str(path), reader="regex")
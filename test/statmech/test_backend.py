@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from cantherm.statmech import backend, ho_thermo, mode_energies
+from cantherm.utils import spawn_pool
+from ethane_data import ethane_freqs_all
+from pvc_data import pvc_freqs
+
+npt = np.testing
+
+
+@pytest.fixture
+def restore_backend():
+    name = backend.get_backend()
+    yield
+    backend.set_backend(name)
+
+
+def test_numba_matches_numpy(restore_backend):
+    pytest.importorskip("numba")
+    temps = np.linspace(200.0, 3000.0, 57)
+    freqs = [ethane_freqs_all, pvc_freqs, np.array([]), np.array([35.0, 4000.0])]
+    energies = np.concatenate([mode_energies(f, scale=1.0) for f in freqs])
+    offsets = np.cumsum([0] + [len(f) for f in freqs])
+
+    results = {}
+    for name in ["numpy", "numba"]:
+        backend.set_backend(name)
+        results[name] = (
+            ho_thermo(pvc_freqs, temps, scale=1.0),
+            backend.ho_sums_segmented(energies, offsets, temps),
+        )
+
+    for ref, test in zip(*results.values()):
+        for ref_field, test_field in zip(ref, test):
+            npt.assert_allclose(test_field, ref_field, rtol=1e-12, atol=1e-14)
+
+
+def test_segmented_matches_single():
+    temps = np.linspace(200.0, 3000.0, 15)
+    freqs = [ethane_freqs_all, np.array([]), pvc_freqs]
+    energies = np.concatenate([mode_energies(f, scale=1.0) for f in freqs])
+    offsets = np.cumsum([0] + [len(f) for f in freqs])
+
+    log_q, h_red, cp_red = backend.ho_sums_segmented(energies, offsets, temps)
+    for i, f in enumerate(freqs):
+        ref = backend.ho_sums(mode_energies(f, scale=1.0), temps)
+        npt.assert_allclose([log_q[i], h_red[i], cp_red[i]], ref, rtol=1e-12, atol=1e-14)
+
+
+def test_set_backend(restore_backend):
+    backend.set_backend("numpy")
+    npt.assert_equal(backend.get_backend(), "numpy")
+    with pytest.raises(ValueError):
+        backend.set_backend("fortran")
+
+
+def test_spawn_pool_inherits_backend(restore_backend):
+    for name in backend.available_backends():
+        backend.set_backend(name)
+        with spawn_pool(1) as pool:
+            assert pool.apply(backend.get_backend) == name
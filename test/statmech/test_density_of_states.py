@@ -0,0 +1,87 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from scipy.constants import Boltzmann, h, c
+from cantherm import get_sample_file_path
+from cantherm.chemistry.molecule import CMol
+from cantherm.statmech import (
+    HinderedRotor,
+    beyer_swinehart,
+    count_states,
+    hindered_rotor_levels,
+    log_q_vib,
+    stein_rabinovitch,
+)
+
+npt = np.testing
+
+c_in_cm = c * 100
+
+
+def brute_force(freqs, grain, n_grains):
+    counts = np.zeros(n_grains)
+    steps = np.rint(np.asarray(freqs) / grain).astype(int)
+    ranges = [range(0, n_grains, step) for step in steps]
+    for quanta in itertools.product(*ranges):
+        e = sum(quanta)
+        if e < n_grains:
+            counts[e] += 1
+    return counts
+
+
+def test_single_mode():
+    counts = beyer_swinehart([30.0], 10.0, 10)
+    npt.assert_array_equal(counts, [1, 0, 0, 1, 0, 0, 1, 0, 0, 1])
+
+
+def test_bs_brute_force():
+    freqs = [30.0, 50.0, 50.0, 120.0]
+    npt.assert_array_equal(beyer_swinehart(freqs, 10.0, 60), brute_force(freqs, 10.0, 60))
+
+
+def test_sr_harmonic_levels():
+    freqs = [100.0, 250.0, 730.0]
+    levels = [np.arange(0, 20000, f) for f in freqs]
+    npt.assert_array_equal(
+        stein_rabinovitch(levels, 10.0, 2000), beyer_swinehart(freqs, 10.0, 2000)
+    )
+
+
+def test_laplace_transform():
+    # Integrating the density against exp(-E/kT) gives back the vibrational Q
+    freqs = np.array([150.0, 420.0, 800.0, 1200.0, 1650.0, 3000.0])
+    temp = 500.0
+    states = count_states(freqs, grain=1.0, e_max=40000.0)
+    beta = h * c_in_cm / (Boltzmann * temp)
+    q = np.sum(states.counts * np.exp(-beta * states.energies))
+    npt.assert_allclose(np.log(q), log_q_vib(freqs, temp, scale=1.0), rtol=1e-3)
+
+
+def test_fft_matches_bs():
+    cmol = CMol(get_sample_file_path("bz.log"))
+    cmol.add_hindered_rotor(HinderedRotor(3.0, [0.0, 0.0, -1.0], sigma=3), mode=0)
+    bs = cmol.calc_states(12, grain=5.0)
+    fft = cmol.calc_states(12, grain=5.0, method="fft")
+    big = bs.counts > 1e-8 * bs.counts.max()
+    npt.assert_allclose(fft.counts[big], bs.counts[big], rtol=1e-6)
+    npt.assert_allclose(fft.sum_of_states[-1], bs.sum_of_states[-1], rtol=1e-10)
+
+    with pytest.raises(ValueError):
+        cmol.calc_states(12, method="direct")
+
+
+def test_many_modes():
+    freqs = np.random.default_rng(0).uniform(50.0, 3500.0, 120)
+    rotor = HinderedRotor(3.0, [0.0, 0.0, -1.0], sigma=3)
+    states = count_states(
+        freqs,
+        grain=10.0,
+        e_max=35000.0,
+        rot_consts=[1.0, 0.5, 0.3],
+        levels=[hindered_rotor_levels(rotor)],
+        level_sigmas=[3],
+    )
+    assert np.all(np.diff(states.sum_of_states) >= 0)
+    assert np.isfinite(states.sum_of_states[-1])
@@ -38,3 +38,15 @@ def test_Htot(freqs, scale, temp, H_tot_ans):
         + zpve(freqs, scale=scale)
     ) / 627.509  # convert to hartree
     npt.assert_approx_equal(H_tot_ans, H_tot, significant=5)
+
+
+@pytest.mark.parametrize("freqs, scale", [(ethane_freqs, 0.99), (pvc_freqs, 1.0)])
+def test_H_temp_array(freqs, scale):
+    temps = np.linspace(200.0, 3000.0, 15)
+    npt.assert_allclose(
+        h_vib(freqs, temps, scale=scale),
+        [h_vib(freqs, t, scale=scale) for t in temps],
+        rtol=1e-12,
+    )
+    npt.assert_allclose(h_tr(temps), [h_tr(t) for t in temps], rtol=1e-12)
+    npt.assert_allclose(h_rot(temps), [h_rot(t) for t in temps], rtol=1e-12)
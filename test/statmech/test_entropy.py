@@ -39,3 +39,19 @@ def test_S_vib(freqs, temp, scale, s_vib_ans):
     s_vib_test = s_vib(freqs, temp, scale=scale)
     npt.assert_approx_equal(s_vib_test, s_vib_ans, significant=3)
 
+
+
+@pytest.mark.parametrize("freqs, scale", [(ethane_freqs, 0.99), (pvc_freqs, 1.0)])
+def test_S_temp_array(freqs, scale):
+    temps = np.linspace(200.0, 3000.0, 15)
+    npt.assert_allclose(
+        s_vib(freqs, temps, scale=scale),
+        [s_vib(freqs, t, scale=scale) for t in temps],
+        rtol=1e-12,
+    )
+    npt.assert_allclose(
+        s_rot(1, pvc_Iext, temps), [s_rot(1, pvc_Iext, t) for t in temps], rtol=1e-12
+    )
+    npt.assert_allclose(
+        s_tr(pvc_masses, temps), [s_tr(pvc_masses, t) for t in temps], rtol=1e-12
+    )
@@ -49,3 +49,20 @@ def test_Gtot(masses, sigma, I_ext, freqs, scale, temp, g_tot_ans):
     ) / 627.509  # convert to hartree
     npt.assert_approx_equal(g, g_tot_ans, significant=5)
 
+
+
+@pytest.mark.parametrize(
+    "masses, sigma, I_ext, freqs, scale",
+    [(ethane_masses, 1, ethane_Iext, ethane_freqs_all, 1.0)],
+)
+def test_G_temp_array(masses, sigma, I_ext, freqs, scale):
+    temps = np.linspace(200.0, 3000.0, 15)
+    npt.assert_allclose(
+        g_vib(freqs, temps, scale=scale),
+        [g_vib(freqs, t, scale=scale) for t in temps],
+        rtol=1e-12,
+    )
+    npt.assert_allclose(
+        g_rot(sigma, I_ext, temps), [g_rot(sigma, I_ext, t) for t in temps], rtol=1e-12
+    )
+    npt.assert_allclose(g_tr(masses, temps), [g_tr(masses, t) for t in temps], rtol=1e-12)
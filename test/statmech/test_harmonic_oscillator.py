@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from cantherm.statmech import ho_thermo, zpve
+from ethane_data import ethane_freqs, ethane_freqs_all
+from pvc_data import pvc_freqs
+
+npt = np.testing
+
+
+@pytest.mark.parametrize(
+    "freqs, temp, scale, q_ans, h_ans, s_ans, cp_ans",
+    [(ethane_freqs, 298.15, 0.99, 1.060162, 0.1582, 0.6462, 2.548059)],
+)
+def test_ho_thermo(freqs, temp, scale, q_ans, h_ans, s_ans, cp_ans):
+    vib = ho_thermo(freqs, temp, scale=scale)
+    npt.assert_approx_equal(vib.q, q_ans, significant=5)
+    npt.assert_approx_equal(vib.h, h_ans, significant=4)
+    npt.assert_approx_equal(vib.s, s_ans, significant=3)
+    npt.assert_approx_equal(vib.cp, cp_ans, significant=3)
+
+
+@pytest.mark.parametrize("freqs", [ethane_freqs_all, pvc_freqs])
+def test_ho_thermo_consistency(freqs):
+    temps = np.linspace(200.0, 3000.0, 15)
+    vib = ho_thermo(freqs, temps, scale=1.0)
+    for field in vib[:-1]:
+        npt.assert_equal(field.shape, temps.shape)
+
+    npt.assert_allclose(vib.g, vib.h - temps * vib.s / 1e3, rtol=1e-10)
+    npt.assert_allclose(vib.zpve, zpve(freqs, scale=1.0), rtol=1e-12)
+
+    # Cp = dH/dT
+    dt = 1e-3
+    dh = ho_thermo(freqs, temps + dt, scale=1.0).h - ho_thermo(freqs, temps - dt, scale=1.0).h
+    npt.assert_allclose(vib.cp, dh / (2 * dt) * 1e3, rtol=1e-5)
+
+
+soft_freqs = np.array([12.0, 45.0, 80.0, 99.0, 250.0, 1200.0, 3100.0])
+
+
+def test_qrrho_truhlar():
+    temps = np.linspace(200.0, 3000.0, 15)
+    raised = np.maximum(soft_freqs * 0.98, 100.0)
+    qh = ho_thermo(soft_freqs, temps, scale=0.98, qrrho="truhlar")
+    ref = ho_thermo(raised, temps, scale=1.0)
+    for qh_field, ref_field in zip(qh, ref):
+        npt.assert_allclose(qh_field, ref_field, rtol=1e-12)
+
+
+def test_qrrho_grimme():
+    temps = np.linspace(200.0, 3000.0, 15)
+    ho = ho_thermo(soft_freqs, temps, scale=1.0)
+    qh = ho_thermo(soft_freqs, temps, scale=1.0, qrrho="grimme")
+
+    # Only S (and G through S) change, and soft modes lose entropy
+    npt.assert_allclose(qh.h, ho.h)
+    npt.assert_allclose(qh.cp, ho.cp)
+    npt.assert_equal(np.all(qh.s < ho.s), True)
+    npt.assert_allclose(qh.g, qh.h - temps * qh.s / 1e3, rtol=1e-10)
+
+    # Stiff modes are (almost) untouched
+    stiff = soft_freqs[-2:]
+    npt.assert_allclose(
+        ho_thermo(stiff, temps, scale=1.0, qrrho="grimme").s,
+        ho_thermo(stiff, temps, scale=1.0).s,
+        atol=1e-4,
+    )
+
+
+def test_qrrho_unknown():
+    with pytest.raises(ValueError):
+        ho_thermo(soft_freqs, 298.15, qrrho="rrho")
@@ -17,7 +17,7 @@ def test_Cp_tr(cp_tr_ans):
     npt.assert_approx_equal(cp_tr_test, cp_tr_ans, significant=4)
 
 
-@pytest.mark.parametrize("cp_rot_ans", [(4.968011), (2.981 + R_cal)])
+@pytest.mark.parametrize("cp_rot_ans", [(2.980806), (1.5 * R_cal)])
 def test_Cp_rot(cp_rot_ans):
     cp_rot_test = cp_rot()
     npt.assert_approx_equal(cp_rot_test, cp_rot_ans, significant=4)
@@ -28,3 +28,15 @@ def test_Cp_vib(freqs, temp, cp_vib_ans):
     cp_vib_test = cp_vib(freqs, temp)
     npt.assert_approx_equal(cp_vib_test, cp_vib_ans, significant=4)
 
+
+
+@pytest.mark.parametrize("freqs, scale", [(ethane_freqs, 0.99), (pvc_freqs, 1.0)])
+def test_Cp_temp_array(freqs, scale):
+    temps = np.linspace(200.0, 3000.0, 15)
+    npt.assert_allclose(
+        cp_vib(freqs, temps, scale=scale),
+        [cp_vib(freqs, t, scale=scale) for t in temps],
+        rtol=1e-12,
+    )
+    npt.assert_allclose(cp_tr(temps), np.full(temps.shape, cp_tr()))
+    npt.assert_allclose(cp_rot(temps), np.full(temps.shape, cp_rot()))
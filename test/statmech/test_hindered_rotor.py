@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from scipy.constants import Boltzmann, N_A, h
+from cantherm.statmech import HinderedRotor, fit_fourier_potential, ho_thermo
+
+npt = np.testing
+
+temps = np.array([300.0, 1000.0, 3000.0])
+
+
+@pytest.mark.parametrize("I_red, sigma", [(3.0, 1), (3.0, 3), (50.0, 2)])
+def test_free_rotor(I_red, sigma):
+    # Without a barrier Q should approach the classical free rotor limit
+    rotor = HinderedRotor(I_red, [0.0], sigma=sigma)
+    I_si = I_red * 1e-3 / N_A * 1e-20
+    q_classical = np.sqrt(8 * np.pi ** 3 * I_si * Boltzmann * temps) / (sigma * h)
+    npt.assert_allclose(rotor.thermo(temps).q, q_classical, rtol=1e-4)
+    npt.assert_allclose(rotor.thermo(temps).cp, 0.5 * 1.987204, rtol=1e-3)
+
+
+def test_stiff_rotor():
+    # A high barrier rotor should behave like a harmonic oscillator at low T
+    rotor = HinderedRotor(3.0, [0.0, 0.0, -25.0], sigma=3)
+    ho = ho_thermo([rotor.harmonic_freq], 300.0, scale=1.0)
+    hr = rotor.thermo(300.0)
+    npt.assert_allclose(hr.q, ho.q, rtol=1e-2)
+    npt.assert_allclose(hr.zpve, ho.zpve, rtol=1e-2)
+    npt.assert_allclose(hr.cp, ho.cp, rtol=5e-2)
+
+
+def test_rotor_consistency():
+    rotor = HinderedRotor(3.0, [0.5, 0.0, -1.5], [0.2, 0.0, 0.0], sigma=1)
+    hr = rotor.thermo(temps)
+    npt.assert_allclose(hr.g, hr.h - temps * hr.s / 1e3, rtol=1e-10)
+
+    dt = 1e-3
+    dh = rotor.thermo(temps + dt).h - rotor.thermo(temps - dt).h
+    npt.assert_allclose(hr.cp, dh / (2 * dt) * 1e3, rtol=1e-5)
+
+
+def test_fit_fourier_potential():
+    angles = np.linspace(0, 2 * np.pi, 37)[:-1]
+    energies = 1.5 * (1 - np.cos(3 * angles)) + 0.3 * np.sin(angles)
+    cos_coeffs, sin_coeffs = fit_fourier_potential(angles, energies, n_terms=4)
+    npt.assert_allclose(cos_coeffs, [0.0, 0.0, -1.5, 0.0], atol=1e-10)
+    npt.assert_allclose(sin_coeffs, [0.3, 0.0, 0.0, 0.0], atol=1e-10)
@@ -2,7 +2,7 @@ import numpy as np
 import pytest
 
 from scipy.constants import N_A
-from cantherm.statmech import q_tr, q_rot, q_vib
+from cantherm.statmech import q_tr, q_rot, q_vib, log_q_tr, log_q_rot, log_q_vib
 from ethane_data import ethane_masses, ethane_Iext, ethane_freqs, ethane_freqs_all
 from pvc_data import pvc_masses, pvc_Iext, pvc_freqs
 
@@ -42,3 +42,43 @@ def test_Qrot(sigma, I_ext, temp, q_rot_ans):
 def test_Q_vib(freqs, temp, scale, q_vib_ans):
     q_vib_test = q_vib(freqs, temp, scale=scale)
     npt.assert_approx_equal(q_vib_test, q_vib_ans, significant=5)
+
+
+@pytest.mark.parametrize("freqs, scale", [(ethane_freqs, 0.99), (pvc_freqs, 1.0)])
+def test_Q_temp_array(freqs, scale):
+    temps = np.linspace(200.0, 3000.0, 15)
+    npt.assert_allclose(
+        q_vib(freqs, temps, scale=scale),
+        [q_vib(freqs, t, scale=scale) for t in temps],
+        rtol=1e-12,
+    )
+    npt.assert_allclose(
+        q_rot(1, pvc_Iext, temps), [q_rot(1, pvc_Iext, t) for t in temps], rtol=1e-12
+    )
+    npt.assert_allclose(
+        q_tr(pvc_masses, temps), [q_tr(pvc_masses, t) for t in temps], rtol=1e-12
+    )
+
+
+@pytest.mark.parametrize(
+    "masses, sigma, I_ext, freqs",
+    [(ethane_masses, 6, ethane_Iext, ethane_freqs_all), (pvc_masses, 1, pvc_Iext, pvc_freqs)],
+)
+def test_log_Q(masses, sigma, I_ext, freqs):
+    temps = np.linspace(200.0, 3000.0, 15)
+    npt.assert_allclose(log_q_tr(masses, temps), np.log(q_tr(masses, temps)), rtol=1e-12)
+    npt.assert_allclose(
+        log_q_rot(sigma, I_ext, temps), np.log(q_rot(sigma, I_ext, temps)), rtol=1e-12
+    )
+    npt.assert_allclose(
+        log_q_vib(freqs, temps, scale=1.0), np.log(q_vib(freqs, temps, scale=1.0)), rtol=1e-10
+    )
+
+
+def test_log_Q_vib_large_system():
+    # ~1000 soft modes overflow the partition function itself but not its log
+    freqs = np.full(1000, 50.0)
+    npt.assert_equal(np.isinf(q_vib(freqs, 3000.0, scale=1.0)), True)
+    log_q = log_q_vib(freqs, 3000.0, scale=1.0)
+    log_q_single = np.log(q_vib(freqs[:1], 3000.0, scale=1.0))
+    npt.assert_allclose(log_q, 1000 * log_q_single, rtol=1e-12)
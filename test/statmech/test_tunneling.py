@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from scipy.integrate import quad
+from cantherm.statmech import EckartBarrier, eckart_barrier, eckart_correction
+from cantherm.statmech.tunneling import R_kcal, wavenumber_to_kcal
+
+npt = np.testing
+
+temps = np.array([250.0, 300.0, 500.0, 1000.0])
+
+
+@pytest.mark.parametrize("v_forward, v_reverse", [(10.0, 15.0), (15.0, 10.0), (8.0, 8.0)])
+def test_kappa_quadrature(v_forward, v_reverse):
+    # The cached grid integral should match adaptive quadrature at every temperature
+    barrier = EckartBarrier(1500.0, v_forward, v_reverse)
+    e_min = max(0.0, v_forward - v_reverse)
+    for temp, kappa in zip(temps, barrier.kappa(temps)):
+        beta = 1.0 / (R_kcal * temp)
+        integral = quad(
+            lambda e: barrier.transmission(e) * np.exp(beta * (v_forward - e)),
+            e_min,
+            v_forward + 60 * R_kcal * temp,
+            points=[v_forward],
+            limit=500,
+        )[0]
+        npt.assert_allclose(kappa, beta * integral, rtol=1e-5)
+
+
+def test_transmission():
+    barrier = EckartBarrier(1500.0, 10.0, 15.0)
+    prob = barrier.transmission(np.linspace(-1.0, 30.0, 200))
+    assert np.all((prob >= 0) & (prob <= 1))
+    assert np.all(np.diff(prob) >= 0)
+    assert barrier.transmission(-1.0) == 0
+    npt.assert_allclose(barrier.transmission(10.0), 0.5, atol=0.05)
+
+
+def test_limits():
+    # Tunneling vanishes for a flat barrier, and a high barrier with a small frequency
+    # behaves like a parabolic one
+    kappa = eckart_correction(temps, -1200.0, 1.0, 20.0, 25.0)
+    assert np.all(kappa > 1) and np.all(np.diff(kappa) < 0)
+    npt.assert_allclose(eckart_correction(temps, 10.0, 1.0, 20.0), 1.0, rtol=1e-3)
+
+    h_nu = 300.0 * wavenumber_to_kcal
+    u = h_nu / (R_kcal * temps)
+    parabolic = 0.5 * u / np.sin(0.5 * u)
+    npt.assert_allclose(eckart_correction(temps, 300.0, 1.0, 20.0), parabolic, rtol=3e-3)
+
+    assert eckart_barrier(1200.0, 20.0, 25.0) is eckart_barrier(1200.0, 20.0, 25.0)
+    with pytest.raises(ValueError):
+        EckartBarrier(1200.0, -1.0, 5.0)
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from cclib.parser.utils import convertor
+
+from cantherm import get_sample_file_path
+from cantherm.chemistry.molecule import CMol
+from cantherm.thermo.ensemble import ConformerEnsemble, R_cal
+
+npt = np.testing
+
+temps = np.array([200.0, 298.15, 1000.0, 2500.0])
+
+
+def conformer(shift=0.0):
+    # A copy of benzene shifted by `shift` kcal/mol
+    cmol = CMol(get_sample_file_path("bz.log"))
+    cmol.energy += convertor(shift, "kcal/mol", "hartree")
+    return cmol
+
+
+def test_single_conformer():
+    bz = conformer()
+    thermo = ConformerEnsemble([bz], sigma=12).calc_thermo(temps, scale=0.98)
+    npt.assert_allclose(thermo.log_q, bz.calc_log_Q(temps, 12, scale=0.98))
+    npt.assert_allclose(thermo.g, bz.calc_free_energy(temps, 12, scale=0.98))
+    npt.assert_allclose(thermo.h, bz.calc_enthalpy(temps, scale=0.98))
+    npt.assert_allclose(thermo.s / 1e3, bz.calc_entropy(temps, 12, scale=0.98))
+    npt.assert_allclose(thermo.s_mix, 0.0, atol=1e-12)
+    npt.assert_allclose(thermo.weights, 1.0)
+
+
+def test_mixing():
+    bz = conformer()
+    single = ConformerEnsemble([bz]).calc_thermo(temps)
+    pair = ConformerEnsemble([bz, conformer()]).calc_thermo(temps)
+    npt.assert_allclose(pair.weights, 0.5)
+    npt.assert_allclose(pair.h, single.h)
+    npt.assert_allclose(pair.s_mix, R_cal * np.log(2))
+    npt.assert_allclose(pair.s, single.s + R_cal * np.log(2))
+
+    # A higher conformer has the Boltzmann weight of its energy gap
+    ensemble = ConformerEnsemble([conformer(1.0), bz])
+    thermo = ensemble.calc_thermo(temps)
+    ratio = np.exp(-1.0 / (R_cal / 1e3 * temps))
+    npt.assert_allclose(thermo.weights[0] / thermo.weights[1], ratio)
+    log_q, e0, h = ensemble.conformer_thermo(temps)
+    s_i = (h - (e0[:, np.newaxis] - R_cal / 1e3 * temps * log_q)) * 1e3 / temps
+    npt.assert_allclose(thermo.s, np.sum(thermo.weights * s_i, axis=0) + thermo.s_mix)
+    assert np.all(thermo.g < single.g)
+
+
+def test_energy_window():
+    high = conformer(5.0)
+    ensemble = ConformerEnsemble(
+        [conformer(), conformer(1.0), high], sigma=[12, 12, 6], energy_window=3.0
+    )
+    assert len(ensemble) == 2
+    assert ensemble.pruned == [high]
+    npt.assert_array_equal(ensemble.sigma, [12, 12])
+    ensemble.calc_thermo(temps)
+    assert "_vibfreqs" not in vars(high)
+
+    with pytest.raises(ValueError):
+        ConformerEnsemble([])
+    with pytest.raises(ValueError):
+        ConformerEnsemble([high], sigma=[1, 2])
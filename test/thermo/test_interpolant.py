@@ -0,0 +1,42 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from cantherm import get_sample_file_path
+from cantherm.chemistry.molecule import CMol
+from cantherm.thermo.interpolant import ThermoInterpolant
+
+npt = np.testing
+
+
+@pytest.mark.parametrize(
+    "filename, sigma", [("bz.log", 12), ("ch4_ccsd_freq_opt.log", 12), ("phosphonyl.log", 3)]
+)
+def test_interpolant_max_error(filename, sigma):
+    cmol = CMol(get_sample_file_path(filename))
+    interp = ThermoInterpolant(cmol, sigma, tol=1e-6)
+    npt.assert_equal(interp.max_error <= 1e-6, True)
+
+    temps = np.random.default_rng(20).uniform(200.0, 3000.0, 500)
+    npt.assert_allclose(
+        interp.free_energy(temps), cmol.calc_free_energy(temps, sigma), rtol=0, atol=1e-6
+    )
+    npt.assert_allclose(interp.enthalpy(temps), cmol.calc_enthalpy(temps), rtol=0, atol=1e-6)
+    npt.assert_allclose(
+        interp.entropy(temps), cmol.calc_entropy(temps, sigma), rtol=0, atol=1e-8
+    )
+    npt.assert_allclose(
+        interp.free_energy(298.15), cmol.calc_free_energy(298.15, sigma), rtol=0, atol=1e-6
+    )
+
+
+def test_interpolant_pickle_and_range():
+    cmol = CMol(get_sample_file_path("bz.log"))
+    interp = ThermoInterpolant(cmol, 12, t_min=300.0, t_max=1500.0)
+    clone = pickle.loads(pickle.dumps(interp))
+    temps = np.linspace(300.0, 1500.0, 11)
+    npt.assert_equal(clone.free_energy(temps), interp.free_energy(temps))
+
+    with pytest.raises(ValueError):
+        interp.free_energy(200.0)
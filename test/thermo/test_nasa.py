@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from cantherm import get_sample_file_path
+from cantherm.chemistry.molecule import CMol
+from cantherm.thermo.nasa import (
+    fit_nasa,
+    fit_nasa_tables,
+    thermo_table,
+    write_cantera,
+    write_chemkin,
+)
+
+npt = np.testing
+
+data_files = ["ch4_ccsd_freq_opt.log", "bz.log", "phosphonyl.log"]
+data_rot_sym = [12, 12, 3]
+
+
+@pytest.fixture(scope="module")
+def cmols():
+    return [CMol(get_sample_file_path(f)) for f in data_files]
+
+
+def test_fit_nasa(cmols):
+    polys = fit_nasa(cmols, data_rot_sym)
+    temps = np.linspace(200.0, 3000.0, 57)
+    for cmol, sigma, poly in zip(cmols, data_rot_sym, polys):
+        cp, h, s = thermo_table(cmol, temps, sigma)
+        npt.assert_allclose(cp, cmol.calc_heat_capacity(temps))
+        npt.assert_allclose(poly.cp(temps), cp, atol=0.5)
+        npt.assert_allclose(poly.h(temps), h, atol=0.02)
+        npt.assert_allclose(poly.s(temps), s, atol=0.05)
+
+        # Continuity at t_mid
+        t_mid = np.array([poly.t_mid - 1e-8, poly.t_mid + 1e-8])
+        for prop in (poly.cp, poly.h, poly.s):
+            npt.assert_allclose(np.ptp(prop(t_mid)), 0.0, atol=1e-6)
+
+
+def test_fit_nasa_batch_matches_single(cmols):
+    temps = np.linspace(300.0, 2000.0, 50)
+    tables = [thermo_table(m, temps, sig) for m, sig in zip(cmols, data_rot_sym)]
+    cp, h, s = (np.array(arr) for arr in zip(*tables))
+    lo, hi = fit_nasa_tables(temps, cp, h, s)
+    lo_1, hi_1 = fit_nasa_tables(temps, cp[1], h[1], s[1])
+    npt.assert_allclose(lo[1], lo_1, rtol=1e-8)
+    npt.assert_allclose(hi[1], hi_1, rtol=1e-8)
+
+
+def test_fit_nasa_h298(cmols):
+    polys = fit_nasa(cmols[:1], data_rot_sym[:1], names=["CH4"], h298=[-17.9])
+    npt.assert_allclose(polys[0].h(298.15), -17.9, atol=0.02)
+
+
+def test_nasa_export(cmols):
+    polys = fit_nasa(cmols, data_rot_sym, h298=[-17.9, 19.8, -50.0])
+    chemkin = write_chemkin(polys).splitlines()
+    npt.assert_equal(chemkin[0], "THERMO ALL")
+    npt.assert_equal(chemkin[-1], "END")
+    for i, line in enumerate(chemkin[2:-1]):
+        npt.assert_equal(len(line), 80)
+        npt.assert_equal(line[-1], str(i % 4 + 1))
+    npt.assert_equal(chemkin[2][44], "G")
+
+    cantera = write_cantera(polys)
+    npt.assert_equal(cantera.count("model: NASA7"), len(polys))
+    npt.assert_equal("composition: {C: 1, H: 4}" in cantera, True)
+
+
+def test_nasa_export_needs_reference(cmols):
+    polys = fit_nasa(cmols[:1], data_rot_sym[:1])
+    assert polys[0].h298 is None
+    with pytest.raises(ValueError):
+        write_chemkin(polys)
+    with pytest.raises(ValueError):
+        write_cantera(polys)
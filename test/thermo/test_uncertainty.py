@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from cantherm import get_sample_file_path
+from cantherm.chemistry.molecule import CMol
+from cantherm.chemistry.kinetics import Reaction
+from cantherm.thermo.uncertainty import (
+    free_energy_samples,
+    free_energy_uncertainty,
+    rate_uncertainty,
+    sample_perturbations,
+)
+
+npt = np.testing
+
+temps = np.array([300.0, 600.0, 1200.0])
+
+
+@pytest.fixture(scope="module")
+def bz():
+    return CMol(get_sample_file_path("bz.log"))
+
+
+@pytest.fixture(scope="module")
+def reaction(bz, make_bz):
+    ts = make_bz(0.03, imag_freq=-1500.0)
+    return Reaction(bz, ts, temps, tunneling="Wigner", reactants_sigma=12, ts_sigma=12)
+
+
+def test_free_energy_samples_match_cmol(bz):
+    perturbations = sample_perturbations(
+        6, scale_std=0.02, energy_std=1.0, sigma=[6, 12], seed=3
+    )
+    samples = free_energy_samples(bz, temps, perturbations, max_memory=1)
+    assert samples.shape == (6, temps.size)
+    for g, scale, shift, sigma in zip(samples, *perturbations):
+        expected = bz.calc_free_energy(temps, int(sigma), scale=scale) + shift
+        npt.assert_allclose(g, expected, rtol=0, atol=1e-8)
+
+
+def test_free_energy_uncertainty_reproducible(bz):
+    kwargs = dict(n_samples=2000, scale_std=0.01, seed=7)
+    a = free_energy_uncertainty(bz, temps, **kwargs)
+    b = free_energy_uncertainty(bz, temps, max_memory=10 ** 4, processes=2, **kwargs)
+    npt.assert_array_equal(a.samples, b.samples)
+
+    assert np.all(a.std > 0)
+    assert np.all((a.lower < a.mean) & (a.mean < a.upper))
+    nominal = bz.calc_free_energy(temps, 1, scale=0.99)
+    assert np.all(np.abs(a.mean - nominal) < 5 * a.std / np.sqrt(2000))
+
+
+def test_rate_uncertainty(reaction):
+    nominal = reaction.calc_TST_rates()
+    exact = rate_uncertainty(reaction, n_samples=4, scale_std=0.0, seed=0)
+    npt.assert_allclose(exact.samples, np.tile(nominal, (4, 1)), rtol=1e-8)
+
+    result = rate_uncertainty(reaction, n_samples=2000, barrier_std=1.0, seed=0)
+    # A 1 kcal/mol barrier error dominates, ln k spreads by about 1 / RT
+    log_std = np.log(result.samples).std(axis=0)
+    npt.assert_allclose(log_std, 1.0 / (1.987204e-3 * temps), rtol=0.1)
+    assert np.all((result.lower < nominal) & (nominal < result.upper))
+
+    kwargs = dict(n_samples=200, scale_std=0.01, barrier_std=1.0, seed=1)
+    serial = rate_uncertainty(reaction, **kwargs)
+    parallel = rate_uncertainty(reaction, max_memory=10 ** 4, processes=2, **kwargs)
+    npt.assert_allclose(parallel.samples, serial.samples, rtol=1e-12)